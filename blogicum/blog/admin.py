@@ -1,21 +1,162 @@
 # Ключевые особенности админ.панели:
 # 1. Регистрация всех моделей в админке с настройкой отображения
-# 2. Оптимизация через list_editable и list_filter
+# 2. Оптимизация через list_filter
 # 3. После автотестов: подсчет комментариев, расширенные поля
+# 4. Число комментариев читается из денормализованного Post.comment_count
+# 5. Потоковая выгрузка отфильтрованного списка в CSV/NDJSON
+# 6. Списки без полного COUNT(*) и с узкой проекцией полей
+# 7. Массовая публикация и снятие одним UPDATE вместо list_editable
 
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.views.main import ChangeList
+from django.core.exceptions import PermissionDenied
+from django.http import Http404
+from django.urls import path
+
+from .exports import (
+    COMMENT_EXPORT_COLUMNS,
+    EXPORT_FORMATS,
+    POST_EXPORT_COLUMNS,
+    streaming_export,
+)
 from .models import Category, Location, Post, Comment
+from .paginators import EstimatedCountPaginator
+from .signals import publication_changed
+
+
+class ExportChangeList(ChangeList):
+    """Фильтры, поиск и сортировка списка без подсчёта строк и страницы."""
+
+    def get_results(self, request):
+        pass
+
+
+class PostChangeList(ChangeList):
+    """Список постов без текста и лишних полей связанных записей."""
+    only_fields = (
+        "title",
+        "author__username",
+        "category__title",
+        "category__slug",
+        "category__is_published",
+        "location__name",
+        "is_published",
+        "is_visible",
+        "pub_date",
+        "updated_at",
+        "comment_count",
+    )
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).only(*self.only_fields)
+
+
+class StreamingExportMixin:
+    """
+    Действия «Выгрузить в CSV/NDJSON» для отмеченных строк и кнопки
+    на странице списка, выгружающие всю выборку с текущими фильтрами.
+    """
+    change_list_template = "admin/export_change_list.html"
+    export_columns = ()
+    actions = ("export_csv", "export_ndjson")
+
+    def get_urls(self):
+        opts = self.model._meta
+        return [
+            path(
+                "export/<str:export_format>/",
+                self.admin_site.admin_view(self.export_view),
+                name=f"{opts.app_label}_{opts.model_name}_export",
+            ),
+        ] + super().get_urls()
+
+    def export_view(self, request, export_format):
+        if export_format not in EXPORT_FORMATS:
+            raise Http404("Неизвестный формат выгрузки")
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        request.streaming_export = True
+        changelist = self.get_changelist_instance(request)
+        return self._export(
+            changelist.get_queryset(request), export_format
+        )
+
+    def get_changelist(self, request, **kwargs):
+        if getattr(request, "streaming_export", False):
+            return ExportChangeList
+        return super().get_changelist(request, **kwargs)
+
+    def _export(self, queryset, export_format):
+        return streaming_export(
+            queryset,
+            self.export_columns,
+            export_format,
+            self.model._meta.model_name,
+        )
+
+    @admin.action(description="Выгрузить отмеченные в CSV")
+    def export_csv(self, request, queryset):
+        return self._export(queryset, "csv")
+
+    @admin.action(description="Выгрузить отмеченные в NDJSON")
+    def export_ndjson(self, request, queryset):
+        return self._export(queryset, "ndjson")
+
 
-class LocationAdmin(admin.ModelAdmin):
+class BulkPublicationMixin:
+    """
+    Действия «Опубликовать» и «Снять с публикации» для отмеченных
+    строк: один UPDATE по записям, где флаг действительно меняется,
+    и один сигнал publication_changed на всю пачку. Вместо
+    list_editable, который сохраняет каждую строку отдельно.
+    """
+    actions = ("publish_selected", "unpublish_selected")
+
+    def update_publication(self, queryset, is_published):
+        return queryset.update(is_published=is_published)
+
+    def _set_published(self, request, queryset, is_published):
+        selected = queryset.order_by()
+        updated = self.update_publication(
+            selected.exclude(is_published=is_published), is_published
+        )
+        if updated:
+            publication_changed.send(
+                sender=self.model, pks=selected.values("pk")
+            )
+        verb = "Опубликовано" if is_published else "Снято с публикации"
+        self.message_user(
+            request,
+            f"{verb}: {updated} из {selected.count()} отмеченных.",
+            messages.SUCCESS,
+        )
+
+    @admin.action(
+        description="Опубликовать отмеченные",
+        permissions=("change",),
+    )
+    def publish_selected(self, request, queryset):
+        self._set_published(request, queryset, True)
+
+    @admin.action(
+        description="Снять с публикации отмеченные",
+        permissions=("change",),
+    )
+    def unpublish_selected(self, request, queryset):
+        self._set_published(request, queryset, False)
+
+
+class LocationAdmin(BulkPublicationMixin, admin.ModelAdmin):
     """Быстрое управление публикацией локаций"""
     list_display = (
         "name",
         "is_published",
         "created_at",
     )
-    list_editable = ("is_published",)
+    search_fields = ("^name",)
+    ordering = ("name",)
 
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(BulkPublicationMixin, admin.ModelAdmin):
     """Управление категориями с проверкой slug"""
     list_display = (
         "title",
@@ -24,31 +165,67 @@ class CategoryAdmin(admin.ModelAdmin):
         "is_published",
         "created_at",
     )
-    list_editable = ("is_published",)
+    search_fields = ("^title",)
+    ordering = ("title",)
 
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(
+    BulkPublicationMixin, StreamingExportMixin, admin.ModelAdmin
+):
     """Полная информация о постах с фильтрацией"""
+    export_columns = POST_EXPORT_COLUMNS
+    actions = BulkPublicationMixin.actions + StreamingExportMixin.actions
     list_display = (
         "title",
         "author",
         "category",
         "location",
         "is_published",
+        "is_visible",
         "pub_date",
         "comment_count",
     )
-    list_editable = ("is_published",)
     list_filter = (
         "category",
         "location",
     )
+    list_select_related = ("author", "category", "location")
+    # Поиск по началу строки использует префиксные индексы.
+    search_fields = ("^title",)
+    autocomplete_fields = ("author", "category", "location")
+    # Сортировка по comment_count идёт по индексу post_comment_count_idx.
+    sortable_by = (
+        "title",
+        "pub_date",
+        "comment_count",
+        "is_published",
+    )
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        if getattr(request, "streaming_export", False):
+            return super().get_changelist(request, **kwargs)
+        return PostChangeList
+
+    def update_publication(self, queryset, is_published):
+        # is_visible и updated_at меняются тем же UPDATE.
+        return queryset.set_published(is_published)
 
-    @admin.display(description="Комментариев")
-    def comment_count(self, post):
-        """Оптимизированный подсчет комментариев через related_name"""
-        return post.comments.count()
+
+class CommentAdmin(StreamingExportMixin, admin.ModelAdmin):
+    export_columns = COMMENT_EXPORT_COLUMNS
+    list_display = (
+        "text",
+        "post",
+        "author",
+        "created_at",
+    )
+    list_select_related = ("post", "author")
+    autocomplete_fields = ("post", "author")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 admin.site.register(Post, PostAdmin)
 admin.site.register(Location, LocationAdmin)
 admin.site.register(Category, CategoryAdmin)
-admin.site.register(Comment)
+admin.site.register(Comment, CommentAdmin)
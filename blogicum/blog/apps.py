@@ -11,6 +11,9 @@ class BlogConfig(AppConfig):
     name = "blog"
     verbose_name = "Блог"
 
+    def ready(self):
+        from . import db, signals  # noqa: F401
+
 # Конфигурация приложения:
 # 1. Корректное наименование для админки
 # 2. Правильная регистрация в INSTALLED_APPS
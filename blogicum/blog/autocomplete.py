@@ -0,0 +1,55 @@
+"""
+Источники автодополнения для админки и публичной формы поста.
+
+Поиск идёт по началу строки (istartswith), который использует
+регистронезависимые префиксные индексы из миграции
+0017_autocomplete_prefix_indexes, и возвращает не больше
+AUTOCOMPLETE_LIMIT вариантов.
+"""
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+
+from .models import Category, Location, Post, User
+
+AUTOCOMPLETE_LIMIT = 20
+
+
+# Источник: выборка с публичными записями и поле для поиска и подписи.
+SOURCES = {
+    "users": (User.objects.filter(is_active=True), "username"),
+    "posts": (Post.post_list.all(), "title"),
+    "locations": (Location.objects.filter(is_published=True), "name"),
+    "categories": (Category.objects.filter(is_published=True), "title"),
+}
+# Списки пользователей и постов нужны только редакции: публичной форме
+# поста хватает локаций и категорий.
+STAFF_SOURCES = frozenset({"users", "posts"})
+
+
+def autocomplete(source, term, limit=AUTOCOMPLETE_LIMIT):
+    """
+    Варианты [{"id", "text"}] для источника и признак того, что
+    совпадений больше, чем limit. KeyError для неизвестного источника.
+    """
+    queryset, field = SOURCES[source]
+    term = term.strip()
+    # LIKE в SQLite не различает регистр только для латиницы, поэтому
+    # кириллица ищется ещё и в нижнем регистре и с заглавной буквы.
+    condition = reduce(
+        or_,
+        (
+            Q(**{f"{field}__istartswith": variant})
+            for variant in sorted({term, term.lower(), term.capitalize()})
+        ),
+    )
+    rows = list(
+        queryset.filter(condition)
+        .order_by(field, "pk")
+        .values_list("pk", field)[: limit + 1]
+    )
+    return (
+        [{"id": pk, "text": text} for pk, text in rows[:limit]],
+        len(rows) > limit,
+    )
@@ -0,0 +1,235 @@
+"""
+Сквозной замер маршрутов блога через тестовый Client.
+
+Каждый маршрут запрашивается анонимно и от имени автора на текущих
+данных базы, обычно заполненных seed_blog. Анонимный замер идёт
+с холодным кэшем страниц: перед каждым запросом версии областей
+страницы сбрасываются. Отдача из кэша страниц замеряется отдельно,
+ролью anonymous-cached. Для маршрута считаются
+перцентили времени ответа, число и время SQL-запросов и размер ответа.
+Результаты сохраняются в JSON и сравниваются с сохранённой базовой
+линией, чтобы регрессии были видны как разница с ней.
+"""
+import time
+from contextlib import contextmanager
+from statistics import median
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.test import Client
+from django.urls import reverse
+
+from .cache import INDEX_SCOPE, invalidate
+from .models import AuthorStats, Category, Post
+from .profiling import recording_queries
+
+ROLES = ("anonymous", "anonymous-cached", "authenticated")
+PERCENTILES = (50, 95, 99)
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "queries", "sql_ms", "bytes")
+# Адрес вне INTERNAL_IPS: отладочная панель не искажает замер.
+CLIENT_DEFAULTS = {"HTTP_HOST": "localhost", "REMOTE_ADDR": "192.0.2.1"}
+COMMENT_TEXT = "Комментарий замера"
+# Рост p95 меньше этого порога — шум быстрых маршрутов, а не регрессия.
+MIN_P95_DELTA_MS = 1.0
+
+
+class Route:
+    """
+    Маршрут замера; scopes — области кэша страниц маршрута, если
+    анонимный ответ кэшируется.
+    """
+
+    def __init__(
+        self, name, kwargs=None, method="get", data=None, scopes=None
+    ):
+        self.name = name
+        self.kwargs = kwargs or (lambda targets: {})
+        self.method = method
+        self.data = data
+        self.scopes = scopes
+
+    @property
+    def page_cached(self):
+        return self.scopes is not None
+
+    @property
+    def writes(self):
+        return self.method != "get"
+
+    def url(self, targets):
+        return reverse(self.name, kwargs=self.kwargs(targets))
+
+
+ROUTES = (
+    Route("blog:index", scopes=lambda t: [INDEX_SCOPE]),
+    Route(
+        "blog:post_detail",
+        lambda t: {"pk": t.post.pk},
+        scopes=lambda t: [f"post:{t.post.pk}"],
+    ),
+    Route(
+        "blog:category_posts",
+        lambda t: {"category_slug": t.category.slug},
+        scopes=lambda t: [f"category:{t.category.slug}"],
+    ),
+    Route(
+        "blog:profile",
+        lambda t: {"username": t.author.username},
+        scopes=lambda t: [f"profile:{t.author.username}"],
+    ),
+    Route("blog:create_post"),
+    Route("blog:edit_post", lambda t: {"pk": t.post.pk}),
+    Route(
+        "blog:add_comment",
+        lambda t: {"pk": t.post.pk},
+        method="post",
+        data={"text": COMMENT_TEXT},
+    ),
+    Route("users:registration"),
+)
+
+
+class BenchTargets:
+    """
+    Самые нагруженные объекты базы: пост с наибольшим числом
+    комментариев, категория с наибольшим числом постов и самый
+    активный автор. Авторизованные запросы идут от имени автора поста,
+    чтобы форма редактирования отдавалась, а не перенаправляла.
+    """
+
+    def __init__(self):
+        self.post = (
+            Post.post_list.order_by("-comment_count", "-pk").first()
+        )
+        if self.post is None:
+            raise ValueError(
+                "Нет опубликованных постов: заполните базу командой "
+                "seed_blog."
+            )
+        self.category = (
+            Category.objects.filter(is_published=True)
+            .annotate(total=Count("posts", filter=Q(posts__is_visible=True)))
+            .order_by("-total", "pk")
+            .first()
+        ) or self.post.category
+        stats = (
+            AuthorStats.objects.select_related("author")
+            .order_by("-post_count", "pk")
+            .first()
+        )
+        self.author = stats.author if stats else self.post.author
+        self.user = self.post.author
+
+
+@contextmanager
+def rolled_back(enabled=True):
+    """Откатывает запись маршрута, чтобы повторы шли на тех же данных."""
+    if not enabled:
+        yield
+        return
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def percentile(values, q):
+    """Перцентиль с линейной интерполяцией между соседними значениями."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (
+        (ordered[upper] - ordered[lower]) * (position - lower)
+    )
+
+
+def response_size(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def measure(client, route, url, iterations, warmup=0, cold_scopes=()):
+    """
+    Замер маршрута. Версии cold_scopes сбрасываются перед каждым
+    запросом вне замера, чтобы страница не отдавалась из кэша.
+    """
+    timings, queries, sql = [], [], []
+    for attempt in range(warmup + iterations):
+        invalidate(cold_scopes)
+        with recording_queries() as recorder, rolled_back(route.writes):
+            started = time.perf_counter()
+            response = getattr(client, route.method)(url, route.data)
+            elapsed = time.perf_counter() - started
+            size = response_size(response)
+        if attempt < warmup:
+            continue
+        timings.append(elapsed * 1000)
+        queries.append(recorder.count)
+        sql.append(recorder.seconds * 1000)
+    return {
+        "url": url,
+        "status": response.status_code,
+        **{
+            f"p{q}_ms": round(percentile(timings, q), 3)
+            for q in PERCENTILES
+        },
+        "queries": max(queries),
+        "sql_ms": round(median(sql), 3),
+        "bytes": size,
+    }
+
+
+def run(routes=ROUTES, roles=ROLES, iterations=50, warmup=5):
+    """
+    Замеряет маршруты для ролей; ключ результата — «роль маршрут».
+    Роль anonymous-cached замеряет только маршруты с кэшем страниц.
+    """
+    targets = BenchTargets()
+    results = {}
+    for role in roles:
+        client = Client(**CLIENT_DEFAULTS)
+        if role == "authenticated":
+            client.force_login(targets.user)
+        for route in routes:
+            cold_scopes = ()
+            if role == "anonymous-cached":
+                if not route.page_cached:
+                    continue
+            elif role == "anonymous" and route.page_cached:
+                cold_scopes = route.scopes(targets)
+            results[f"{role} {route.name}"] = measure(
+                client,
+                route,
+                route.url(targets),
+                iterations,
+                warmup,
+                cold_scopes,
+            )
+    return results
+
+
+def compare(results, baseline, threshold=10.0):
+    """
+    Разница с базовой линией по общим маршрутам. Регрессия — рост
+    числа запросов или рост p95 больше чем на threshold процентов
+    и не меньше MIN_P95_DELTA_MS.
+    """
+    deltas = {}
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        changes = {
+            metric: current[metric] - previous[metric]
+            for metric in METRICS
+            if metric in previous
+        }
+        p95 = previous.get("p95_ms")
+        growth = changes.get("p95_ms", 0)
+        slower = bool(p95) and growth >= MIN_P95_DELTA_MS and (
+            growth > p95 * threshold / 100
+        )
+        changes["regression"] = slower or changes.get("queries", 0) > 0
+        deltas[key] = changes
+    return deltas
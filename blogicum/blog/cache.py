@@ -0,0 +1,173 @@
+"""
+Версионированный кэш страниц блога для анонимных читателей.
+
+Каждая страница зависит от набора областей (scopes): ``index``,
+``post:<id>``, ``category:<slug>`` и ``profile:<username>``. Для каждой
+области в кэше лежит версия с меткой времени, а ключ страницы строится
+из её URL и версий областей. Инвалидация записывает новые версии: старые
+страницы перестают находиться и вытесняются по таймауту. Схема не
+требует перебора ключей, поэтому работает с любым бэкендом, в том числе
+с locmem и файловым.
+"""
+import hashlib
+import time
+import uuid
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Post
+
+PAGE_PREFIX = "blog:page"
+POST_CARD_PREFIX = "blog:post_card"
+VERSION_PREFIX = "blog:version"
+INDEX_SCOPE = "index"
+# Версия справочников: категорий и локаций, выводимых в карточках.
+REFDATA_SCOPE = "refdata"
+
+
+def _digest(value):
+    return hashlib.md5(value.encode()).hexdigest()
+
+
+def _version_key(scope):
+    return f"{VERSION_PREFIX}:{_digest(scope)}"
+
+
+def _new_version():
+    """Время создания в миллисекундах и случайный суффикс: по версии
+    можно восстановить момент последнего изменения области."""
+    return f"{int(time.time() * 1000):x}-{uuid.uuid4().hex[:8]}"
+
+
+def version_timestamp(version):
+    try:
+        milliseconds = int(version.split("-", 1)[0], 16)
+    except ValueError:
+        return None
+    return datetime.fromtimestamp(milliseconds / 1000, tz=timezone.utc)
+
+
+def versions_changed_at(versions):
+    """Время самой свежей из версий или None для версий без метки."""
+    timestamps = [version_timestamp(version) for version in versions]
+    if timestamps and None not in timestamps:
+        return max(timestamps)
+    return None
+
+
+def get_versions(scopes):
+    """Версии областей в порядке сортировки; недостающие создаются."""
+    keys = {scope: _version_key(scope) for scope in sorted(scopes)}
+    versions = cache.get_many(keys.values())
+    missing = {
+        key: _new_version() for key in keys.values() if key not in versions
+    }
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys.values()]
+
+
+def invalidate(scopes):
+    if scopes:
+        cache.set_many(
+            {_version_key(scope): _new_version() for scope in scopes},
+            timeout=None,
+        )
+
+
+def page_cache_key(scopes, path):
+    versions = ":".join(get_versions(scopes))
+    return f"{PAGE_PREFIX}:{_digest(f'{path}:{versions}')}"
+
+
+def scopes_changed_at(scopes):
+    return versions_changed_at(get_versions(scopes))
+
+
+def page_validators(scopes, path, user_id=None, csrf_secret=""):
+    """
+    ETag и Last-Modified страницы без запросов к базе: ETag зависит от
+    версий областей, адреса и пользователя (авторизованным страница
+    выводится иначе), а также от секрета CSRF, который попадает в формы
+    страницы и меняется при входе. Last-Modified — время самой свежей
+    версии.
+    """
+    versions = get_versions(scopes)
+    etag = '"%s"' % _digest(
+        f"{path}:{user_id}:{csrf_secret}:{':'.join(versions)}"
+    )
+    return etag, versions_changed_at(versions)
+
+
+def page_cache_timeout():
+    return getattr(settings, "BLOG_PAGE_CACHE_TIMEOUT", 600)
+
+
+def post_scopes(post_id, category_slug, username):
+    """Страницы, на которых виден пост: сам пост, ленты и профиль."""
+    scopes = {INDEX_SCOPE, f"post:{post_id}", f"profile:{username}"}
+    if category_slug:
+        scopes.add(f"category:{category_slug}")
+    return scopes
+
+
+def scopes_for_posts(queryset):
+    scopes = {INDEX_SCOPE}
+    for post_id, category_slug, username in queryset.values_list(
+        "pk", "category__slug", "author__username"
+    ).iterator():
+        scopes |= post_scopes(post_id, category_slug, username)
+    return scopes
+
+
+def invalidate_posts(post_ids):
+    """Инвалидация для массовых UPDATE, минующих сигналы моделей."""
+    invalidate(scopes_for_posts(Post.objects.filter(pk__in=post_ids)))
+
+
+class PostCardCacheStats:
+    """Счётчик попаданий в кэш карточек постов в пределах процесса."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __repr__(self):
+        return (
+            f"<PostCardCacheStats hits={self.hits} misses={self.misses} "
+            f"ratio={self.hit_ratio:.2f}>"
+        )
+
+
+post_card_stats = PostCardCacheStats()
+
+
+def post_card_timeout():
+    return getattr(settings, "BLOG_POST_CARD_CACHE_TIMEOUT", 60 * 60 * 24)
+
+
+def post_card_cache_key(post, refdata_version):
+    """
+    Карточка меняется вместе с постом (updated_at), счётчиком
+    комментариев, справочниками и именем автора.
+    """
+    parts = (
+        post.pk,
+        post.updated_at.isoformat(),
+        post.comment_count,
+        post.is_published,
+        refdata_version,
+        post.author.username,
+    )
+    return f"{POST_CARD_PREFIX}:{_digest(repr(parts))}"
@@ -0,0 +1,173 @@
+"""
+Настройка соединений с SQLite.
+
+Обработчик connection_created выполняет PRAGMA из BLOG_SQLITE_PRAGMAS
+на каждом новом соединении, а при первом соединении процесса пишет
+в лог действующие значения. Команда sqlite_report показывает их
+и сравнивает скорость чтения и записи с настройками по умолчанию.
+copy_database заменяет репликацию для локальных реплик-файлов.
+"""
+import logging
+import random
+import re
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+# Допустимые PRAGMA: имя и значение подставляются в SQL без параметров.
+PRAGMA_NAMES = (
+    "journal_mode",
+    "synchronous",
+    "busy_timeout",
+    "cache_size",
+    "mmap_size",
+    "temp_store",
+    "wal_autocheckpoint",
+    "journal_size_limit",
+)
+_VALUE = re.compile(r"^-?\w+$")
+
+_reported = False
+
+
+def configured_pragmas():
+    pragmas = getattr(settings, "BLOG_SQLITE_PRAGMAS", {})
+    for name, value in pragmas.items():
+        if name not in PRAGMA_NAMES:
+            raise ImproperlyConfigured(
+                f"BLOG_SQLITE_PRAGMAS: неизвестная PRAGMA {name!r}"
+            )
+        if not _VALUE.match(str(value)):
+            raise ImproperlyConfigured(
+                f"BLOG_SQLITE_PRAGMAS: недопустимое значение {value!r} "
+                f"для {name}"
+            )
+    return pragmas
+
+
+def apply_pragmas(cursor, pragmas):
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def read_pragmas(cursor, names=PRAGMA_NAMES):
+    """Действующие значения PRAGMA соединения."""
+    values = {}
+    for name in names:
+        cursor.execute(f"PRAGMA {name}")
+        row = cursor.fetchone()
+        values[name] = row[0] if row else None
+    return values
+
+
+def format_pragmas(values):
+    return ", ".join(f"{name}={value}" for name, value in values.items())
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    global _reported
+    if connection.vendor != "sqlite":
+        return
+    pragmas = configured_pragmas()
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, pragmas)
+        if not _reported:
+            _reported = True
+            logger.info(
+                "SQLite %s: %s",
+                connection.settings_dict["NAME"],
+                format_pragmas(read_pragmas(cursor)),
+            )
+
+
+def copy_database(source_alias, target_alias):
+    """Копирует базу целиком через backup API SQLite."""
+    source, target = connections[source_alias], connections[target_alias]
+    if source.vendor != "sqlite" or target.vendor != "sqlite":
+        raise ImproperlyConfigured("Копирование баз работает только с SQLite")
+    if source.in_atomic_block:
+        # backup ждёт конца открытой транзакции источника бесконечно.
+        raise ImproperlyConfigured(
+            "Копировать базу можно только вне транзакции"
+        )
+    source.ensure_connection()
+    target.ensure_connection()
+    source.connection.backup(target.connection)
+
+
+def _benchmark_connection(path, pragmas):
+    # Автокоммит: каждая вставка — отдельная транзакция, как в запросах.
+    connection = sqlite3.connect(
+        path, isolation_level=None, check_same_thread=False
+    )
+    apply_pragmas(connection.cursor(), pragmas)
+    return connection
+
+
+def benchmark(path, pragmas, rows=2000, seconds=2.0, readers=4):
+    """
+    Замер на отдельном файле базы: rows вставок по транзакции на строку,
+    затем seconds секунд чтения по первичному ключу в readers потоков,
+    пока ещё один поток продолжает вставки. Возвращает операции
+    в секунду и число ошибок «database is locked».
+    """
+    connection = _benchmark_connection(path, pragmas)
+    connection.execute(
+        "CREATE TABLE bench (id INTEGER PRIMARY KEY, payload TEXT)"
+    )
+    payload = "x" * 200
+    started = time.perf_counter()
+    for _ in range(rows):
+        connection.execute("INSERT INTO bench (payload) VALUES (?)", [payload])
+    writes = rows / (time.perf_counter() - started)
+    connection.close()
+
+    counts = {"reads": 0, "writes": 0, "locked": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def run(operation):
+        worker = _benchmark_connection(path, pragmas)
+        done = locked = 0
+        while time.perf_counter() < deadline:
+            try:
+                operation(worker)
+                done += 1
+            except sqlite3.OperationalError:
+                locked += 1
+        worker.close()
+        with lock:
+            counts["reads" if operation is read else "writes"] += done
+            counts["locked"] += locked
+
+    def read(worker):
+        worker.execute(
+            "SELECT payload FROM bench WHERE id = ?",
+            [random.randint(1, rows)],
+        ).fetchone()
+
+    def write(worker):
+        worker.execute("INSERT INTO bench (payload) VALUES (?)", [payload])
+
+    threads = [threading.Thread(target=run, args=(write,))] + [
+        threading.Thread(target=run, args=(read,)) for _ in range(readers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {
+        "writes_per_second": writes,
+        "mixed_reads_per_second": counts["reads"] / seconds,
+        "mixed_writes_per_second": counts["writes"] / seconds,
+        "lock_errors": counts["locked"],
+    }
@@ -0,0 +1,220 @@
+"""
+Ленты RSS и Atom: общая, по категории и по автору.
+
+Django-класс Feed собирает документ целиком в памяти, поэтому здесь
+генераторы django.utils.feedgenerator пишут по одной записи в буфер,
+который сразу отдаётся клиенту. Готовый документ сохраняется в кэше
+страниц под версиями областей и адресом с хостом (ссылки в ленте
+абсолютные), так что повторные опросы читалок не обращаются к базе,
+а с валидаторами получают 304. Записи читаются с реплики.
+"""
+from io import StringIO
+
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.feedgenerator import (
+    Atom1Feed,
+    Rss201rev2Feed,
+    SimplerXMLGenerator,
+)
+from django.views import View
+
+from .cache import (
+    INDEX_SCOPE,
+    page_cache_key,
+    page_cache_timeout,
+    page_validators,
+)
+from .mixins import ConditionalGetMixin, ReplicaReadMixin
+from .models import Post, User
+from .profiling import record_cache_lookup
+from .refdata import reference_data
+from .routers import replica_may_lag
+
+FEED_ITEMS = 20
+FEED_ENCODING = "utf-8"
+
+
+class StreamingFeedMixin:
+    """Вывод ленты частями: заголовок, записи по одной, окончание."""
+    last_updated = None
+
+    def latest_post_date(self):
+        return self.last_updated or timezone.now()
+
+    def stream(self, items):
+        buffer = StringIO()
+        handler = SimplerXMLGenerator(buffer, FEED_ENCODING)
+
+        def drain():
+            chunk = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return chunk
+
+        self.start_document(handler)
+        yield drain()
+        for item in items:
+            self.items = []
+            self.add_item(**item)
+            self.write_items(handler)
+            yield drain()
+        self.end_document(handler)
+        yield drain()
+
+
+class StreamingRssFeed(StreamingFeedMixin, Rss201rev2Feed):
+    def start_document(self, handler):
+        handler.startDocument()
+        handler.startElement("rss", self.rss_attributes())
+        handler.startElement("channel", self.root_attributes())
+        self.add_root_elements(handler)
+
+    def end_document(self, handler):
+        self.endChannelElement(handler)
+        handler.endElement("rss")
+
+
+class StreamingAtomFeed(StreamingFeedMixin, Atom1Feed):
+    def start_document(self, handler):
+        handler.startDocument()
+        handler.startElement("feed", self.root_attributes())
+        self.add_root_elements(handler)
+
+    def end_document(self, handler):
+        handler.endElement("feed")
+
+
+FEED_TYPES = {"rss": StreamingRssFeed, "atom": StreamingAtomFeed}
+
+
+class PostFeedView(ReplicaReadMixin, ConditionalGetMixin, View):
+    """
+    Общая лента сайта; наследники меняют области кэша, заголовок
+    и отбор постов поверх Post.post_list.
+    """
+    title = "Блогикум"
+    description = "Новые публикации"
+    cache_scopes = (INDEX_SCOPE,)
+
+    def get_cache_scopes(self):
+        return list(self.cache_scopes)
+
+    def get_link(self):
+        return reverse("blog:index")
+
+    def get_title(self):
+        return self.title
+
+    def get_posts(self):
+        """Вызывается первым и может загрузить объект для заголовка."""
+        return Post.post_list.all()
+
+    def get(self, request, *args, **kwargs):
+        feed_class = FEED_TYPES.get(kwargs["feed_type"])
+        if feed_class is None:
+            raise Http404("Неизвестный формат ленты")
+
+        scopes = self.get_cache_scopes()
+        url = request.build_absolute_uri(request.path)
+        key = page_cache_key(scopes, url)
+        content = cache.get(key)
+        record_cache_lookup(content is not None)
+        if content is not None:
+            return HttpResponse(content, content_type=feed_class.content_type)
+
+        # Записи читаются сразу, внутри ReplicaReadMixin: тело ответа
+        # формируется уже после выхода из представления.
+        posts = list(
+            self.get_posts().order_by("-pub_date", "-pk")[:FEED_ITEMS]
+        )
+        feed = feed_class(
+            title=self.get_title(),
+            link=request.build_absolute_uri(self.get_link()),
+            description=self.description,
+            feed_url=request.build_absolute_uri(),
+            language="ru",
+        )
+        feed.last_updated = page_validators(scopes, url)[1]
+        if replica_may_lag(feed.last_updated):
+            key = None
+        return StreamingHttpResponse(
+            self._store(feed.stream(self._items(posts)), key),
+            content_type=feed.content_type,
+        )
+
+    def _items(self, posts):
+        for post in posts:
+            link = self.request.build_absolute_uri(
+                reverse("blog:post_detail", kwargs={"pk": post.pk})
+            )
+            yield {
+                "title": post.title,
+                "link": link,
+                "unique_id": link,
+                "description": post.text,
+                "pubdate": post.pub_date,
+                "updateddate": post.updated_at,
+                "author_name": post.author.username,
+                "categories": (
+                    [post.category.title] if post.category_id else []
+                ),
+            }
+
+    @staticmethod
+    def _store(chunks, key):
+        """Отдаёт части и сохраняет документ, если задан ключ."""
+        parts = []
+        for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+        if key is not None:
+            cache.set(key, "".join(parts), page_cache_timeout())
+
+
+class SiteFeedView(PostFeedView):
+    """Лента всех публикаций с областью кэша index по умолчанию."""
+
+
+class CategoryFeedView(PostFeedView):
+    def get_cache_scopes(self):
+        return [f"category:{self.kwargs['category_slug']}"]
+
+    def get_title(self):
+        return f"{self.title}: {self.category.title}"
+
+    def get_link(self):
+        return reverse(
+            "blog:category_posts",
+            kwargs={"category_slug": self.category.slug},
+        )
+
+    def get_posts(self):
+        self.category = reference_data().published_category(
+            self.kwargs["category_slug"]
+        )
+        if self.category is None:
+            raise Http404("Категория не найдена")
+        return super().get_posts().filter(category_id=self.category.pk)
+
+
+class AuthorFeedView(PostFeedView):
+    def get_cache_scopes(self):
+        return [f"profile:{self.kwargs['username']}"]
+
+    def get_title(self):
+        return f"{self.title}: @{self.author.username}"
+
+    def get_link(self):
+        return reverse(
+            "blog:profile", kwargs={"username": self.author.username}
+        )
+
+    def get_posts(self):
+        self.author = get_object_or_404(
+            User, username=self.kwargs["username"]
+        )
+        return super().get_posts().filter(author=self.author)
@@ -5,7 +5,10 @@
 
 from django import forms
 from django.utils import timezone
+
+from .images import generate_variants_safely
 from .models import Comment, Post
+from .widgets import ReferenceAutocompleteSelect
 
 class CreatePostForm(forms.ModelForm):
     """Форма создания поста с предустановкой текущей даты"""
@@ -31,6 +34,33 @@ class CreatePostForm(forms.ModelForm):
             "category",
             "is_published",
         )
+        # Списки локаций и категорий не выводятся целиком,
+        # а выбранные значения читаются из кэша справочников.
+        widgets = {
+            "location": ReferenceAutocompleteSelect("locations"),
+            "category": ReferenceAutocompleteSelect("categories"),
+        }
+
+    def save(self, commit=True):
+        """
+        Новое изображение сразу получает уменьшенные варианты. Файл
+        записывается в хранилище до сохранения поста, чтобы ширина
+        вариантов попала в тот же INSERT или UPDATE, а сигналы поста
+        сработали один раз.
+        """
+        post = super().save(commit=False)
+        if not commit:
+            return post
+        if "image" in self.changed_data:
+            post.variants_width = None
+            if post.image:
+                post.image.save(post.image.name, post.image.file, save=False)
+                post.variants_width, _ = generate_variants_safely(
+                    post.image.name
+                )
+        post.save()
+        self._save_m2m()
+        return post
 
 
 class CreateCommentForm(forms.ModelForm):
@@ -0,0 +1,120 @@
+"""
+Уменьшенные копии изображений постов для адаптивной вёрстки.
+
+Для каждого загруженного Post.image создаются варианты фиксированной
+ширины в WebP и JPEG; шаблоны выбирают подходящий через srcset/sizes,
+поэтому карточки в ленте не скачивают оригиналы. Настоящая ширина
+наибольшего варианта сохраняется в Post.variants_width: по ней srcset
+строится без обращений к хранилищу и не предлагает вариантов шире
+оригинала.
+"""
+import logging
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+VARIANT_DIR = "img/variants"
+VARIANT_WIDTHS = (320, 640, 960, 1280)
+# Расширение файла, формат Pillow и MIME-тип для <source type>.
+VARIANT_FORMATS = (
+    ("webp", "WEBP", "image/webp"),
+    ("jpg", "JPEG", "image/jpeg"),
+)
+VARIANT_QUALITY = 80
+# Карточки и страница поста ограничены шириной 40rem.
+IMAGE_SIZES = "(max-width: 40rem) 100vw, 40rem"
+
+
+def variant_name(name, width, extension):
+    stem = PurePosixPath(name).with_suffix("").as_posix().replace("/", "_")
+    return f"{VARIANT_DIR}/{stem}-{width}w.{extension}"
+
+
+def _prepare(image):
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def generate_variants(name, storage=default_storage, force=False):
+    """
+    Создаёт недостающие варианты изображения и возвращает настоящую
+    ширину наибольшего из них и имена созданных файлов. Варианты шире
+    оригинала не увеличиваются, а повторяют его размер.
+    """
+    with storage.open(name, "rb") as source:
+        image = _prepare(Image.open(source))
+
+    created = []
+    for width in VARIANT_WIDTHS:
+        resized = None
+        for extension, image_format, _ in VARIANT_FORMATS:
+            target = variant_name(name, width, extension)
+            if storage.exists(target):
+                if not force:
+                    continue
+                storage.delete(target)
+            if resized is None:
+                resized = image.copy()
+                resized.thumbnail(
+                    (width, resized.height), Image.Resampling.LANCZOS
+                )
+            buffer = BytesIO()
+            resized.save(buffer, image_format, quality=VARIANT_QUALITY)
+            created.append(
+                storage.save(target, ContentFile(buffer.getvalue()))
+            )
+    return min(image.width, VARIANT_WIDTHS[-1]), created
+
+
+def generate_variants_safely(name, **kwargs):
+    """Ошибка обработки не должна мешать сохранению поста."""
+    try:
+        return generate_variants(name, **kwargs)
+    except (OSError, ValueError):
+        logger.exception("Не удалось создать варианты изображения %s", name)
+        return None, []
+
+
+def srcset_widths(variants_width):
+    """
+    Пары (ширина варианта в имени файла, настоящая ширина): варианты
+    уже оригинала и первый, который повторяет его размер.
+    """
+    widths = []
+    for width in VARIANT_WIDTHS:
+        if width >= variants_width:
+            widths.append((width, variants_width))
+            break
+        widths.append((width, width))
+    return widths
+
+
+def image_sources(name, variants_width, storage=default_storage):
+    """
+    Наборы srcset по форматам или None, если варианты ещё не созданы
+    (например, до запуска generate_image_variants).
+    """
+    if not variants_width:
+        return None
+    widths = srcset_widths(variants_width)
+    return [
+        {
+            "type": mime_type,
+            "srcset": ", ".join(
+                f"{storage.url(variant_name(name, width, extension))} "
+                f"{actual}w"
+                for width, actual in widths
+            ),
+        }
+        for extension, _, mime_type in VARIANT_FORMATS
+    ]
@@ -0,0 +1,132 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from blog.bench import ROLES, ROUTES, compare, run
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет маршруты блога и регистрации через тестовый Client "
+        "анонимно (с холодным и прогретым кэшем страниц) и от имени "
+        "автора: p50/p95/p99, SQL-запросы и размер ответа. Сохраняет "
+        "результат в JSON и сравнивает с базовой линией. Запускайте "
+        "на базе, заполненной seed_blog."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--route",
+            action="append",
+            choices=[route.name for route in ROUTES],
+            help="Замерить только этот маршрут; можно повторять.",
+        )
+        parser.add_argument(
+            "--role",
+            action="append",
+            choices=ROLES,
+            help="Замерить только эту роль; можно повторять.",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=50,
+            help="Количество замеряемых запросов на маршрут.",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=5,
+            help="Запросы на прогрев кешей перед замером.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Сохранить результат в этот JSON-файл.",
+        )
+        parser.add_argument(
+            "--baseline",
+            help="JSON-файл прошлого замера для сравнения.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=10.0,
+            help="Допустимый рост p95 в процентах.",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Завершиться с ошибкой, если есть регрессии.",
+        )
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1:
+            raise CommandError("--iterations должно быть больше нуля.")
+        routes = [
+            route
+            for route in ROUTES
+            if not options["route"] or route.name in options["route"]
+        ]
+        try:
+            results = run(
+                routes,
+                options["role"] or ROLES,
+                options["iterations"],
+                options["warmup"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        for key, result in results.items():
+            self.stdout.write(
+                f"{key}: {result['status']}, "
+                f"p50 {result['p50_ms']:.1f} мс, "
+                f"p95 {result['p95_ms']:.1f} мс, "
+                f"p99 {result['p99_ms']:.1f} мс, "
+                f"запросов {result['queries']} "
+                f"({result['sql_ms']:.1f} мс), "
+                f"{result['bytes']} байт"
+            )
+        if options["output"]:
+            report = {
+                "meta": {
+                    "created_at": timezone.now().isoformat(),
+                    "database": connection.vendor,
+                    "iterations": options["iterations"],
+                    "warmup": options["warmup"],
+                },
+                "routes": results,
+            }
+            Path(options["output"]).write_text(
+                json.dumps(report, ensure_ascii=False, indent=2),
+                encoding="utf-8",
+            )
+            self.stdout.write(f"Результат сохранён в {options['output']}")
+        if options["baseline"]:
+            self._compare(results, options)
+
+    def _compare(self, results, options):
+        try:
+            baseline = json.loads(
+                Path(options["baseline"]).read_text(encoding="utf-8")
+            )["routes"]
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f"Не удалось прочитать базовую линию: {e}")
+        deltas = compare(results, baseline, options["threshold"])
+        regressions = [key for key, delta in deltas.items()
+                       if delta["regression"]]
+        for key, delta in deltas.items():
+            line = (
+                f"{key}: p95 {delta.get('p95_ms', 0):+.1f} мс, "
+                f"запросов {delta.get('queries', 0):+d}, "
+                f"{delta.get('bytes', 0):+d} байт"
+            )
+            if delta["regression"]:
+                line = self.style.ERROR(f"{line} — регрессия")
+            self.stdout.write(line)
+        if regressions and options["fail_on_regression"]:
+            raise CommandError(
+                f"Регрессии в {len(regressions)} маршрутах."
+            )
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.sitemaps import INDEX_NAME, build_sitemaps, sitemap_root
+
+
+class Command(BaseCommand):
+    help = (
+        "Обновляет файлы sitemap в BLOG_SITEMAP_ROOT: перезаписывает "
+        "только шарды, в которых изменились посты, категории или профили."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base-url",
+            default=settings.BLOG_SITEMAP_BASE_URL,
+            help="Адрес сайта для абсолютных ссылок в sitemap.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Перезаписать все шарды независимо от сохранённых подписей.",
+        )
+
+    def handle(self, *args, base_url, force, **options):
+        report = build_sitemaps(base_url, force=force)
+        for filename in report["written"]:
+            self.stdout.write(f"Записан {filename}")
+        for filename in report["removed"]:
+            self.stdout.write(f"Удалён {filename}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Индекс {sitemap_root() / INDEX_NAME}: "
+                f"записано {len(report['written'])}, "
+                f"удалено {len(report['removed'])}, "
+                f"без изменений {len(report['unchanged'])}"
+            )
+        )
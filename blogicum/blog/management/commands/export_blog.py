@@ -0,0 +1,61 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.transfer import dump_record, export_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Выгружает пользователей, категории, локации, посты и комментарии "
+        "потоком в формате фикстур Django (JSON-массив или NDJSON)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "output", help="Файл для выгрузки; «-» — стандартный вывод."
+        )
+        parser.add_argument(
+            "--format",
+            choices=("json", "ndjson"),
+            default="ndjson",
+            help="json совместим с loaddata, ndjson — запись на строку.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Количество строк, читаемых из базы за один запрос.",
+        )
+
+    def handle(self, *args, output, format, batch_size, **options):
+        started = time.monotonic()
+        file = (
+            sys.stdout
+            if output == "-"
+            else open(output, "w", encoding="utf-8")
+        )
+        rows = 0
+        try:
+            if format == "json":
+                file.write("[")
+            for record in export_records(batch_size):
+                if format == "json":
+                    file.write(",\n" if rows else "\n")
+                    file.write(dump_record(record))
+                else:
+                    file.write(dump_record(record) + "\n")
+                rows += 1
+            if format == "json":
+                file.write("\n]\n")
+        finally:
+            if file is not sys.stdout:
+                file.close()
+        elapsed = time.monotonic() - started
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"Выгружено записей: {rows} за {elapsed:.2f} с "
+                f"({rows / elapsed if elapsed else 0:.0f} строк/с)"
+            )
+        )
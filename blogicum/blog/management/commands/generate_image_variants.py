@@ -0,0 +1,74 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from blog.cache import REFDATA_SCOPE, invalidate, scopes_for_posts
+from blog.images import generate_variants_safely
+from blog.models import Post
+
+
+def _process(name, force):
+    width, created = generate_variants_safely(name, force=force)
+    return name, width, len(created)
+
+
+class Command(BaseCommand):
+    help = (
+        "Создаёт уменьшенные варианты WebP/JPEG для уже загруженных "
+        "изображений постов в пуле процессов."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Число процессов; по умолчанию — по числу ядер.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Пересоздать уже существующие варианты.",
+        )
+
+    def handle(self, *args, workers, force, **options):
+        with_images = Post.objects.exclude(image="")
+        names = list(
+            with_images.order_by()
+            .values_list("image", flat=True)
+            .distinct()
+            .iterator()
+        )
+        # Дочерним процессам не нужны открытые соединения родителя.
+        connections.close_all()
+
+        created = 0
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=django.setup
+        ) as executor:
+            for done, (name, width, count) in enumerate(
+                executor.map(
+                    _process,
+                    names,
+                    [force] * len(names),
+                    chunksize=16,
+                ),
+                start=1,
+            ):
+                created += count
+                if width:
+                    with_images.filter(image=name).update(
+                        variants_width=width
+                    )
+                if done % 100 == 0:
+                    self.stdout.write(f"Обработано {done} из {len(names)}")
+
+        # Карточки и страницы должны подхватить новые srcset.
+        invalidate(scopes_for_posts(with_images) | {REFDATA_SCOPE})
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Изображений: {len(names)}, создано вариантов: {created}"
+            )
+        )
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.transfer import BlogImporter
+
+
+class Command(BaseCommand):
+    help = (
+        "Загружает выгрузку export_blog или db.json потоком, пакетами "
+        "bulk_create, с новыми первичными ключами. Пользователи "
+        "сопоставляются по username, категории — по slug."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="JSON-массив или NDJSON-файл.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Количество записей в одном bulk_create и транзакции.",
+        )
+
+    def handle(self, *args, path, batch_size, **options):
+        importer = BlogImporter(
+            lambda: open(path, encoding="utf-8"), batch_size=batch_size
+        )
+        try:
+            stats = importer.run()
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+        for label, model_stats in stats.items():
+            self.stdout.write(
+                f"{label}: создано {model_stats.created}, "
+                f"сопоставлено {model_stats.matched}, "
+                f"пропущено {model_stats.skipped}, "
+                f"{model_stats.rows_per_second:.0f} строк/с"
+            )
+        if importer.ignored:
+            self.stdout.write(
+                f"Пропущено записей других моделей: {importer.ignored}"
+            )
+        self.stdout.write(self.style.SUCCESS("Импорт завершён"))
@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.cache import invalidate, invalidate_posts, scopes_for_posts
+from blog.models import AuthorStats, Post
+from blog.signals import refresh_author_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Открывает отложенные публикации, у которых наступило pub_date. "
+        "Запускайте по cron раз в минуту или с --loop как фоновый процесс."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Проверять очередь каждые --interval секунд, не завершаясь.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=60,
+            help="Пауза между проверками в режиме --loop, секунды.",
+        )
+        parser.add_argument(
+            "--refresh-all",
+            action="store_true",
+            help="Полностью пересчитать is_visible у всех постов.",
+        )
+
+    def handle(self, *args, loop, interval, refresh_all, **options):
+        if refresh_all:
+            updated = Post.objects.refresh_visibility()
+            AuthorStats.objects.rebuild()
+            invalidate(scopes_for_posts(Post.objects.all()))
+            self.stdout.write(f"Пересчитана видимость постов: {updated}")
+        while True:
+            published = Post.objects.publish_due()
+            if published:
+                refresh_author_stats(Post.objects.filter(pk__in=published))
+                invalidate_posts(published)
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Опубликовано постов: {len(published)}"
+                    )
+                )
+            if not loop:
+                break
+            time.sleep(interval)
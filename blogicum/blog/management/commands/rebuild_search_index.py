@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from blog.search import rebuild_index, search_enabled
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересобирает полнотекстовый индекс постов и комментариев, "
+        "например после загрузки данных в обход сигналов."
+    )
+
+    def handle(self, *args, **options):
+        if not search_enabled():
+            raise CommandError(
+                "Полнотекстовый поиск доступен только в SQLite."
+            )
+        with transaction.atomic():
+            indexed = rebuild_index()
+        self.stdout.write(
+            self.style.SUCCESS(f"Проиндексировано постов: {indexed}")
+        )
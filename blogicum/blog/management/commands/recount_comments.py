@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает денормализованный Post.comment_count "
+        "пакетными UPDATE по диапазонам id."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Количество id постов, пересчитываемых одним UPDATE.",
+        )
+
+    def handle(self, *args, batch_size, **options):
+        counts = (
+            Comment.objects.filter(post=OuterRef("pk"))
+            .order_by()
+            .values("post")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        last_id = Post.objects.aggregate(last_id=Max("pk"))["last_id"] or 0
+        updated = 0
+        for start in range(0, last_id + 1, batch_size):
+            with transaction.atomic():
+                updated += Post.objects.filter(
+                    pk__gte=start, pk__lt=start + batch_size
+                ).update(comment_count=Coalesce(Subquery(counts), 0))
+        self.stdout.write(
+            self.style.SUCCESS(f"Пересчитано счётчиков: {updated}")
+        )
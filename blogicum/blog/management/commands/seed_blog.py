@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.seeding import SEED, SEED_PASSWORD, BlogSeeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Заполняет базу синтетическими пользователями, категориями, "
+        "локациями, постами и комментариями с реалистичными перекосами "
+        "для нагрузочных замеров."
+    )
+
+    def add_arguments(self, parser):
+        for name, default in (
+            ("users", 1000),
+            ("categories", 20),
+            ("locations", 100),
+            ("posts", 10000),
+            ("comments", 50000),
+        ):
+            parser.add_argument(
+                f"--{name}",
+                type=int,
+                default=default,
+                help=f"Сколько создать записей ({default} по умолчанию).",
+            )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=SEED,
+            help="Seed генератора: одинаковый seed даёт одинаковые данные.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Количество строк в одном bulk_create и транзакции.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            seeder = BlogSeeder(
+                users=options["users"],
+                categories=options["categories"],
+                locations=options["locations"],
+                posts=options["posts"],
+                comments=options["comments"],
+                seed=options["seed"],
+                batch_size=options["batch_size"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        stats = seeder.run()
+        for label, model_stats in stats.items():
+            self.stdout.write(
+                f"{label}: создано {model_stats.created}, "
+                f"{model_stats.rows_per_second:.0f} строк/с"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Готово; пароль созданных пользователей: {SEED_PASSWORD}"
+            )
+        )
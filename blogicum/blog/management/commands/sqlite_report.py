@@ -0,0 +1,91 @@
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from blog.db import (
+    benchmark,
+    configured_pragmas,
+    format_pragmas,
+    read_pragmas,
+)
+
+BENCHMARK_COLUMNS = (
+    ("writes_per_second", "запись, оп/с"),
+    ("mixed_reads_per_second", "чтение при записи, оп/с"),
+    ("mixed_writes_per_second", "запись при чтении, оп/с"),
+    ("lock_errors", "ошибок блокировки"),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Показывает настроенные и действующие PRAGMA соединения с SQLite "
+        "и с --benchmark сравнивает их со значениями по умолчанию."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--benchmark",
+            action="store_true",
+            help="Замерить скорость на временных файлах базы.",
+        )
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=2000,
+            help="Количество вставок по транзакции на строку.",
+        )
+        parser.add_argument(
+            "--seconds",
+            type=float,
+            default=2.0,
+            help="Длительность смешанной нагрузки, секунды.",
+        )
+        parser.add_argument(
+            "--readers",
+            type=int,
+            default=4,
+            help="Количество читающих потоков в смешанной нагрузке.",
+        )
+
+    def handle(self, *args, benchmark, rows, seconds, readers, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("Команда работает только с SQLite.")
+        pragmas = configured_pragmas()
+        self.stdout.write(f"База: {connection.settings_dict['NAME']}")
+        self.stdout.write(
+            f"Настроено: {format_pragmas(pragmas) or 'по умолчанию'}"
+        )
+        with connection.cursor() as cursor:
+            effective = read_pragmas(cursor)
+        self.stdout.write(f"Действует: {format_pragmas(effective)}")
+        if not benchmark:
+            return
+
+        results = {}
+        with tempfile.TemporaryDirectory() as directory:
+            for label, options in (
+                ("по умолчанию", {}),
+                ("BLOG_SQLITE_PRAGMAS", pragmas),
+            ):
+                results[label] = self._run(
+                    Path(directory) / f"{len(results)}.sqlite3",
+                    options,
+                    rows,
+                    seconds,
+                    readers,
+                )
+        for key, title in BENCHMARK_COLUMNS:
+            default, tuned = (result[key] for result in results.values())
+            ratio = f" (x{tuned / default:.1f})" if default else ""
+            self.stdout.write(
+                f"{title}: {default:.0f} -> {tuned:.0f}{ratio}"
+            )
+
+    def _run(self, path, pragmas, rows, seconds, readers):
+        self.stdout.write(
+            f"Замер: {format_pragmas(pragmas) or 'по умолчанию'}"
+        )
+        return benchmark(str(path), pragmas, rows, seconds, readers)
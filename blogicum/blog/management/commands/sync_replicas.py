@@ -0,0 +1,45 @@
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from blog.db import copy_database
+from blog.routers import read_replicas
+
+
+class Command(BaseCommand):
+    help = (
+        "Копирует основную базу SQLite в реплики из BLOG_READ_REPLICAS: "
+        "замена репликации для локального запуска с репликами-файлами."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Копировать повторно до остановки процесса.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Пауза между копированиями в режиме --loop, секунды.",
+        )
+
+    def handle(self, *args, loop, interval, **options):
+        replicas = read_replicas()
+        if not replicas:
+            raise CommandError("В BLOG_READ_REPLICAS нет баз из DATABASES.")
+        while True:
+            for alias in replicas:
+                try:
+                    copy_database(DEFAULT_DB_ALIAS, alias)
+                except ImproperlyConfigured as e:
+                    raise CommandError(str(e))
+            self.stdout.write(
+                self.style.SUCCESS(f"Скопировано в: {', '.join(replicas)}")
+            )
+            if not loop:
+                break
+            time.sleep(interval)
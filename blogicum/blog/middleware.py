@@ -0,0 +1,81 @@
+import logging
+import random
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .profiling import profiling_request
+from .routers import (
+    is_pinned,
+    pin_to_primary,
+    read_replicas,
+    routing_request,
+)
+
+logger = logging.getLogger("blog.profiling")
+
+
+class PrimaryPinMiddleware:
+    """
+    Открывает состояние маршрутизации запроса и после записи в базу
+    закрепляет сессию за основной базой. Ставится после
+    SessionMiddleware, чтобы метка сохранилась вместе с сессией.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        session = getattr(request, "session", None)
+        # Без реплик сессия не читается: закреплять нечего.
+        replicated = session is not None and bool(read_replicas())
+        with routing_request(replicated and is_pinned(session)) as state:
+            response = self.get_response(request)
+        if replicated and state.wrote:
+            pin_to_primary(session)
+        return response
+
+
+class ServerTimingMiddleware:
+    """
+    Добавляет к ответу заголовок Server-Timing: время запроса, число
+    и время SQL, отрисовку шаблонов и попадания в кэш. Заголовок
+    получают только персонал и адреса из INTERNAL_IPS: остальным
+    клиентам время запросов к базе не раскрывается. Доля
+    BLOG_PROFILING_LOG_SAMPLE_RATE запросов пишется в лог blog.profiling.
+    Без BLOG_SERVER_TIMING middleware отключается при загрузке.
+    Ставится первым, чтобы время включало остальные middleware.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "BLOG_SERVER_TIMING", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(
+            settings, "BLOG_PROFILING_LOG_SAMPLE_RATE", 0
+        )
+
+    def __call__(self, request):
+        with profiling_request() as profile:
+            response = self.get_response(request)
+        profile.streamed = response.streaming
+        if self.exposed_to(request):
+            response["Server-Timing"] = profile.server_timing()
+        if self.sample_rate and random.random() < self.sample_rate:
+            values = profile.as_dict()
+            logger.info(
+                "%s %s %s %s",
+                request.method,
+                request.path,
+                response.status_code,
+                " ".join(f"{key}={value}" for key, value in values.items()),
+                extra={"profile": values},
+            )
+        return response
+
+    @staticmethod
+    def exposed_to(request):
+        if request.META.get("REMOTE_ADDR") in settings.INTERNAL_IPS:
+            return True
+        user = getattr(request, "user", None)
+        return user is not None and user.is_staff
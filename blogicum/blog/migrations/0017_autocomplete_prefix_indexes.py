@@ -0,0 +1,45 @@
+from django.db import migrations
+
+# Таблица, колонка и имя индекса под поиск по началу строки (istartswith).
+PREFIX_INDEXES = (
+    ('users_user', 'username', 'user_username_prefix_idx'),
+    ('blog_post', 'title', 'post_title_prefix_idx'),
+    ('blog_category', 'title', 'category_title_prefix_idx'),
+    ('blog_location', 'name', 'location_name_prefix_idx'),
+)
+
+
+def create_prefix_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table, column, name in PREFIX_INDEXES:
+        if vendor == 'sqlite':
+            # LIKE в SQLite регистронезависим и использует индекс
+            # только с правилом сравнения NOCASE.
+            expression = f'"{column}" COLLATE NOCASE'
+        elif vendor == 'postgresql':
+            # Django сравнивает UPPER("column") LIKE UPPER(%s).
+            expression = f'UPPER("{column}") varchar_pattern_ops'
+        else:
+            continue
+        schema_editor.execute(
+            f'CREATE INDEX "{name}" ON "{table}" ({expression})'
+        )
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor not in ('sqlite', 'postgresql'):
+        return
+    for _, _, name in PREFIX_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('blog', '0016_post_comment_count_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models.functions import Coalesce
+
+
+def fill_author_stats(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    Post = apps.get_model('blog', 'Post')
+    Comment = apps.get_model('blog', 'Comment')
+    AuthorStats = apps.get_model('blog', 'AuthorStats')
+    AuthorStats.objects.bulk_create(
+        AuthorStats(author_id=pk)
+        for pk in User.objects.values_list('pk', flat=True).iterator()
+    )
+    posts = Post.objects.filter(
+        author_id=models.OuterRef('author_id'), is_visible=True
+    ).order_by().values('author_id')
+    comments = Comment.objects.filter(
+        author_id=models.OuterRef('author_id')
+    ).order_by().values('author_id')
+    AuthorStats.objects.update(
+        post_count=Coalesce(models.Subquery(
+            posts.annotate(total=models.Count('pk')).values('total')
+        ), 0),
+        comment_count=Coalesce(models.Subquery(
+            comments.annotate(total=models.Count('pk')).values('total')
+        ), 0),
+        last_post_at=models.Subquery(
+            posts.annotate(latest=models.Max('pub_date')).values('latest')
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('blog', '0017_autocomplete_prefix_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='author_stats', serialize=False, to='users.user', verbose_name='Автор')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='Публикаций')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Комментариев')),
+                ('last_post_at', models.DateTimeField(blank=True, null=True, verbose_name='Последняя публикация')),
+            ],
+            options={
+                'verbose_name': 'статистика автора',
+                'verbose_name_plural': 'Статистика авторов',
+            },
+        ),
+        migrations.RunPython(fill_author_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+from django.db import migrations
+
+POST_TABLE = 'blog_post_search'
+COMMENT_TABLE = 'blog_comment_search'
+TOKENIZE = "tokenize = 'unicode61 remove_diacritics 2'"
+
+
+def split_comment_index(apps, schema_editor):
+    # Комментарии индексируются отдельными строками: дописывание
+    # в общую колонку поста переиндексировало все его комментарии.
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {POST_TABLE}")
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {POST_TABLE} USING fts5("
+        f"title, text, {TOKENIZE})"
+    )
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {COMMENT_TABLE} USING fts5("
+        f"text, post_id UNINDEXED, {TOKENIZE})"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {POST_TABLE} (rowid, title, text) "
+        "SELECT id, title, text FROM blog_post"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {COMMENT_TABLE} (rowid, text, post_id) "
+        "SELECT id, text, post_id FROM blog_comment"
+    )
+
+
+def merge_comment_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {COMMENT_TABLE}")
+    schema_editor.execute(f"DROP TABLE IF EXISTS {POST_TABLE}")
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {POST_TABLE} USING fts5("
+        f"title, text, comments, {TOKENIZE})"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {POST_TABLE} (rowid, title, text, comments) "
+        "SELECT p.id, p.title, p.text, coalesce(("
+        "SELECT group_concat(c.text, ' ') FROM blog_comment c "
+        "WHERE c.post_id = p.id), '') FROM blog_post p"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0018_author_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(split_comment_index, merge_comment_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-18 21:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0019_comment_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='variants_width',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, help_text='Настоящая ширина наибольшего уменьшенного варианта; пусто, пока варианты не созданы.', null=True, verbose_name='Ширина вариантов изображения'),
+        ),
+    ]
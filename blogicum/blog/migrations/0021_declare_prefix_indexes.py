@@ -0,0 +1,44 @@
+# Generated by Django 3.2.16 on 2026-10-18 21:52
+
+from django.db import migrations, models
+import django.db.models.functions.comparison
+
+# Индексы из 0017 создавались сырым SQL, и SQLite терял их при
+# перестройке таблицы (0020 удалил post_title_prefix_idx). Теперь они
+# объявлены в Meta.indexes, а уцелевшие старые копии удаляются, чтобы
+# AddIndex создал их под тем же именем.
+PREFIX_INDEXES = (
+    'category_title_prefix_idx',
+    'location_name_prefix_idx',
+    'post_title_prefix_idx',
+)
+
+
+def drop_raw_prefix_indexes(apps, schema_editor):
+    for name in PREFIX_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0020_post_variants_width'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            drop_raw_prefix_indexes, migrations.RunPython.noop
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(django.db.models.functions.comparison.Collate('title', 'nocase'), name='category_title_prefix_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='location',
+            index=models.Index(django.db.models.functions.comparison.Collate('name', 'nocase'), name='location_name_prefix_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(django.db.models.functions.comparison.Collate('title', 'nocase'), name='post_title_prefix_idx'),
+        ),
+    ]
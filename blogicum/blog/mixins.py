@@ -1,4 +1,19 @@
+from django.core.cache import cache
+from django.http import Http404
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from .cache import (
+    INDEX_SCOPE,
+    page_cache_key,
+    page_cache_timeout,
+    page_validators,
+    scopes_changed_at,
+)
 from .models import Comment, Post
+from .paginators import CursorPaginator, InvalidCursor
+from .profiling import record_cache_lookup
+from .routers import read_from_replica, replica_may_lag
 
 
 class PostsQuerySetMixin:
@@ -6,10 +21,133 @@ class PostsQuerySetMixin:
         return Post.post_list
 
 
+class ReplicaReadMixin:
+    """
+    GET и HEAD читают с реплики. Ответ рендерится внутри блока,
+    чтобы на реплику ушли и запросы, выполняемые шаблонами.
+    """
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return super().dispatch(request, *args, **kwargs)
+        with read_from_replica():
+            response = super().dispatch(request, *args, **kwargs)
+            if getattr(response, "is_rendered", True) is False:
+                response.render()
+        return response
+
+
+class CursorPaginationMixin:
+    """
+    Курсорная пагинация лент по (pub_date, id) через ?after=/?before=.
+    Старые ссылки вида ?page=N обслуживаются обычной OFFSET-пагинацией.
+    """
+    paginate_ordering = ("-pub_date", "-pk")
+
+    def paginate_queryset(self, queryset, page_size):
+        queryset = queryset.order_by(*self.paginate_ordering)
+        if self.page_kwarg in self.request.GET:
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = CursorPaginator(
+            queryset, page_size, ordering=self.paginate_ordering
+        )
+        try:
+            page = paginator.page(
+                after=self.request.GET.get("after"),
+                before=self.request.GET.get("before"),
+            )
+        except InvalidCursor as e:
+            raise Http404(str(e))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class ConditionalGetMixin:
+    """
+    Отвечает 304 Not Modified до выборок и рендеринга, если версии
+    областей из get_cache_scopes() не менялись с прошлого ответа.
+    Ставится перед AnonymousPageCacheMixin, чтобы не читать и кэш.
+    Пока реплика может отставать от последнего изменения областей,
+    валидаторы не выдаются: иначе устаревший ответ реплики получил бы
+    ETag новой версии и не обновлялся бы у клиента.
+    """
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return super().dispatch(request, *args, **kwargs)
+
+        etag, last_modified = page_validators(
+            self.get_cache_scopes(),
+            request.get_full_path(),
+            request.user.pk,
+            # Секрет меняется при входе: страница с формой комментария
+            # не должна отдаваться из кэша браузера со старым токеном.
+            request.META.get("CSRF_COOKIE", ""),
+        )
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=last_modified and int(last_modified.timestamp()),
+        )
+        if response is None and replica_may_lag(last_modified):
+            return super().dispatch(request, *args, **kwargs)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        patch_vary_headers(response, ("Cookie",))
+        return response
+
+
+class AnonymousPageCacheMixin:
+    """
+    Кэширует целиком страницы для анонимных пользователей.
+    Ключ зависит от версий областей из get_cache_scopes() (по умолчанию
+    cache_scopes — лента index), которые сбрасываются сигналами при
+    изменении постов, комментариев, категорий и локаций. Страница,
+    прочитанная с реплики раньше, чем та успела догнать последнее
+    изменение, не сохраняется.
+    """
+    cache_scopes = (INDEX_SCOPE,)
+
+    def get_cache_scopes(self):
+        return list(self.cache_scopes)
+
+    def dispatch(self, request, *args, **kwargs):
+        if (
+            request.method not in ("GET", "HEAD")
+            or request.user.is_authenticated
+        ):
+            return super().dispatch(request, *args, **kwargs)
+
+        scopes = self.get_cache_scopes()
+        key = page_cache_key(scopes, request.get_full_path())
+        response = cache.get(key)
+        record_cache_lookup(response is not None)
+        if response is not None:
+            return response
+
+        response = super().dispatch(request, *args, **kwargs)
+        if (
+            response.status_code == 200
+            and not response.cookies
+            and not replica_may_lag(scopes_changed_at(scopes))
+        ):
+            def store(rendered):
+                cache.set(key, rendered, page_cache_timeout())
+
+            if getattr(response, "is_rendered", True):
+                store(response)
+            else:
+                response.add_post_render_callback(store)
+        return response
+
+
 class PostsEditMixin:
     model = Post
     template_name = "blog/create.html"
-    queryset = Post.objects.select_related("author", "location", "category")
+    queryset = Post.objects.select_related("author").with_reference_data()
 
 
 class CommentEditMixin:
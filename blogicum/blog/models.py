@@ -2,31 +2,115 @@
 # 1. Правильные внешние ключи (CASCADE/SET_NULL)
 # 2. Оптимизированные запросы через менеджеры
 # 3. После автотестов: related_name, help_text
+# 4. Видимость поста материализована в Post.is_visible
+# 5. Статистика авторов для профиля хранится в AuthorStats
 
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models.functions import Coalesce, Collate, Greatest
 from django.urls import reverse
 from django.utils import timezone
 
 User = get_user_model()
 
 
-class PostManager(models.Manager):
-    """Менеджер для фильтрации опубликованных постов"""
+def prefix_index(field, name):
+    """
+    Индекс под поиск по началу строки (istartswith): LIKE в SQLite
+    регистронезависим и использует индекс только с правилом NOCASE.
+    """
+    return models.Index(Collate(field, "nocase"), name=name)
+
+
+# Поля поста, от которых зависит is_visible (attname, как в
+# Model.get_deferred_fields()).
+VISIBILITY_FIELDS = frozenset({"is_published", "pub_date", "category_id"})
+
+
+def visibility_expression(check_published=True):
+    """
+    Выражение для is_visible в UPDATE. Без check_published флаг
+    публикации самого поста считается установленным: UPDATE читает
+    старые значения строки, даже если меняет is_published.
+    """
+    published_category = Category.objects.filter(
+        pk=models.OuterRef("category_id"), is_published=True
+    )
+    conditions = {"pub_date__lte": timezone.now()}
+    if check_published:
+        conditions["is_published"] = True
+    return models.Case(
+        models.When(
+            models.Exists(published_category),
+            then=models.Value(True),
+            **conditions,
+        ),
+        default=models.Value(False),
+    )
+
+
+class PostQuerySet(models.QuerySet):
+    """Массовый пересчёт материализованного флага is_visible"""
+    def refresh_visibility(self):
+        """Пересчитывает is_visible для выборки одним UPDATE."""
+        return self.update(is_visible=visibility_expression())
+
+    def with_reference_data(self):
+        """Категории и локации постов из кэша blog.refdata без JOIN."""
+        # refdata импортирует модели, поэтому импорт отложен.
+        from .refdata import ReferenceDataIterable
+
+        clone = self._chain()
+        clone._iterable_class = ReferenceDataIterable
+        return clone
+
+    def set_published(self, is_published):
+        """
+        Публикует или снимает посты одним UPDATE вместе с is_visible
+        и updated_at. Сигналы моделей не вызываются.
+        """
+        return self.update(
+            is_published=is_published,
+            is_visible=(
+                visibility_expression(check_published=False)
+                if is_published
+                else models.Value(False)
+            ),
+            updated_at=timezone.now(),
+        )
+
+    def publish_due(self):
+        """
+        Открывает отложенные посты, время публикации которых настало.
+        Возвращает id открытых постов для инвалидации кэша.
+        """
+        due = list(
+            self.filter(
+                is_visible=False,
+                is_published=True,
+                pub_date__lte=timezone.now(),
+                category__is_published=True,
+            ).values_list("pk", flat=True)
+        )
+        if due:
+            self.filter(pk__in=due).update(is_visible=True)
+        return due
+
+
+class PostManager(models.Manager.from_queryset(PostQuerySet)):
+    """
+    Менеджер опубликованных постов.
+    Фильтрует по индексированному is_visible, поэтому запрос не зависит
+    от текущего времени и не требует соединения с категориями.
+    Категории и локации подставляются из кэша справочников.
+    """
     def get_queryset(self):
         return (
             super()
             .get_queryset()
-            .select_related(
-                "category",
-                "author",
-                "location",
-            )
-            .filter(
-                is_published=True,
-                category__is_published=True,
-                pub_date__lte=timezone.now(),
-            )
+            .select_related("author")
+            .with_reference_data()
+            .filter(is_visible=True)
             .order_by("-pub_date")
         )
 
@@ -68,6 +152,7 @@ class Category(BaseModel):
     class Meta:
         verbose_name = "категория"
         verbose_name_plural = "Категории"
+        indexes = (prefix_index("title", "category_title_prefix_idx"),)
 
     def __str__(self) -> str:
         return self.title
@@ -88,6 +173,7 @@ class Location(BaseModel):
     class Meta:
         verbose_name = "местоположение"
         verbose_name_plural = "Местоположения"
+        indexes = (prefix_index("name", "location_name_prefix_idx"),)
 
     def __str__(self) -> str:
         return self.name
@@ -98,6 +184,10 @@ class Post(BaseModel):
     Основная модель поста с двумя менеджерами:
     - objects для всех запросов
     - post_list для фильтрации опубликованных постов
+
+    is_visible хранит итог проверки публикации поста, его категории
+    и наступления pub_date; отложенные посты открывает команда
+    publish_scheduled.
     """
     title = models.CharField(max_length=256, verbose_name="Заголовок")
     text = models.TextField(verbose_name="Текст")
@@ -130,7 +220,34 @@ class Post(BaseModel):
         blank=True,
     )
     image = models.ImageField("Изображение", blank=True, upload_to="img/")
-    objects = models.Manager()
+    variants_width = models.PositiveSmallIntegerField(
+        verbose_name="Ширина вариантов изображения",
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=(
+            "Настоящая ширина наибольшего уменьшенного варианта; пусто, "
+            "пока варианты не созданы."
+        ),
+    )
+    comment_count = models.PositiveIntegerField(
+        verbose_name="Комментариев",
+        default=0,
+        editable=False,
+        help_text=(
+            "Денормализованный счётчик, обновляется сигналами "
+            "при создании и удалении комментариев."
+        ),
+    )
+    is_visible = models.BooleanField(
+        verbose_name="Виден читателям",
+        default=False,
+        editable=False,
+    )
+    updated_at = models.DateTimeField(
+        verbose_name="Изменено", auto_now=True
+    )
+    objects = PostQuerySet.as_manager()
     post_list = PostManager()
 
     class Meta:
@@ -138,10 +255,76 @@ class Post(BaseModel):
         verbose_name_plural = "Публикации"
         ordering = ("-pub_date",)
         default_related_name = "posts"
+        indexes = (
+            # Автодополнение заголовков в админке и виджетах.
+            prefix_index("title", "post_title_prefix_idx"),
+            # Частичный индекс под ленту PostManager: только видимые.
+            models.Index(
+                fields=("-pub_date", "-id"),
+                condition=models.Q(is_visible=True),
+                name="post_visible_pub_date_idx",
+            ),
+            # Очередь отложенных публикаций для publish_scheduled.
+            models.Index(
+                fields=("pub_date",),
+                condition=models.Q(is_visible=False, is_published=True),
+                name="post_scheduled_idx",
+            ),
+            models.Index(
+                fields=("category", "-pub_date", "-id"),
+                name="post_category_pub_date_idx",
+            ),
+            models.Index(
+                fields=("author", "-pub_date", "-id"),
+                name="post_author_pub_date_idx",
+            ),
+            # Сортировка списка админки по числу комментариев.
+            models.Index(
+                fields=("-comment_count", "-id"),
+                name="post_comment_count_idx",
+            ),
+        )
 
     def __str__(self) -> str:
         return self.title
 
+    def save(self, *args, **kwargs):
+        deferred = self.get_deferred_fields()
+        # Видимость пересчитывается, только если загружено хоть одно из
+        # полей, от которых она зависит: иначе она не могла измениться.
+        track_visibility = not VISIBILITY_FIELDS <= deferred
+        if track_visibility:
+            self.is_visible = self.compute_visibility()
+        update_fields = kwargs.get("update_fields")
+        if (
+            update_fields is None
+            and not self._state.adding
+            and not kwargs.get("force_insert")
+        ):
+            # comment_count пишут только F()-счётчики и recount_comments:
+            # загруженное с экземпляром значение могло устареть. Отложенные
+            # поля (only/defer) не сохраняются, как и в Model.save().
+            update_fields = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name != "comment_count"
+                and field.attname not in deferred
+            ]
+        if update_fields is not None:
+            if track_visibility:
+                update_fields = {*update_fields, "is_visible"}
+            kwargs["update_fields"] = update_fields
+        super().save(*args, **kwargs)
+
+    def compute_visibility(self) -> bool:
+        return bool(
+            self.is_published
+            and self.pub_date <= timezone.now()
+            and self.category_id is not None
+            and self.category.is_published
+        )
+
     def get_absolute_url(self) -> str:
         return reverse("blog:post_detail", kwargs={"pk": self.pk})
 
@@ -174,6 +357,136 @@ class Comment(models.Model):
         verbose_name_plural = "Комментарии"
         ordering = ("created_at",)
         default_related_name = "comments"
+        indexes = (
+            models.Index(
+                fields=("post", "created_at", "id"),
+                name="comment_post_created_at_idx",
+            ),
+        )
 
     def __str__(self):
         return self.text
+
+
+class AuthorStatsQuerySet(models.QuerySet):
+    def refresh(self):
+        """Пересчитывает статистику выборки одним UPDATE с подзапросами."""
+        posts = (
+            Post.objects.filter(
+                author_id=models.OuterRef("author_id"), is_visible=True
+            )
+            .order_by()
+            .values("author_id")
+        )
+        comments = (
+            Comment.objects.filter(author_id=models.OuterRef("author_id"))
+            .order_by()
+            .values("author_id")
+        )
+        return self.update(
+            post_count=Coalesce(
+                models.Subquery(
+                    posts.annotate(total=models.Count("pk")).values("total")
+                ),
+                0,
+            ),
+            comment_count=Coalesce(
+                models.Subquery(
+                    comments.annotate(total=models.Count("pk")).values(
+                        "total"
+                    )
+                ),
+                0,
+            ),
+            last_post_at=models.Subquery(
+                posts.annotate(latest=models.Max("pub_date")).values(
+                    "latest"
+                )
+            ),
+        )
+
+    def rebuild(self, author_ids=None):
+        """
+        Создаёт недостающие строки для авторов (всех или из author_ids,
+        в том числе подзапроса) и пересчитывает их.
+        """
+        users = User.objects.all()
+        stats = self.all()
+        if author_ids is not None:
+            users = users.filter(pk__in=author_ids)
+            stats = stats.filter(author_id__in=author_ids)
+        self.bulk_create(
+            [
+                AuthorStats(author_id=pk)
+                for pk in users.filter(author_stats__isnull=True)
+                .values_list("pk", flat=True)
+                .iterator()
+            ],
+            ignore_conflicts=True,
+        )
+        return stats.refresh()
+
+    def add_post(self, post):
+        """Новый видимый пост учитывается без пересчёта."""
+        if not self.filter(author_id=post.author_id).update(
+            post_count=models.F("post_count") + 1,
+            last_post_at=Greatest(
+                Coalesce("last_post_at", models.Value(post.pub_date)),
+                models.Value(post.pub_date),
+            ),
+        ):
+            self.rebuild([post.author_id])
+
+    def add_comment(self, comment):
+        if not self.filter(author_id=comment.author_id).update(
+            comment_count=models.F("comment_count") + 1
+        ):
+            self.rebuild([comment.author_id])
+
+    def remove_comment(self, comment):
+        """Срабатывает и при каскадном удалении, поэтому строк не создаёт."""
+        self.filter(
+            author_id=comment.author_id, comment_count__gt=0
+        ).update(comment_count=models.F("comment_count") - 1)
+
+    def for_author(self, author):
+        """Статистика автора; при первом обращении строка создаётся."""
+        stats = self.filter(author=author).first()
+        if stats is None:
+            self.rebuild([author.pk])
+            stats = self.get(author=author)
+        return stats
+
+
+class AuthorStats(models.Model):
+    """
+    Денормализованная статистика автора для шапки профиля: видимые
+    посты, написанные комментарии и дата последнего видимого поста.
+    Создание поста и комментария меняют счётчики одним UPDATE, прочие
+    изменения пересчитывают строку целиком. Поддерживается сигналами.
+    """
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="author_stats",
+        verbose_name="Автор",
+    )
+    post_count = models.PositiveIntegerField(
+        verbose_name="Публикаций", default=0
+    )
+    comment_count = models.PositiveIntegerField(
+        verbose_name="Комментариев", default=0
+    )
+    last_post_at = models.DateTimeField(
+        verbose_name="Последняя публикация", null=True, blank=True
+    )
+
+    objects = AuthorStatsQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "статистика автора"
+        verbose_name_plural = "Статистика авторов"
+
+    def __str__(self):
+        return f"Статистика {self.author_id}"
@@ -0,0 +1,190 @@
+"""
+Курсорная (keyset) пагинация для лент публикаций.
+
+В отличие от OFFSET-пагинации Django, страница ищется по значениям
+полей сортировки последней показанной записи, поэтому глубокие страницы
+не требуют сканировать и отбрасывать все предыдущие строки, а COUNT(*)
+не выполняется вовсе.
+
+Для списков админки, где нужны номера страниц, есть
+EstimatedCountPaginator с приближённым числом строк.
+"""
+import base64
+import json
+from collections.abc import Sequence
+from functools import reduce
+from operator import or_
+
+from django.core.paginator import InvalidPage, Paginator
+from django.db import connection
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+class CursorPage(Sequence):
+    """Страница курсорной пагинации с интерфейсом, близким к Page."""
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f"<CursorPage of {len(self.object_list)} objects>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Пагинатор по ключу сортировки, по умолчанию (pub_date, id).
+    Курсоры — непрозрачные base64-токены со значениями полей сортировки
+    крайней записи страницы.
+    """
+    cursor_mode = True
+
+    def __init__(self, object_list, per_page, ordering=("-pub_date", "-pk")):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self._fields = [name.lstrip("-") for name in self.ordering]
+
+    def _model_field(self, name):
+        opts = self.object_list.model._meta
+        return opts.pk if name == "pk" else opts.get_field(name)
+
+    def encode_cursor(self, obj):
+        values = [
+            self._model_field(name).value_to_string(obj)
+            for name in self._fields
+        ]
+        raw = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, token):
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            values = json.loads(raw)
+            if len(values) != len(self._fields):
+                raise ValueError
+            return [
+                self._model_field(name).to_python(value)
+                for name, value in zip(self._fields, values)
+            ]
+        except Exception:
+            raise InvalidCursor("Некорректный курсор страницы")
+
+    def _seek(self, values, forward):
+        """Условие «строго после курсора» в порядке сортировки (или до)."""
+        conditions = []
+        for index, ordering in enumerate(self.ordering):
+            descending = ordering.startswith("-")
+            lookup = "lt" if descending == forward else "gt"
+            condition = {
+                name: value
+                for name, value in zip(self._fields[:index], values)
+            }
+            condition[f"{self._fields[index]}__{lookup}"] = values[index]
+            conditions.append(Q(**condition))
+        return reduce(or_, conditions)
+
+    def page(self, after=None, before=None):
+        if after and before:
+            raise InvalidCursor("Нельзя указать after и before одновременно")
+        queryset = self.object_list
+        if before:
+            reverse_ordering = [
+                name[1:] if name.startswith("-") else f"-{name}"
+                for name in self.ordering
+            ]
+            queryset = queryset.filter(
+                self._seek(self.decode_cursor(before), forward=False)
+            ).order_by(*reverse_ordering)
+        else:
+            queryset = queryset.order_by(*self.ordering)
+            if after:
+                queryset = queryset.filter(
+                    self._seek(self.decode_cursor(after), forward=True)
+                )
+
+        rows = list(queryset[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if before:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, bool(after)
+
+        next_cursor = (
+            self.encode_cursor(rows[-1]) if rows and has_next else None
+        )
+        previous_cursor = (
+            self.encode_cursor(rows[0]) if rows and has_previous else None
+        )
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+
+def estimate_table_rows(model):
+    """
+    Число строк таблицы по статистике СУБД: pg_class.reltuples в
+    PostgreSQL, sqlite_stat1 после ANALYZE в SQLite. None, если
+    статистики нет.
+    """
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = %s::regclass",
+                [table],
+            )
+            row = cursor.fetchone()
+            return row[0] if row and row[0] >= 0 else None
+        if connection.vendor != "sqlite":
+            return None
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        )
+        if cursor.fetchone() is None:
+            return None
+        cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s", [table])
+        # Первое число stat — строки индекса; частичные индексы меньше.
+        counts = [int(stat.split()[0]) for stat, in cursor.fetchall()]
+        return max(counts) if counts else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Пагинатор без полного COUNT(*): для всей таблицы берётся оценка
+    из статистики СУБД, а отфильтрованная выборка считается не дальше
+    count_limit строк подзапросом с LIMIT.
+    """
+    count_limit = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.has_filters():
+            estimate = estimate_table_rows(queryset.model)
+            if estimate is not None and estimate > self.count_limit:
+                return estimate
+        return queryset.order_by()[: self.count_limit + 1].count()
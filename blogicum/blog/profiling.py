@@ -0,0 +1,162 @@
+"""
+Профиль запроса для заголовка Server-Timing и выборочного лога.
+
+ServerTimingMiddleware открывает RequestProfile на время запроса: SQL
+считается обёрткой execute_wrapper на всех соединениях, отрисовка
+шаблонов — бэкендом ProfiledDjangoTemplates, попадания в кэш страниц,
+лент и карточек отмечают сами места чтения через record_cache_lookup().
+Вне запроса с профилем эти замеры ничего не делают. Тело потокового
+ответа формируется уже после выхода из профиля, поэтому для него
+известно только время до начала отдачи.
+"""
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+from django.template.backends.django import DjangoTemplates
+
+_profile = ContextVar("blog_request_profile", default=None)
+
+
+class QueryRecorder:
+    """Обёртка execute_wrapper: считает запросы и их суммарное время."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+
+
+@contextmanager
+def recording_queries(recorder=None):
+    recorder = recorder or QueryRecorder()
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(
+                connections[alias].execute_wrapper(recorder)
+            )
+        yield recorder
+
+
+class RequestProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+        self.queries = QueryRecorder()
+        self.template_seconds = 0.0
+        self.rendering = False
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.streamed = False
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self.started
+
+    def as_dict(self):
+        return {
+            "total_ms": round(self.seconds * 1000, 3),
+            "db_queries": self.queries.count,
+            "db_ms": round(self.queries.seconds * 1000, 3),
+            "template_ms": round(self.template_seconds * 1000, 3),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "streamed": self.streamed,
+        }
+
+    def server_timing(self):
+        """
+        Значение заголовка Server-Timing. Для потокового ответа SQL
+        и шаблоны тела не замерены, поэтому выводится только время
+        до начала отдачи с пометкой streamed.
+        """
+        cache = (
+            f'cache;desc="hits={self.cache_hits} '
+            f'misses={self.cache_misses}"'
+        )
+        if self.streamed:
+            return ", ".join(
+                (
+                    f'total;dur={self.seconds * 1000:.1f};'
+                    f'desc="streamed, body not measured"',
+                    cache,
+                )
+            )
+        return ", ".join(
+            (
+                f"total;dur={self.seconds * 1000:.1f}",
+                f'db;dur={self.queries.seconds * 1000:.1f};'
+                f'desc="{self.queries.count} queries"',
+                f"tpl;dur={self.template_seconds * 1000:.1f}",
+                cache,
+            )
+        )
+
+
+@contextmanager
+def profiling_request():
+    """Профиль запроса; SQL записывается только внутри блока."""
+    profile = RequestProfile()
+    token = _profile.set(profile)
+    try:
+        with recording_queries(profile.queries):
+            yield profile
+    finally:
+        profile.finish()
+        _profile.reset(token)
+
+
+def record_cache_lookup(hit):
+    profile = _profile.get()
+    if profile is None:
+        return
+    if hit:
+        profile.cache_hits += 1
+    else:
+        profile.cache_misses += 1
+
+
+@contextmanager
+def timing_template():
+    """Время отрисовки; вложенные шаблоны входят во внешний замер."""
+    profile = _profile.get()
+    if profile is None or profile.rendering:
+        yield
+        return
+    profile.rendering = True
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.template_seconds += time.perf_counter() - started
+        profile.rendering = False
+
+
+class ProfiledTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    @property
+    def origin(self):
+        return self.template.origin
+
+    def render(self, context=None, request=None):
+        with timing_template():
+            return self.template.render(context, request)
+
+
+class ProfiledDjangoTemplates(DjangoTemplates):
+    """Бэкенд DTL, шаблоны которого засекают время отрисовки."""
+
+    def from_string(self, template_code):
+        return ProfiledTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return ProfiledTemplate(super().get_template(template_name))
@@ -0,0 +1,87 @@
+"""
+Кэш справочников — категорий и локаций — в памяти процесса.
+
+Таблицы маленькие, меняются редко, а читаются на каждой странице:
+в карточках постов, на странице категории и в форме поста. Снимок обеих
+таблиц хранится в процессе вместе с версией области refdata из
+blog.cache. Сигналы меняют эту версию при сохранении и удалении записей,
+и процесс перечитывает снимок при следующем обращении. Версия общая
+для процессов только в общем кэше (Redis, Memcached), поэтому снимок
+ещё и устаревает через BLOG_REFDATA_TTL секунд: с локальным кэшем
+другие процессы увидят изменения не позже этого срока.
+Объекты снимка общие для всех запросов и изменять их нельзя.
+"""
+import time
+
+from django.conf import settings
+from django.db.models.query import ModelIterable
+
+from .cache import REFDATA_SCOPE, get_versions
+from .models import Category, Location
+
+_snapshot = None
+
+
+class ReferenceData:
+    def __init__(self, version):
+        self.version = version
+        self.loaded = time.monotonic()
+        self.categories = {
+            category.pk: category
+            for category in Category.objects.order_by("pk")
+        }
+        self.locations = {
+            location.pk: location
+            for location in Location.objects.order_by("pk")
+        }
+        self.published_categories = {
+            category.slug: category
+            for category in self.categories.values()
+            if category.is_published
+        }
+
+    def published_category(self, slug):
+        return self.published_categories.get(slug)
+
+    def objects(self, model):
+        return {Category: self.categories, Location: self.locations}[model]
+
+    def attach(self, post):
+        """
+        Кладёт категорию и локацию поста в кэш его связей. Запись,
+        которой нет в снимке, загрузится обычным запросом при обращении.
+        """
+        for name, objects in (
+            ("category", self.categories),
+            ("location", self.locations),
+        ):
+            obj = objects.get(getattr(post, f"{name}_id"))
+            if obj is not None:
+                post._meta.get_field(name).set_cached_value(post, obj)
+
+
+def reference_data():
+    """
+    Снимок справочников, перечитанный, если сменилась версия или
+    истёк BLOG_REFDATA_TTL.
+    """
+    global _snapshot
+    version = get_versions([REFDATA_SCOPE])[0]
+    ttl = getattr(settings, "BLOG_REFDATA_TTL", 60)
+    if (
+        _snapshot is None
+        or _snapshot.version != version
+        or time.monotonic() - _snapshot.loaded >= ttl
+    ):
+        _snapshot = ReferenceData(version)
+    return _snapshot
+
+
+class ReferenceDataIterable(ModelIterable):
+    """Посты выборки получают категории и локации из снимка."""
+
+    def __iter__(self):
+        data = reference_data()
+        for post in super().__iter__():
+            data.attach(post)
+            yield post
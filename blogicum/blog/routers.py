@@ -0,0 +1,125 @@
+"""
+Чтение лент и страниц постов с реплик базы.
+
+Представления читают внутри read_from_replica(): запросы к моделям
+blog и users уходят на реплику из BLOG_READ_REPLICAS, выбранную
+на весь запрос, а запись всегда идёт в default. Состояние запроса
+хранится в contextvar, который открывает PrimaryPinMiddleware. После
+записи пользователь BLOG_PRIMARY_PIN_SECONDS секунд читает только
+с основной базы и видит свои изменения, пока реплики догоняют её.
+"""
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Сессии, права и прочие служебные таблицы читаются с основной базы.
+REPLICA_APP_LABELS = {"blog", "users"}
+PIN_SESSION_KEY = "blog_primary_until"
+
+_state = ContextVar("blog_db_routing", default=None)
+
+
+class RoutingState:
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.replica = None
+        self.wrote = False
+
+
+def read_replicas():
+    return [
+        alias
+        for alias in getattr(settings, "BLOG_READ_REPLICAS", ())
+        if alias in connections.databases
+    ]
+
+
+def is_pinned(session):
+    return session.get(PIN_SESSION_KEY, 0) > time.time()
+
+
+def pin_to_primary(session):
+    session[PIN_SESSION_KEY] = (
+        time.time() + settings.BLOG_PRIMARY_PIN_SECONDS
+    )
+
+
+@contextmanager
+def routing_request(pinned=False):
+    """Состояние маршрутизации на время одного запроса."""
+    state = RoutingState(pinned)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+@contextmanager
+def read_from_replica():
+    """
+    Чтение с реплики внутри блока, если запрос идёт через
+    PrimaryPinMiddleware, не закреплён за основной базой и реплики
+    настроены.
+    """
+    state = _state.get()
+    replicas = read_replicas()
+    if state is None or state.pinned or not replicas:
+        yield
+        return
+    state.replica = random.choice(replicas)
+    try:
+        yield
+    finally:
+        state.replica = None
+
+
+def replica_may_lag(changed_at):
+    """
+    Читает ли запрос с реплики, которая может ещё не содержать
+    изменений, сделанных в changed_at: реплики считаются догнавшими
+    основную базу через BLOG_PRIMARY_PIN_SECONDS после записи.
+    """
+    state = _state.get()
+    if state is None or not state.replica or state.wrote:
+        return False
+    if changed_at is None:
+        return True
+    age = time.time() - changed_at.timestamp()
+    return age < settings.BLOG_PRIMARY_PIN_SECONDS
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if (
+            state is not None
+            and state.replica
+            and not state.wrote
+            and model._meta.app_label in REPLICA_APP_LABELS
+        ):
+            return state.replica
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            # Дальше в этом запросе читаем то, что записали.
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *read_replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        """Реплики получают схему вместе с данными основной базы."""
+        if db in read_replicas():
+            return False
+        return None
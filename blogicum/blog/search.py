@@ -0,0 +1,217 @@
+"""
+Полнотекстовый поиск по постам на SQLite FTS5.
+
+Индекс blog_post_search хранит по строке на пост (rowid = id поста)
+с колонками title и text, blog_comment_search — по строке на
+комментарий (rowid = id комментария) с текстом и post_id. Новый
+комментарий добавляет одну строку и не трогает остальные комментарии
+поста. Сигналы поддерживают индексы при сохранении и удалении постов
+и комментариев, а команда rebuild_search_index пересобирает их после
+массовых загрузок, минующих сигналы.
+"""
+import re
+
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+SEARCH_TABLE = "blog_post_search"
+COMMENT_SEARCH_TABLE = "blog_comment_search"
+# Веса bm25 для колонок title и text.
+RANK_WEIGHTS = (10.0, 5.0)
+SNIPPET_TOKENS = 24
+# Служебные символы подсветки, заменяемые на <mark> после экранирования.
+MARK_START, MARK_END = "\x02", "\x03"
+
+
+def search_enabled():
+    return connection.vendor == "sqlite"
+
+
+def build_match_query(query):
+    """Слова запроса в кавычках с префиксным поиском: синтаксис FTS5
+    из пользовательского ввода не интерпретируется."""
+    terms = re.findall(r"\w+", query)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def index_post(post_id, title, text):
+    if not search_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {SEARCH_TABLE} SET title = %s, text = %s "
+            "WHERE rowid = %s",
+            [title, text, post_id],
+        )
+        if cursor.rowcount == 0:
+            cursor.execute(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, title, text) "
+                "VALUES (%s, %s, %s)",
+                [post_id, title, text],
+            )
+
+
+def unindex_post(post_id):
+    """Строки комментариев удаляют сигналы каскадного удаления."""
+    if not search_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [post_id]
+        )
+
+
+def index_comment(comment_id, post_id, text, created=False):
+    """Новый комментарий — одна вставка, остальные строки не меняются."""
+    if not search_enabled():
+        return
+    with connection.cursor() as cursor:
+        if not created:
+            cursor.execute(
+                f"UPDATE {COMMENT_SEARCH_TABLE} SET text = %s "
+                "WHERE rowid = %s",
+                [text, comment_id],
+            )
+        if created or cursor.rowcount == 0:
+            cursor.execute(
+                f"INSERT INTO {COMMENT_SEARCH_TABLE} (rowid, text, post_id) "
+                "VALUES (%s, %s, %s)",
+                [comment_id, text, post_id],
+            )
+
+
+def unindex_comment(comment_id):
+    if not search_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {COMMENT_SEARCH_TABLE} WHERE rowid = %s",
+            [comment_id],
+        )
+
+
+def rebuild_index(posts=None):
+    """
+    Пересобирает индекс постов queryset posts и их комментариев, а без
+    него — весь индекс, запросами INSERT ... SELECT. Возвращает число
+    проиндексированных постов.
+    """
+    condition, params = "", []
+    if posts is not None:
+        sql, params = posts.order_by().values("pk").query.sql_with_params()
+        condition = f"IN ({sql})"
+    with connection.cursor() as cursor:
+        if posts is None:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+            cursor.execute(f"DELETE FROM {COMMENT_SEARCH_TABLE}")
+        else:
+            cursor.execute(
+                f"DELETE FROM {SEARCH_TABLE} WHERE rowid {condition}", params
+            )
+            cursor.execute(
+                f"DELETE FROM {COMMENT_SEARCH_TABLE} WHERE rowid IN ("
+                f"SELECT id FROM blog_comment WHERE post_id {condition})",
+                params,
+            )
+        where = f"WHERE post_id {condition}" if condition else ""
+        cursor.execute(
+            f"INSERT INTO {COMMENT_SEARCH_TABLE} (rowid, text, post_id) "
+            f"SELECT id, text, post_id FROM blog_comment {where}",
+            params,
+        )
+        where = f"WHERE id {condition}" if condition else ""
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, title, text) "
+            f"SELECT id, title, text FROM blog_post {where}",
+            params,
+        )
+        return cursor.rowcount
+
+
+def search_posts(queryset, query):
+    """
+    Отбирает из queryset посты, совпавшие с запросом заголовком, текстом
+    или комментариями. Совпадения в самом посте идут по релевантности,
+    за ними — найденные только по комментариям, от новых к старым.
+    К каждому посту добавляется search_rank; фрагменты текста для
+    одной страницы подбирает add_snippets().
+    """
+    match = build_match_query(query)
+    if not match or not search_enabled():
+        return queryset.none()
+    weights = ", ".join(str(weight) for weight in RANK_WEIGHTS)
+    # Части UNION не могут иметь собственного ORDER BY.
+    queryset = queryset.order_by()
+    own_hits = queryset.extra(
+        select={"search_rank": f"bm25({SEARCH_TABLE}, {weights})"},
+        tables=[SEARCH_TABLE],
+        where=[
+            f'{SEARCH_TABLE}.rowid = "blog_post"."id"',
+            f"{SEARCH_TABLE} MATCH %s",
+        ],
+        params=[match],
+    )
+    comment_hits = queryset.extra(
+        select={"search_rank": "0"},
+        where=[
+            f'"blog_post"."id" IN (SELECT post_id FROM '
+            f"{COMMENT_SEARCH_TABLE} WHERE {COMMENT_SEARCH_TABLE} MATCH %s)",
+            f'"blog_post"."id" NOT IN (SELECT rowid FROM {SEARCH_TABLE} '
+            f"WHERE {SEARCH_TABLE} MATCH %s)",
+        ],
+        params=[match, match],
+    )
+    return own_hits.union(comment_hits, all=True).order_by(
+        "search_rank", "-pub_date"
+    )
+
+
+def _snippets(cursor, table, column, key, match, ids):
+    placeholders = ", ".join(["%s"] * len(ids))
+    cursor.execute(
+        f"SELECT {key}, snippet({table}, {column}, %s, %s, '…', "
+        f"{SNIPPET_TOKENS}) FROM {table} WHERE {table} MATCH %s "
+        f"AND {key} IN ({placeholders})",
+        [MARK_START, MARK_END, match, *ids],
+    )
+    return cursor
+
+
+def add_snippets(posts, query):
+    """
+    Добавляет постам страницы search_snippet с отмеченными совпадениями:
+    из заголовка и текста, а для найденных только по комментариям —
+    из первого совпавшего комментария. Фрагменты считаются только для
+    страницы, а не для всех найденных постов.
+    """
+    match = build_match_query(query)
+    missing = {post.pk: post for post in posts}
+    if not missing or not match or not search_enabled():
+        return
+    for post in missing.values():
+        post.search_snippet = ""
+    with connection.cursor() as cursor:
+        for post_id, snippet in _snippets(
+            cursor, SEARCH_TABLE, -1, "rowid", match, list(missing)
+        ):
+            missing.pop(post_id).search_snippet = snippet
+        if not missing:
+            return
+        for post_id, snippet in _snippets(
+            cursor, COMMENT_SEARCH_TABLE, 0, "post_id", match, list(missing)
+        ):
+            post = missing.pop(post_id, None)
+            if post is not None:
+                post.search_snippet = snippet
+            if not missing:
+                break
+
+
+def highlight(snippet):
+    """Экранирует фрагмент и превращает метки совпадений в <mark>."""
+    return mark_safe(
+        escape(snippet or "")
+        .replace(MARK_START, "<mark>")
+        .replace(MARK_END, "</mark>")
+    )
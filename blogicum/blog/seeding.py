@@ -0,0 +1,228 @@
+"""
+Синтетические данные блога для нагрузочных замеров.
+
+Пользователи, категории, локации, посты и комментарии генерируются
+с перекосами живого блога: немногие «горячие» авторы пишут большую
+часть постов, комментарии сосредоточены на немногих постах (длинный
+хвост), часть постов отложена в будущее или не опубликована, часть
+категорий и локаций снята с публикации. Тексты выбираются из пулов,
+заранее созданных Faker, и всё случайное выводится из одного seed,
+поэтому запуск с тем же seed на пустой базе даёт те же данные. Строки
+вставляются пакетами bulk_create с явными pk, производные поля
+пересчитываются в конце, как после import_blog.
+"""
+import random
+import time
+from array import array
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from faker import Faker
+
+from .models import Category, Comment, Location, Post, User
+from .transfer import (
+    ModelStats,
+    preserve_timestamps,
+    refresh_derived,
+    reset_sequences,
+)
+
+SEED = 42
+LOCALE = "ru_RU"
+POOL_SIZE = 1000
+# Вес объекта ранга r пропорционален 1 / r ** s (закон Ципфа).
+AUTHOR_SKEW = 1.1
+COMMENT_SKEW = 1.2
+HISTORY_DAYS = 3 * 365
+FUTURE_DAYS = 30
+FUTURE_POST_SHARE = 0.05
+DRAFT_POST_SHARE = 0.03
+NO_LOCATION_SHARE = 0.3
+NO_CATEGORY_SHARE = 0.02
+UNPUBLISHED_CATEGORY_SHARE = 0.1
+UNPUBLISHED_LOCATION_SHARE = 0.1
+# Пароль всех созданных пользователей, хешируется один раз.
+SEED_PASSWORD = "seed-password"
+
+
+class BlogSeeder:
+    def __init__(
+        self,
+        users=1000,
+        categories=20,
+        locations=100,
+        posts=10000,
+        comments=50000,
+        seed=SEED,
+        batch_size=5000,
+    ):
+        if (posts or comments) and not users or comments and not posts:
+            raise ValueError(
+                "Для постов нужны пользователи, для комментариев — посты"
+            )
+        self.sizes = {
+            User: users,
+            Category: categories,
+            Location: locations,
+            Post: posts,
+            Comment: comments,
+        }
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.fake = Faker(LOCALE)
+        self.fake.seed_instance(seed)
+        self.now = timezone.now()
+        self.stats = {
+            model._meta.label_lower: ModelStats() for model in self.sizes
+        }
+
+    def run(self):
+        self._fill_pools()
+        self.password = make_password(SEED_PASSWORD)
+        self.users = self._insert(User, self._user)
+        self.categories = self._insert(Category, self._category)
+        self.locations = self._insert(Location, self._location)
+        self.author_weights = self._skewed(self.users, AUTHOR_SKEW)
+        # Даты публикации нужны комментариям: массив, а не объекты.
+        self.post_dates = array("d")
+        self.posts = self._insert(Post, self._post)
+        self.post_weights = self._skewed(self.posts, COMMENT_SKEW)
+        self._insert(Comment, self._comment)
+        reset_sequences(list(self.sizes))
+        if self.posts:
+            refresh_derived(Post.objects.filter(pk__gte=self.posts[0]))
+        return self.stats
+
+    def _fill_pools(self):
+        fake = self.fake
+        self.pools = {
+            "user_name": [fake.user_name() for _ in range(POOL_SIZE)],
+            "first_name": [fake.first_name() for _ in range(POOL_SIZE)],
+            "last_name": [fake.last_name() for _ in range(POOL_SIZE)],
+            "word": [fake.word() for _ in range(POOL_SIZE)],
+            "city": [fake.city() for _ in range(POOL_SIZE)],
+            "sentence": [
+                fake.sentence(nb_words=6)[:-1] for _ in range(POOL_SIZE)
+            ],
+            "paragraph": [
+                fake.paragraph(nb_sentences=5) for _ in range(POOL_SIZE)
+            ],
+        }
+
+    def _pick(self, pool):
+        return self.rng.choice(self.pools[pool])
+
+    def _skewed(self, ids, skew):
+        """Накопленные веса Ципфа для ids в случайном порядке рангов."""
+        ranked = list(ids)
+        self.rng.shuffle(ranked)
+        weights = accumulate(
+            1 / rank ** skew for rank in range(1, len(ranked) + 1)
+        )
+        return ranked, list(weights)
+
+    def _choose(self, skewed):
+        ranked, weights = skewed
+        return self.rng.choices(ranked, cum_weights=weights)[0]
+
+    def _past(self, days=HISTORY_DAYS):
+        seconds = self.rng.uniform(0, days * 86400)
+        return self.now - timedelta(seconds=seconds)
+
+    def _insert(self, model, build):
+        """Вставляет sizes[model] строк с pk после текущего максимума."""
+        last = model._default_manager.aggregate(last=Max("pk"))["last"]
+        first = (last or 0) + 1
+        ids = range(first, first + self.sizes[model])
+        stats = self.stats[model._meta.label_lower]
+        started = time.monotonic()
+        for start in range(ids.start, ids.stop, self.batch_size):
+            stop = min(start + self.batch_size, ids.stop)
+            objects = [build(pk) for pk in range(start, stop)]
+            with transaction.atomic(), preserve_timestamps(model):
+                model._default_manager.bulk_create(objects)
+            stats.created += len(objects)
+        stats.seconds += time.monotonic() - started
+        return ids
+
+    def _user(self, pk):
+        username = f"{self._pick('user_name')}{pk}"
+        return User(
+            pk=pk,
+            username=username,
+            first_name=self._pick("first_name"),
+            last_name=self._pick("last_name"),
+            email=f"{username}@example.com",
+            password=self.password,
+            date_joined=self._past(),
+        )
+
+    def _category(self, pk):
+        return Category(
+            pk=pk,
+            title=f"{self._pick('word').capitalize()} {pk}",
+            description=self._pick("sentence"),
+            slug=f"category-{pk}",
+            is_published=self.rng.random() >= UNPUBLISHED_CATEGORY_SHARE,
+            created_at=self._past(),
+        )
+
+    def _location(self, pk):
+        return Location(
+            pk=pk,
+            name=self._pick("city"),
+            is_published=self.rng.random() >= UNPUBLISHED_LOCATION_SHARE,
+            created_at=self._past(),
+        )
+
+    def _post(self, pk):
+        rng = self.rng
+        if rng.random() < FUTURE_POST_SHARE:
+            pub_date = self.now + timedelta(
+                seconds=rng.uniform(60, FUTURE_DAYS * 86400)
+            )
+        else:
+            pub_date = self._past()
+        self.post_dates.append(pub_date.timestamp())
+        category = location = None
+        if self.categories and rng.random() >= NO_CATEGORY_SHARE:
+            category = rng.choice(self.categories)
+        if self.locations and rng.random() >= NO_LOCATION_SHARE:
+            location = rng.choice(self.locations)
+        created_at = min(pub_date, self.now)
+        return Post(
+            pk=pk,
+            title=self._pick("sentence"),
+            text="\n\n".join(
+                self._pick("paragraph") for _ in range(rng.randint(1, 4))
+            ),
+            pub_date=pub_date,
+            author_id=self._choose(self.author_weights),
+            category_id=category,
+            location_id=location,
+            is_published=rng.random() >= DRAFT_POST_SHARE,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+
+    def _comment(self, pk):
+        post_id = self._choose(self.post_weights)
+        published = self.post_dates[post_id - self.posts.start]
+        # Комментарии приходят в основном в первые дни после публикации.
+        created = min(
+            published + self.rng.expovariate(1 / (3 * 86400)),
+            self.now.timestamp(),
+        )
+        return Comment(
+            pk=pk,
+            post_id=post_id,
+            author_id=self.rng.choice(self.users),
+            text=self._pick("sentence"),
+            created_at=datetime.fromtimestamp(
+                max(created, published), tz=timezone.utc
+            ),
+        )
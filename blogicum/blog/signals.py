@@ -0,0 +1,276 @@
+"""
+Обработчики сигналов блога.
+Поддерживают денормализованные данные в актуальном состоянии
+при любом способе изменения: из представлений, админки и каскадов.
+"""
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import Signal, receiver
+
+from . import search
+from .cache import (
+    INDEX_SCOPE,
+    REFDATA_SCOPE,
+    invalidate,
+    post_scopes,
+    scopes_for_posts,
+)
+from .models import AuthorStats, Category, Comment, Location, Post, User
+
+# Массовая смена is_published одним UPDATE, минуя save() и post_save.
+# Аргументы: sender — модель, pks — id изменённых записей.
+publication_changed = Signal()
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    """Новый комментарий увеличивает счётчик поста одним UPDATE."""
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F("comment_count") + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    """Срабатывает и при каскадном удалении (вместе с постом или автором)."""
+    Post.objects.filter(
+        pk=instance.post_id, comment_count__gt=0
+    ).update(comment_count=F("comment_count") - 1)
+
+
+@receiver(post_save, sender=Post)
+def refresh_loaded_post_visibility(sender, instance, raw=False, **kwargs):
+    """loaddata минует Post.save(), поэтому is_visible считаем отдельно."""
+    if raw:
+        Post.objects.filter(pk=instance.pk).refresh_visibility()
+
+
+@receiver(post_save, sender=Category)
+def refresh_category_posts_visibility(sender, instance, **kwargs):
+    """Публикация или снятие категории пересчитывает её посты одним UPDATE."""
+    posts = Post.objects.filter(category=instance)
+    posts.refresh_visibility()
+    refresh_author_stats(posts)
+
+
+@receiver(pre_delete, sender=Category)
+def hide_category_posts(sender, instance, **kwargs):
+    """SET_NULL обновит посты без сигналов, поэтому скрываем их заранее."""
+    posts = Post.objects.filter(category=instance)
+    posts.update(is_visible=False)
+    refresh_author_stats(posts)
+
+
+def refresh_author_stats(posts):
+    """Пересчитывает статистику авторов постов после массовых UPDATE."""
+    AuthorStats.objects.filter(
+        author_id__in=posts.values("author_id")
+    ).refresh()
+
+
+@receiver(publication_changed)
+def invalidate_published_pages(sender, pks, **kwargs):
+    """
+    Одна инвалидация на всю пачку записей вместо сигнала на строку;
+    pks — подзапрос первичных ключей отмеченных записей.
+    """
+    if sender is Post:
+        posts = Post.objects.filter(pk__in=pks)
+        refresh_author_stats(posts)
+        invalidate(scopes_for_posts(posts))
+        return
+    if sender is Category:
+        posts = Post.objects.filter(category_id__in=pks)
+        posts.refresh_visibility()
+        refresh_author_stats(posts)
+        own_scopes = {
+            f"category:{slug}"
+            for slug in Category.objects.filter(pk__in=pks).values_list(
+                "slug", flat=True
+            )
+        }
+    else:
+        posts = Post.objects.filter(location_id__in=pks)
+        own_scopes = set()
+    invalidate(scopes_for_posts(posts) | own_scopes | {REFDATA_SCOPE})
+
+
+@receiver(pre_save, sender=Post)
+def remember_author_stats_fields(sender, instance, raw=False, **kwargs):
+    instance._stats_fields = None
+    if instance.pk and not raw:
+        instance._stats_fields = (
+            Post.objects.filter(pk=instance.pk)
+            .values_list("author_id", "is_visible", "pub_date")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Post)
+def update_author_stats(sender, instance, created, raw=False, **kwargs):
+    """
+    Новый видимый пост увеличивает счётчик автора; смена автора,
+    видимости или даты пересчитывает статистику старого и нового.
+    """
+    if created and not raw:
+        if instance.is_visible:
+            AuthorStats.objects.add_post(instance)
+        return
+    previous = getattr(instance, "_stats_fields", None)
+    current = (instance.author_id, instance.is_visible, instance.pub_date)
+    if previous != current:
+        authors = {instance.author_id, previous and previous[0]} - {None}
+        AuthorStats.objects.filter(author_id__in=authors).refresh()
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_author_stats(sender, instance, **kwargs):
+    """Строки не создаются: автор может удаляться каскадно."""
+    if instance.is_visible:
+        AuthorStats.objects.filter(author_id=instance.author_id).refresh()
+
+
+@receiver(post_save, sender=Comment)
+def add_comment_to_author_stats(sender, instance, created, raw=False, **kw):
+    if created and not raw:
+        AuthorStats.objects.add_comment(instance)
+    elif raw:
+        AuthorStats.objects.filter(author_id=instance.author_id).refresh()
+
+
+@receiver(post_delete, sender=Comment)
+def remove_comment_from_author_stats(sender, instance, **kwargs):
+    AuthorStats.objects.remove_comment(instance)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_scopes(sender, instance, raw=False, **kwargs):
+    """Старые категория и автор поста тоже должны потерять кэш."""
+    instance._cached_scopes = set()
+    if instance.pk and not raw:
+        instance._cached_scopes = scopes_for_posts(
+            Post.objects.filter(pk=instance.pk)
+        )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    scopes = getattr(instance, "_cached_scopes", set())
+    try:
+        category = instance.category if instance.category_id else None
+        scopes |= post_scopes(
+            instance.pk, category and category.slug, instance.author.username
+        )
+    except (Category.DoesNotExist, User.DoesNotExist):
+        # Каскадное удаление: связанная запись уже удалена.
+        scopes |= {INDEX_SCOPE, f"post:{instance.pk}"}
+    invalidate(scopes)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, **kwargs):
+    """
+    Комментарий меняет страницу поста, счётчики в лентах и статистику
+    в профиле своего автора.
+    """
+    scopes = scopes_for_posts(Post.objects.filter(pk=instance.post_id)) | {
+        f"post:{instance.post_id}"
+    }
+    try:
+        scopes.add(f"profile:{instance.author.username}")
+    except User.DoesNotExist:
+        # Каскадное удаление автора: профиля больше нет.
+        pass
+    invalidate(scopes)
+
+
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=Location)
+def remember_reference_scopes(sender, instance, raw=False, **kwargs):
+    """Запоминает страницы до изменения: slug или username могут смениться."""
+    instance._cached_scopes = set()
+    if instance.pk and not raw:
+        previous = sender.objects.filter(pk=instance.pk).first()
+        if previous is not None:
+            instance._cached_scopes = _reference_scopes(previous)
+
+
+def _reference_scopes(instance):
+    if isinstance(instance, Category):
+        posts = Post.objects.filter(category=instance)
+        own_scope = f"category:{instance.slug}"
+    elif isinstance(instance, Location):
+        posts = Post.objects.filter(location=instance)
+        own_scope = INDEX_SCOPE
+    else:
+        posts = Post.objects.filter(author=instance)
+        own_scope = f"profile:{instance.username}"
+    return scopes_for_posts(posts) | {own_scope}
+
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, raw=False, update_fields=None, **kw):
+    """Сохранение last_login при входе не должно сбрасывать кэш."""
+    instance._previous_username = None
+    if (
+        instance.pk
+        and not raw
+        and (update_fields is None or "username" in update_fields)
+    ):
+        instance._previous_username = (
+            User.objects.filter(pk=instance.pk)
+            .values_list("username", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=User)
+def invalidate_renamed_author_pages(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_username", None)
+    if not created and previous and previous != instance.username:
+        invalidate(_reference_scopes(instance) | {f"profile:{previous}"})
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Location)
+def invalidate_reference_pages(sender, instance, **kwargs):
+    """Название категории или локации выводится в карточках постов."""
+    invalidate(
+        getattr(instance, "_cached_scopes", set())
+        | _reference_scopes(instance)
+        | {REFDATA_SCOPE}
+    )
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, **kwargs):
+    """Индекс поиска ведётся сигналами, а не триггерами: SQLite удаляет
+    триггеры при пересоздании таблицы в миграциях."""
+    search.index_post(instance.pk, instance.title, instance.text)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    search.unindex_post(instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+def index_comment(sender, instance, created, **kwargs):
+    search.index_comment(
+        instance.pk, instance.post_id, instance.text, created
+    )
+
+
+@receiver(post_delete, sender=Comment)
+def unindex_comment(sender, instance, **kwargs):
+    search.unindex_comment(instance.pk)
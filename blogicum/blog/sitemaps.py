@@ -0,0 +1,264 @@
+"""
+Файлы sitemap для постов, категорий и профилей.
+
+Записи делятся на шарды по диапазонам id (SHARD_SIZE адресов на файл),
+файлы шардов перечислены в индексе sitemap.xml и раздаются как
+статика из BLOG_SITEMAP_ROOT. Для каждого шарда одним агрегирующим
+запросом считается подпись — число записей, сумма id и время последнего
+изменения; перезаписываются только шарды, чья подпись изменилась с
+прошлого запуска. Подписи хранятся рядом с файлами в sitemap-state.json.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Count, F, Max, Sum
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Category, Post
+
+SHARD_SIZE = 50000
+CHUNK_SIZE = 2000
+INDEX_NAME = "sitemap.xml"
+STATE_NAME = "sitemap-state.json"
+XMLNS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+def sitemap_root():
+    return Path(settings.BLOG_SITEMAP_ROOT)
+
+
+def _shard_of(field):
+    return F(field) / SHARD_SIZE
+
+
+def _shard_range(field, shard):
+    return {
+        f"{field}__gte": shard * SHARD_SIZE,
+        f"{field}__lt": (shard + 1) * SHARD_SIZE,
+    }
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+class PostSection:
+    name = "posts"
+
+    def signatures(self):
+        rows = (
+            Post.post_list.order_by()
+            .annotate(shard=_shard_of("pk"))
+            .values("shard")
+            .annotate(
+                count=Count("pk"), ids=Sum("pk"), latest=Max("updated_at")
+            )
+        )
+        return {
+            row["shard"]: (
+                [row["count"], row["ids"], _isoformat(row["latest"])],
+                row["latest"],
+            )
+            for row in rows
+        }
+
+    def entries(self, shard):
+        rows = (
+            Post.post_list.filter(**_shard_range("pk", shard))
+            .order_by("pk")
+            .values_list("pk", "updated_at")
+            .iterator(chunk_size=CHUNK_SIZE)
+        )
+        for pk, updated_at in rows:
+            yield reverse("blog:post_detail", kwargs={"pk": pk}), updated_at
+
+
+class ProfileSection:
+    """
+    Профили авторов, у которых есть видимые посты. Смена username
+    подписи не меняет: после переименований запускайте с --force.
+    """
+    name = "profiles"
+
+    def signatures(self):
+        rows = (
+            Post.post_list.order_by()
+            .annotate(shard=_shard_of("author_id"))
+            .values("shard")
+            .annotate(
+                count=Count("author_id", distinct=True),
+                ids=Sum("author_id", distinct=True),
+                latest=Max("updated_at"),
+            )
+        )
+        return {
+            row["shard"]: (
+                [row["count"], row["ids"], _isoformat(row["latest"])],
+                row["latest"],
+            )
+            for row in rows
+        }
+
+    def entries(self, shard):
+        rows = (
+            Post.post_list.filter(**_shard_range("author_id", shard))
+            .order_by()
+            .values("author_id", "author__username")
+            .annotate(latest=Max("updated_at"))
+            .order_by("author_id")
+            .iterator(chunk_size=CHUNK_SIZE)
+        )
+        for row in rows:
+            yield (
+                reverse(
+                    "blog:profile",
+                    kwargs={"username": row["author__username"]},
+                ),
+                row["latest"],
+            )
+
+
+class CategorySection:
+    """
+    Категорий немного, поэтому подпись считается по всем slug:
+    так замечается и переименование, которого не видно по датам.
+    """
+    name = "categories"
+
+    def signatures(self):
+        digest = hashlib.md5()
+        latest = None
+        rows = Category.objects.filter(is_published=True).order_by("pk")
+        for pk, slug, created_at in rows.values_list(
+            "pk", "slug", "created_at"
+        ).iterator(chunk_size=CHUNK_SIZE):
+            digest.update(f"{pk}:{slug};".encode())
+            latest = max(latest, created_at) if latest else created_at
+        if latest is None:
+            return {}
+        return {0: ([digest.hexdigest()], latest)}
+
+    def entries(self, shard):
+        rows = (
+            Category.objects.filter(is_published=True)
+            .order_by("pk")
+            .values_list("slug", "created_at")
+            .iterator(chunk_size=CHUNK_SIZE)
+        )
+        for slug, created_at in rows:
+            yield (
+                reverse(
+                    "blog:category_posts", kwargs={"category_slug": slug}
+                ),
+                created_at,
+            )
+
+
+SECTIONS = (PostSection(), CategorySection(), ProfileSection())
+
+
+def _write_atomically(path, lines):
+    """Пишет построчно во временный файл и подменяет им старый."""
+    temporary = path.with_name(f".{path.name}.tmp")
+    with open(temporary, "w", encoding="utf-8") as file:
+        for line in lines:
+            file.write(line)
+    os.replace(temporary, path)
+
+
+def _urlset(base_url, entries):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<urlset xmlns="{XMLNS}">\n'
+    for path, lastmod in entries:
+        yield f"<url><loc>{escape(base_url + path)}</loc>"
+        if lastmod:
+            yield f"<lastmod>{lastmod.date().isoformat()}</lastmod>"
+        yield "</url>\n"
+    yield "</urlset>\n"
+
+
+def _sitemap_index(base_url, shards):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<sitemapindex xmlns="{XMLNS}">\n'
+    for filename, lastmod in sorted(shards.items()):
+        location = f"{base_url}{settings.BLOG_SITEMAP_URL}{filename}"
+        yield f"<sitemap><loc>{escape(location)}</loc>"
+        if lastmod:
+            yield f"<lastmod>{lastmod}</lastmod>"
+        yield "</sitemap>\n"
+    yield "</sitemapindex>\n"
+
+
+def build_sitemaps(base_url, root=None, force=False):
+    """
+    Обновляет изменившиеся шарды и индекс. Возвращает словарь
+    со списками имён записанных, удалённых и нетронутых файлов.
+    """
+    base_url = base_url.rstrip("/")
+    root = Path(root or sitemap_root())
+    root.mkdir(parents=True, exist_ok=True)
+    state_path = root / STATE_NAME
+    state = {}
+    if state_path.exists():
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+    existing = state.get("shards", {})
+    # При смене адреса сайта перезаписываются все файлы.
+    previous = {}
+    if not force and state.get("base_url") == base_url:
+        previous = existing
+
+    shards = {}
+    report = {"written": [], "removed": [], "unchanged": []}
+    for section in SECTIONS:
+        for shard, (signature, latest) in sorted(
+            section.signatures().items()
+        ):
+            filename = f"sitemap-{section.name}-{shard}.xml"
+            shards[filename] = {
+                "signature": signature,
+                "lastmod": latest and latest.date().isoformat(),
+            }
+            old = previous.get(filename)
+            if (
+                old
+                and old["signature"] == signature
+                and (root / filename).exists()
+            ):
+                report["unchanged"].append(filename)
+                continue
+            _write_atomically(
+                root / filename, _urlset(base_url, section.entries(shard))
+            )
+            report["written"].append(filename)
+
+    for filename in set(existing) - set(shards):
+        (root / filename).unlink(missing_ok=True)
+        report["removed"].append(filename)
+
+    if report["written"] or report["removed"] or not (
+        root / INDEX_NAME
+    ).exists():
+        _write_atomically(
+            root / INDEX_NAME,
+            _sitemap_index(
+                base_url,
+                {name: shard["lastmod"] for name, shard in shards.items()},
+            ),
+        )
+    state_path.write_text(
+        json.dumps(
+            {
+                "base_url": base_url,
+                "generated_at": timezone.now().isoformat(),
+                "shards": shards,
+            },
+            indent=1,
+        ),
+        encoding="utf-8",
+    )
+    return report
@@ -0,0 +1,79 @@
+from django import template
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from blog import search
+from blog.cache import (
+    REFDATA_SCOPE,
+    get_versions,
+    post_card_cache_key,
+    post_card_stats,
+    post_card_timeout,
+)
+from blog.images import IMAGE_SIZES, image_sources
+from blog.profiling import record_cache_lookup
+
+register = template.Library()
+
+# Параметры пагинации взаимоисключающие: новая ссылка сбрасывает прочие.
+PAGINATION_PARAMS = ("page", "after", "before")
+
+
+@register.simple_tag(takes_context=True)
+def post_card(context, post):
+    """
+    Карточка поста из общего кэша фрагментов: одна и та же запись
+    используется главной, категорией и профилем.
+    """
+    render_context = context.render_context
+    if REFDATA_SCOPE not in render_context:
+        # Версию справочников читаем один раз на страницу.
+        render_context[REFDATA_SCOPE] = get_versions([REFDATA_SCOPE])[0]
+    key = post_card_cache_key(post, render_context[REFDATA_SCOPE])
+
+    html = cache.get(key)
+    record_cache_lookup(html is not None)
+    if html is None:
+        post_card_stats.misses += 1
+        html = render_to_string("includes/post_card.html", {"post": post})
+        cache.set(key, html, post_card_timeout())
+    else:
+        post_card_stats.hits += 1
+    return mark_safe(html)
+
+
+@register.inclusion_tag("includes/responsive_image.html")
+def responsive_image(image, css_class="", lazy=True):
+    """<picture> с вариантами WebP/JPEG; без них — исходный <img>."""
+    sources = image_sources(
+        image.name, getattr(image.instance, "variants_width", None)
+    )
+    return {
+        "image": image,
+        "css_class": css_class,
+        "lazy": lazy,
+        "sizes": IMAGE_SIZES,
+        "sources": sources[:-1] if sources else None,
+        "fallback": sources[-1] if sources else None,
+    }
+
+
+@register.filter
+def highlight(snippet):
+    """Фрагмент результата поиска с совпадениями в <mark>."""
+    return search.highlight(snippet)
+
+
+@register.simple_tag(takes_context=True)
+def page_query(context, **params):
+    """
+    Строка запроса для ссылки пагинации: сохраняет остальные
+    GET-параметры (например, ?q= поиска) и подставляет params.
+    """
+    query = context["request"].GET.copy()
+    for name in PAGINATION_PARAMS:
+        query.pop(name, None)
+    for name, value in params.items():
+        query[name] = str(value)
+    return query.urlencode()
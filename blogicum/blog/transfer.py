@@ -0,0 +1,319 @@
+"""
+Потоковый экспорт и импорт данных блога в формате фикстур Django.
+
+Записи вида {"model", "pk", "fields"} читаются и пишутся по одной:
+JSON-массив, совместимый с db.json и loaddata, или NDJSON (по записи
+на строку). Импорт сохраняет записи пакетами bulk_create внутри
+транзакций и выделяет новые первичные ключи, поэтому ссылки между
+пользователями, категориями, локациями, постами и комментариями
+перенумеровываются. Пользователи сопоставляются по username, категории
+по slug. Производные поля (счётчики, видимость, статистика авторов,
+поисковый индекс) пересчитываются после загрузки.
+"""
+import json
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from django.core import serializers
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import search
+from .cache import REFDATA_SCOPE, invalidate, scopes_for_posts
+from .models import AuthorStats, Category, Comment, Location, Post, User
+
+# Модели в порядке зависимостей: каждый уровень ссылается на предыдущие.
+LEVELS = ((User, Category, Location), (Post,), (Comment,))
+NATURAL_KEYS = {User: "username", Category: "slug"}
+# Производные поля не переносятся, а пересчитываются после импорта.
+DERIVED_FIELDS = {Post: {"comment_count", "is_visible"}}
+READ_CHUNK = 1 << 16
+
+
+def _label(model):
+    return model._meta.label_lower
+
+
+def _exported_fields(model):
+    return [
+        field.name
+        for field in model._meta.concrete_fields
+        if not field.primary_key
+        and field.name not in DERIVED_FIELDS.get(model, ())
+    ]
+
+
+def export_records(batch_size):
+    """Записи всех моделей блога в порядке зависимостей."""
+    for level in LEVELS:
+        for model in level:
+            fields = _exported_fields(model)
+            objects = (
+                model._default_manager.order_by("pk")
+                .only(*fields)
+                .iterator(chunk_size=batch_size)
+            )
+            while True:
+                batch = list(islice(objects, batch_size))
+                if not batch:
+                    break
+                yield from serializers.serialize(
+                    "python", batch, fields=fields
+                )
+
+
+def dump_record(record):
+    return json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+class _ReadBuffer:
+    """Окно файла, которое дочитывается, пока запись не разберётся."""
+    separators = " \t\r\n,"
+
+    def __init__(self, file):
+        self.file = file
+        self.text = ""
+        self.position = 0
+
+    def read_more(self):
+        chunk = self.file.read(READ_CHUNK)
+        self.text, self.position = self.text[self.position:] + chunk, 0
+        return bool(chunk)
+
+    def peek(self):
+        """Первый значащий символ или None в конце файла."""
+        while True:
+            while (
+                self.position < len(self.text)
+                and self.text[self.position] in self.separators
+            ):
+                self.position += 1
+            if self.position < len(self.text):
+                return self.text[self.position]
+            if not self.read_more():
+                return None
+
+
+def iter_records(file):
+    """
+    Читает записи по одной из JSON-массива или NDJSON, держа в памяти
+    только текущий фрагмент файла.
+    """
+    decoder = json.JSONDecoder()
+    buffer = _ReadBuffer(file)
+    in_array = buffer.peek() == "["
+    buffer.position += in_array
+    while True:
+        char = buffer.peek()
+        if char is None or (in_array and char == "]"):
+            return
+        try:
+            record, buffer.position = decoder.raw_decode(
+                buffer.text, buffer.position
+            )
+        except json.JSONDecodeError:
+            if not buffer.read_more():
+                raise ValueError(
+                    f"Некорректный JSON около символа {buffer.position}"
+                )
+            continue
+        yield record
+
+
+def _timestamp_fields(model):
+    return [
+        field
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False)
+        or getattr(field, "auto_now_add", False)
+    ]
+
+
+@contextmanager
+def preserve_timestamps(model):
+    """bulk_create заполняет auto_now-поля текущим временем."""
+    fields = _timestamp_fields(model)
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class ModelStats:
+    def __init__(self):
+        self.created = 0
+        self.matched = 0
+        self.skipped = 0
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        rows = self.created + self.matched
+        return rows / self.seconds if self.seconds else 0.0
+
+
+class BlogImporter:
+    """
+    Импорт из файла, который читается по разу на уровень LEVELS:
+    в db.json посты идут раньше своих авторов.
+    """
+
+    def __init__(self, open_file, batch_size=1000):
+        self.open_file = open_file
+        self.batch_size = batch_size
+        self.pk_maps = {
+            _label(model): {} for level in LEVELS for model in level
+        }
+        self.next_pk = {}
+        self.first_pk = {}
+        self.stats = {label: ModelStats() for label in self.pk_maps}
+        self.ignored = 0
+
+    def run(self):
+        for level in LEVELS:
+            models = {_label(model): model for model in level}
+            batches = {label: [] for label in models}
+            with self.open_file() as file:
+                for record in iter_records(file):
+                    label = record.get("model")
+                    if label not in models:
+                        if level is LEVELS[0] and label not in self.pk_maps:
+                            self.ignored += 1
+                        continue
+                    batch = batches[label]
+                    batch.append(record)
+                    if len(batch) >= self.batch_size:
+                        self._save(models[label], batch)
+                        batch.clear()
+            for label, batch in batches.items():
+                if batch:
+                    self._save(models[label], batch)
+        self._finish()
+        return self.stats
+
+    def _allocate_pk(self, model):
+        label = _label(model)
+        if label not in self.next_pk:
+            last = model._default_manager.aggregate(last=Max("pk"))["last"]
+            self.next_pk[label] = self.first_pk[label] = (last or 0) + 1
+        pk = self.next_pk[label]
+        self.next_pk[label] += 1
+        return pk
+
+    def _build(self, model, record):
+        values = {}
+        derived = DERIVED_FIELDS.get(model, ())
+        for name, value in record["fields"].items():
+            field = model._meta.get_field(name)
+            if field.many_to_many or name in derived:
+                continue
+            if field.is_relation:
+                if value is not None:
+                    value = self.pk_maps[
+                        _label(field.related_model)
+                    ].get(value)
+                    if value is None and not field.null:
+                        return None
+                values[field.attname] = value
+            else:
+                values[field.attname] = field.to_python(value)
+        for field in _timestamp_fields(model):
+            # В старых выгрузках, как в db.json, нет поля updated_at.
+            values.setdefault(field.attname, timezone.now())
+        return model(**values)
+
+    def _save(self, model, records):
+        label = _label(model)
+        stats = self.stats[label]
+        pk_map = self.pk_maps[label]
+        started = time.monotonic()
+        with transaction.atomic():
+            key = NATURAL_KEYS.get(model)
+            existing = {}
+            if key:
+                existing = dict(
+                    model._default_manager.filter(
+                        **{f"{key}__in": [
+                            record["fields"][key] for record in records
+                        ]}
+                    ).values_list(key, "pk")
+                )
+            objects = []
+            for record in records:
+                if key and record["fields"][key] in existing:
+                    pk_map[record["pk"]] = existing[record["fields"][key]]
+                    stats.matched += 1
+                    continue
+                obj = self._build(model, record)
+                if obj is None:
+                    stats.skipped += 1
+                    continue
+                obj.pk = self._allocate_pk(model)
+                pk_map[record["pk"]] = obj.pk
+                objects.append(obj)
+            with preserve_timestamps(model):
+                model._default_manager.bulk_create(objects)
+        stats.created += len(objects)
+        stats.seconds += time.monotonic() - started
+
+    def _finish(self):
+        """Пересчитывает то, что при bulk_create не делают save() и сигналы."""
+        reset_sequences([model for level in LEVELS for model in level])
+        first_post = self.first_pk.get(_label(Post))
+        first_comment = self.first_pk.get(_label(Comment))
+        touched = Post.objects.none()
+        if first_post is not None:
+            touched |= Post.objects.filter(pk__gte=first_post)
+        if first_comment is not None:
+            touched |= Post.objects.filter(
+                pk__in=Comment.objects.filter(
+                    pk__gte=first_comment
+                ).values("post_id")
+            )
+        refresh_derived(touched)
+
+
+def reset_sequences(models):
+    """После вставки с явными pk последовательности нужно сдвинуть."""
+    if connection.vendor == "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), models):
+            cursor.execute(sql)
+
+
+def refresh_derived(posts):
+    """
+    Пересчитывает видимость и счётчики комментариев постов, статистику
+    их авторов и комментаторов и их поисковый индекс после bulk_create
+    и сбрасывает кэш. Остальные посты и авторы не затрагиваются.
+    """
+    counts = (
+        Comment.objects.filter(post=OuterRef("pk"))
+        .order_by()
+        .values("post")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    with transaction.atomic():
+        posts.refresh_visibility()
+        posts.update(comment_count=Coalesce(Subquery(counts), 0))
+        for authors in (
+            posts.order_by().values("author_id"),
+            Comment.objects.filter(post__in=posts.order_by().values("pk"))
+            .order_by()
+            .values("author_id"),
+        ):
+            AuthorStats.objects.rebuild(authors)
+        if search.search_enabled() and posts.exists():
+            search.rebuild_index(posts)
+    invalidate(scopes_for_posts(posts) | {REFDATA_SCOPE})
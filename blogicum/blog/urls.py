@@ -8,15 +8,39 @@ from typing import List
 
 from django.urls import URLPattern, path
 
-from . import views
+from . import feeds, views
 
 app_name: str = "blog"
 
 urlpatterns: List[URLPattern] = [
     path("", views.BlogIndexListView.as_view(), name="index"),
     path(
-        "posts/<int:post_id>/", views.PostDetailView.as_view(), name="post_detail"
+        "posts/<int:pk>/", views.PostDetailView.as_view(), name="post_detail"
     ),
+    path(
+        "posts/<int:pk>/comments/",
+        views.PostCommentsListView.as_view(),
+        name="post_comments",
+    ),
+    path(
+        "feed/<str:feed_type>/", feeds.SiteFeedView.as_view(), name="feed"
+    ),
+    path(
+        "category/<slug:category_slug>/feed/<str:feed_type>/",
+        feeds.CategoryFeedView.as_view(),
+        name="category_feed",
+    ),
+    path(
+        "profile/<str:username>/feed/<str:feed_type>/",
+        feeds.AuthorFeedView.as_view(),
+        name="profile_feed",
+    ),
+    path(
+        "autocomplete/<str:source>/",
+        views.AutocompleteView.as_view(),
+        name="autocomplete",
+    ),
+    path("search/", views.PostSearchView.as_view(), name="search"),
     path(
         "category/<slug:category_slug>/",
         views.BlogCategoryListView.as_view(),
@@ -4,9 +4,12 @@
 # 3. После автотестов: миксины, проверки в dispatch/delete
 
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse, reverse_lazy
-from django.db.models import Count
+from django.views import View
 from django.views.generic import (
     CreateView,
     DeleteView,
@@ -15,11 +18,24 @@ from django.views.generic import (
     UpdateView,
 )
 
+from .autocomplete import SOURCES, STAFF_SOURCES, autocomplete
 from .forms import CreateCommentForm, CreatePostForm
-from .models import Category, Comment, Post, User
-from .mixins import CommentEditMixin, PostsEditMixin, PostsQuerySetMixin
+from .models import AuthorStats, Comment, Post, User
+from .mixins import (
+    AnonymousPageCacheMixin,
+    CommentEditMixin,
+    ConditionalGetMixin,
+    CursorPaginationMixin,
+    PostsEditMixin,
+    PostsQuerySetMixin,
+    ReplicaReadMixin,
+)
+from .paginators import CursorPaginator
+from .refdata import reference_data
+from .search import add_snippets, search_posts
 
 PAGINATED_BY = 10
+COMMENTS_PAGINATED_BY = 10
 
 
 class PostDeleteView(PostsEditMixin, LoginRequiredMixin, DeleteView):
@@ -67,6 +83,7 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
     model = Comment
     form_class = CreateCommentForm
 
+    @transaction.atomic
     def form_valid(self, form):
         form.instance.post = get_object_or_404(Post, pk=self.kwargs["pk"])
         form.instance.author = self.request.user
@@ -80,6 +97,7 @@ class CommentDeleteView(CommentEditMixin, LoginRequiredMixin, DeleteView):
     def get_success_url(self):
         return reverse("blog:post_detail", kwargs={"pk": self.kwargs["pk"]})
 
+    @transaction.atomic
     def delete(self, request, *args, **kwargs):
         comment = get_object_or_404(Comment, pk=self.kwargs["comment_pk"])
         if self.request.user != comment.author:
@@ -103,96 +121,186 @@ class CommentUpdateView(CommentEditMixin, LoginRequiredMixin, UpdateView):
         return reverse("blog:post_detail", kwargs={"pk": self.kwargs["pk"]})
 
 
-class AuthorProfileListView(PostsQuerySetMixin, ListView):
+class AuthorProfileListView(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    AnonymousPageCacheMixin,
+    CursorPaginationMixin,
+    PostsQuerySetMixin,
+    ListView,
+):
     """
     Различает отображение для автора и посетителей:
-    автор видит все свои посты, посетители - только опубликованные
+    автор видит все свои посты, посетители - только опубликованные.
+    Автор загружается один раз, посты отбираются по author_id,
+    а шапка берёт счётчики из AuthorStats.
     """
     model = Post
     template_name = "blog/profile.html"
     paginate_by = PAGINATED_BY
 
+    def get_cache_scopes(self):
+        return [f"profile:{self.kwargs['username']}"]
+
     def get_queryset(self):
-        if self.request.user.username == self.kwargs["username"]:
+        self.author = get_object_or_404(
+            User, username=self.kwargs["username"]
+        )
+        if self.request.user == self.author:
             return (
-                self.request.user.posts.select_related(
-                    "category",
-                    "author",
-                    "location",
-                )
-                .all()
-                .annotate(comment_count=Count("comments"))
+                Post.objects.filter(author_id=self.author.pk)
+                .select_related("author")
+                .with_reference_data()
                 .order_by('-pub_date')
             )
 
         return (
             super()
             .get_queryset()
-            .filter(author__username=self.kwargs["username"])
-            .annotate(comment_count=Count("comments"))
+            .filter(author_id=self.author.pk)
             .order_by('-pub_date')
         )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["profile"] = get_object_or_404(
-            User, username=self.kwargs["username"]
-        )
+        context["profile"] = self.author
+        context["author_stats"] = AuthorStats.objects.for_author(self.author)
         return context
 
 
-class BlogIndexListView(PostsQuerySetMixin, ListView):
-    """Добавляет количество комментариев к каждому посту на главной"""
+class BlogIndexListView(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    AnonymousPageCacheMixin,
+    CursorPaginationMixin,
+    PostsQuerySetMixin,
+    ListView,
+):
+    """Лента главной; число комментариев хранится в Post.comment_count"""
     model = Post
     template_name = "blog/index.html"
     context_object_name = "post_list"
     paginate_by = PAGINATED_BY
 
-    def get_queryset(self):
-        return super().get_queryset().annotate(comment_count=Count("comments"))
-
 
-class BlogCategoryListView(PostsQuerySetMixin, ListView):
-    """Проверяет публикацию категории через get_object_or_404"""
+class BlogCategoryListView(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    AnonymousPageCacheMixin,
+    CursorPaginationMixin,
+    PostsQuerySetMixin,
+    ListView,
+):
+    """Опубликованная категория находится в кэше справочников"""
     model = Post
     template_name = "blog/category.html"
     context_object_name = "post_list"
     paginate_by = PAGINATED_BY
 
+    def get_cache_scopes(self):
+        return [f"category:{self.kwargs['category_slug']}"]
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["category"] = get_object_or_404(
-            Category, slug=self.kwargs["category_slug"], is_published=True
-        )
+        context["category"] = self.category
         return context
 
     def get_queryset(self):
-        return (
-            super()
-            .get_queryset()
-            .filter(category__slug=self.kwargs["category_slug"])
-            .annotate(comment_count=Count("comments"))
+        self.category = reference_data().published_category(
+            self.kwargs["category_slug"]
         )
+        if self.category is None:
+            raise Http404("Категория не найдена")
+        return super().get_queryset().filter(category_id=self.category.pk)
 
 
-class PostDetailView(PostsQuerySetMixin, DetailView):
-    """Оптимизирует загрузку комментариев через prefetch_related"""
+class PostDetailView(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    AnonymousPageCacheMixin,
+    PostsQuerySetMixin,
+    DetailView,
+):
+    """
+    Показывает только первую страницу комментариев с авторами,
+    остальные подгружаются фрагментами из PostCommentsListView
+    """
     model = Post
     template_name = "blog/detail.html"
 
+    def get_cache_scopes(self):
+        return [f"post:{self.kwargs['pk']}"]
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["form"] = CreateCommentForm()
-        context["comments"] = (
-            self.get_object().comments.prefetch_related("author").all()
+        context["comments"] = CursorPaginator(
+            self.object.comments.select_related("author"),
+            COMMENTS_PAGINATED_BY,
+            ordering=PostCommentsListView.paginate_ordering,
+        ).page()
+        return context
+
+
+class PostCommentsListView(
+    ConditionalGetMixin,
+    AnonymousPageCacheMixin,
+    CursorPaginationMixin,
+    ListView,
+):
+    """Фрагмент со следующей порцией комментариев по курсору ?after="""
+    template_name = "includes/comment_list.html"
+    paginate_by = COMMENTS_PAGINATED_BY
+    paginate_ordering = ("created_at", "pk")
+
+    def get_cache_scopes(self):
+        return [f"post:{self.kwargs['pk']}"]
+
+    def get_queryset(self):
+        if not Post.post_list.filter(pk=self.kwargs["pk"]).exists():
+            raise Http404("Публикация не найдена")
+        return Comment.objects.select_related("author").filter(
+            post_id=self.kwargs["pk"]
         )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["comments"] = context["page_obj"]
         return context
 
+
+class PostSearchView(ListView):
+    """
+    Полнотекстовый поиск по заголовкам, текстам и комментариям.
+    Видимость та же, что у лент; результаты упорядочены по релевантности,
+    поэтому пагинация обычная, по номерам страниц.
+    """
+    template_name = "blog/search.html"
+    context_object_name = "post_list"
+    paginate_by = PAGINATED_BY
+
     def get_queryset(self):
-        return (
-            super()
-            .get_queryset()
-            .prefetch_related(
-                "comments",
-            )
+        self.query = self.request.GET.get("q", "").strip()
+        return search_posts(Post.post_list, self.query)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["query"] = self.query
+        add_snippets(context["page_obj"], self.query)
+        return context
+
+
+class AutocompleteView(View):
+    """
+    Варианты для виджетов автодополнения в формате select2:
+    {"results": [{"id", "text"}], "pagination": {"more"}}
+    """
+    def get(self, request, source):
+        if source not in SOURCES:
+            raise Http404("Неизвестный источник автодополнения")
+        if source in STAFF_SOURCES and not request.user.is_staff:
+            raise PermissionDenied
+        results, more = autocomplete(source, request.GET.get("term", ""))
+        return JsonResponse(
+            {"results": results, "pagination": {"more": more}}
         )
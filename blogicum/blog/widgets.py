@@ -0,0 +1,59 @@
+from django import forms
+from django.urls import reverse
+
+from .refdata import reference_data
+
+
+class AutocompleteSelect(forms.Select):
+    """
+    Выпадающий список, который выводит только выбранный вариант,
+    а остальные подгружает по мере ввода из blog:autocomplete.
+    """
+
+    class Media:
+        js = ("js/autocomplete.js",)
+
+    def __init__(self, source, attrs=None):
+        super().__init__(attrs)
+        self.source = source
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs["data-autocomplete-url"] = reverse(
+            "blog:autocomplete", kwargs={"source": self.source}
+        )
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        field = self.choices.field
+        selected = {str(item) for item in value if item not in ("", None)}
+        options = []
+        if not self.is_required:
+            options.append(
+                self.create_option(
+                    name, "", field.empty_label or "", not selected, 0
+                )
+            )
+        if selected:
+            for obj in self.selected_objects(selected):
+                options.append(
+                    self.create_option(
+                        name,
+                        obj.pk,
+                        field.label_from_instance(obj),
+                        True,
+                        len(options),
+                    )
+                )
+        return [(None, options, 0)]
+
+    def selected_objects(self, pks):
+        return self.choices.queryset.filter(pk__in=pks)
+
+
+class ReferenceAutocompleteSelect(AutocompleteSelect):
+    """Выбранная категория или локация берётся из кэша справочников."""
+
+    def selected_objects(self, pks):
+        objects = reference_data().objects(self.choices.queryset.model)
+        return [obj for pk, obj in objects.items() if str(pk) in pks]
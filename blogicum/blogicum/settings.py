@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -30,6 +31,10 @@ SECRET_KEY = (
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
+# Отладочная панель подменяет ответы и не годится для продакшена:
+# подключается только при DEBUG и BLOGICUM_DEBUG_TOOLBAR=1.
+DEBUG_TOOLBAR = DEBUG and os.environ.get("BLOGICUM_DEBUG_TOOLBAR") == "1"
+
 ALLOWED_HOSTS = [
     "127.0.0.1",
     "localhost",
@@ -50,21 +55,25 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "debug_toolbar",
     "django_bootstrap5",
 ]
 
 MIDDLEWARE = [
+    "blog.middleware.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "blog.middleware.PrimaryPinMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
 ]
 
+if DEBUG_TOOLBAR:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.append("debug_toolbar.middleware.DebugToolbarMiddleware")
+
 INTERNAL_IPS = [
     "127.0.0.1",
 ]
@@ -75,7 +84,8 @@ TEMPLATES_DIR = BASE_DIR / "templates"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates с замером отрисовки для Server-Timing.
+        "BACKEND": "blog.profiling.ProfiledDjangoTemplates",
         "DIRS": [TEMPLATES_DIR],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -102,6 +112,60 @@ DATABASES = {
     }
 }
 
+DATABASE_ROUTERS = ["blog.routers.ReplicaRouter"]
+
+# Псевдонимы баз из DATABASES, с которых ленты и страницы постов читают
+# данные. Для локальной проверки можно добавить в DATABASES копии
+# SQLite-файла и обновлять их командой sync_replicas.
+BLOG_READ_REPLICAS = []
+
+# Сколько секунд после записи пользователь читает с основной базы.
+BLOG_PRIMARY_PIN_SECONDS = 15
+
+# PRAGMA, которые blog.db выполняет на каждом новом соединении с SQLite.
+# WAL позволяет читать во время записи, а busy_timeout ждёт освобождения
+# блокировки вместо ошибки «database is locked». Пустой словарь
+# оставляет настройки SQLite по умолчанию.
+BLOG_SQLITE_PRAGMAS = {
+    "journal_mode": "wal",
+    # В режиме WAL normal не теряет целостность, только последние
+    # транзакции при отключении питания.
+    "synchronous": "normal",
+    "busy_timeout": 5000,
+    # Отрицательное значение — размер в КиБ: 64 МиБ на соединение.
+    "cache_size": -64000,
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "memory",
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# Кэш страниц блога версионируется и работает с любым бэкендом; в
+# продакшене с несколькими процессами нужен общий бэкенд (файловый,
+# memcached или redis), иначе инвалидация будет видна только процессу,
+# который её выполнил.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "blogicum",
+    }
+}
+
+# Сколько секунд процесс держит снимок справочников (blog.refdata), даже
+# если версия refdata не менялась. С локальным кэшем версию видит только
+# изменивший её процесс, поэтому остальные перечитают справочники не
+# позже чем через это время.
+BLOG_REFDATA_TTL = 60
+
+# Время жизни страниц, закэшированных для анонимных читателей, секунды.
+BLOG_PAGE_CACHE_TIMEOUT = 60 * 10
+
+# Время жизни отрисованных карточек постов; ключ карточки меняется при
+# любом её изменении, поэтому таймаут ограничивает лишь объём кэша.
+BLOG_POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -160,3 +224,34 @@ EMAIL_FILE_PATH = BASE_DIR / "sent_emails/"
 MEDIA_ROOT = BASE_DIR / "media/"
 
 MEDIA_URL = "/media/"
+
+# Файлы sitemap пишет команда build_sitemaps; в продакшене их раздаёт
+# веб-сервер как статику по адресу BLOG_SITEMAP_URL.
+BLOG_SITEMAP_ROOT = BASE_DIR / "sitemaps/"
+
+BLOG_SITEMAP_URL = "/sitemaps/"
+
+BLOG_SITEMAP_BASE_URL = "http://127.0.0.1:8000"
+
+# Профиль запроса: время, SQL, шаблоны и кэш. Заголовок Server-Timing
+# получают только персонал и адреса из INTERNAL_IPS, в лог попадает
+# выборка BLOG_PROFILING_LOG_SAMPLE_RATE. Замер добавляет несколько
+# вызовов таймера на запрос и SQL-запрос.
+BLOG_SERVER_TIMING = True
+
+# Доля запросов, профиль которых пишется в лог blog.profiling.
+BLOG_PROFILING_LOG_SAMPLE_RATE = 0.01
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "blog.profiling": {
+            "handlers": ["console"],
+            "level": "INFO",
+        },
+    },
+}
@@ -19,9 +19,12 @@ urlpatterns: List[URLPattern] = [
     path("admin/", admin.site.urls),
 ]
 
-if settings.DEBUG:
+if settings.DEBUG_TOOLBAR:
     import debug_toolbar
 
     urlpatterns += (path("__debug__/", include(debug_toolbar.urls)),)
 
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+urlpatterns += static(
+    settings.BLOG_SITEMAP_URL, document_root=settings.BLOG_SITEMAP_ROOT
+)
@@ -0,0 +1,35 @@
+// Поле поиска над <select data-autocomplete-url>: варианты
+// подгружаются с сервера по первым буквам, выбранный сохраняется.
+document.addEventListener("DOMContentLoaded", () => {
+  document.querySelectorAll("select[data-autocomplete-url]").forEach((select) => {
+    const input = document.createElement("input");
+    input.type = "search";
+    input.className = "form-control mb-1";
+    input.placeholder = "Начните вводить название";
+    select.before(input);
+
+    let timer = null;
+    input.addEventListener("input", () => {
+      clearTimeout(timer);
+      timer = setTimeout(async () => {
+        const url = `${select.dataset.autocompleteUrl}?term=${encodeURIComponent(input.value)}`;
+        const response = await fetch(url);
+        if (!response.ok) {
+          return;
+        }
+        const { results } = await response.json();
+        const selected = select.value;
+        [...select.options].forEach((option) => {
+          if (option.value && option.value !== selected) {
+            option.remove();
+          }
+        });
+        results.forEach(({ id, text }) => {
+          if (String(id) !== selected) {
+            select.add(new Option(text, id));
+          }
+        });
+      }, 250);
+    });
+  });
+});
@@ -2,4 +2,11 @@ from django.contrib import admin
 
 from .models import User
 
-admin.site.register(User)
+
+class UserAdmin(admin.ModelAdmin):
+    """Поиск по началу username нужен автодополнению авторов."""
+    search_fields = ("^username",)
+    ordering = ("username",)
+
+
+admin.site.register(User, UserAdmin)
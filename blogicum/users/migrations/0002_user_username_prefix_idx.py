@@ -0,0 +1,27 @@
+# Generated by Django 3.2.16 on 2026-10-18 21:52
+
+from django.db import migrations, models
+import django.db.models.functions.comparison
+
+
+def drop_raw_prefix_index(apps, schema_editor):
+    # Индекс создавался сырым SQL в blog.0017 и теперь объявлен в модели.
+    schema_editor.execute('DROP INDEX IF EXISTS "user_username_prefix_idx"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('blog', '0017_autocomplete_prefix_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            drop_raw_prefix_index, migrations.RunPython.noop
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.comparison.Collate('username', 'nocase'), name='user_username_prefix_idx'),
+        ),
+    ]
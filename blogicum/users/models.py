@@ -1,7 +1,19 @@
 from django.contrib.auth.models import AbstractUser
+from django.db import models
+from django.db.models.functions import Collate
 from django.urls import reverse
 
 
 class User(AbstractUser):
+    class Meta(AbstractUser.Meta):
+        indexes = (
+            # Автодополнение авторов по началу имени (istartswith):
+            # LIKE в SQLite использует индекс только с правилом NOCASE.
+            models.Index(
+                Collate("username", "nocase"),
+                name="user_username_prefix_idx",
+            ),
+        )
+
     def get_absolute_url(self):
         return reverse("blog:profile", kwargs={"username": self.username})
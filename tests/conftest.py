@@ -81,6 +81,7 @@ pytest_plugins = [
     "fixtures.locations",
     "fixtures.categories",
     "fixtures.comments",
+    "fixtures.query_budget",
     "adapters.comment",
 ]
 
@@ -90,6 +91,15 @@ def mixer():
     return _mixer
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
+
+
 @pytest.fixture
 def user(mixer):
     User = get_user_model()
@@ -341,6 +351,7 @@ def cleanup(request):
                 filename.endswith(".jpg")
                 or filename.endswith(".gif")
                 or filename.endswith(".png")
+                or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
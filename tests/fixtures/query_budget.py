@@ -0,0 +1,108 @@
+import re
+from collections import Counter
+from contextlib import ExitStack
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import pytest
+from django.db import connections
+from django.test import Client
+from django.urls import resolve
+
+from blog.refdata import reference_data
+
+# Наибольшее число SQL-запросов на один ответ маршрута, по имени
+# маршрута. Бюджет не зависит от размера страницы и числа объектов:
+# рост запросов вместе с данными — это N+1, а не повод поднять бюджет.
+QUERY_BUDGETS: Dict[str, int] = {
+    "blog:index": 3,
+    "blog:category_posts": 3,
+    "blog:profile": 5,
+    "blog:post_detail": 4,
+    "blog:post_comments": 4,
+    "blog:create_post": 2,
+    "blog:edit_post": 5,
+    "blog:add_comment": 10,
+    "users:registration": 2,
+    "admin:blog_post_changelist": 7,
+}
+
+_LITERALS = (
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b|%s"), "?"),
+    (re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)"), "(...)"),
+    (re.compile(r"\s+"), " "),
+)
+
+
+def normalize_sql(sql: str) -> str:
+    """Шаблон запроса: литералы и списки IN заменены заглушками."""
+    for pattern, replacement in _LITERALS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def format_queries(queries: List[str]) -> str:
+    patterns = Counter(normalize_sql(sql) for sql in queries)
+    return "\n".join(
+        f"  {count} × {pattern}" for pattern, count in patterns.most_common()
+    )
+
+
+class BudgetedClient:
+    """
+    Обёртка тестового клиента: каждый ответ сверяется с бюджетом
+    запросов маршрута, в который разрешился путь запроса.
+    """
+
+    def __init__(self, client: Client, budgets: Dict[str, int]):
+        self.client = client
+        self.budgets = budgets
+
+    def get(self, path: str, *args, **kwargs):
+        return self._request("get", path, *args, **kwargs)
+
+    def post(self, path: str, *args, **kwargs):
+        return self._request("post", path, *args, **kwargs)
+
+    def _request(self, method: str, path: str, *args, **kwargs):
+        route = resolve(urlsplit(path).path).view_name
+        assert route in self.budgets, (
+            f"Добавьте бюджет запросов для маршрута `{route}` "
+            "в QUERY_BUDGETS."
+        )
+        # Справочники — кеш процесса, в рабочем режиме он уже прогрет.
+        reference_data()
+        queries: List[str] = []
+
+        def record(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(
+                    connections[alias].execute_wrapper(record)
+                )
+            response = getattr(self.client, method)(path, *args, **kwargs)
+        budget = self.budgets[route]
+        assert len(queries) <= budget, (
+            f"Маршрут `{route}` ({method.upper()} {path}) выполнил "
+            f"{len(queries)} SQL-запросов при бюджете {budget}:\n"
+            f"{format_queries(queries)}"
+        )
+        return response
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Оборачивает клиент из conftest в BudgetedClient:
+    `query_budget(user_client).get(url)`. Необязательный словарь
+    переопределяет бюджеты отдельных маршрутов.
+    """
+
+    def wrap(client: Client, budgets: Optional[Dict[str, int]] = None):
+        return BudgetedClient(client, {**QUERY_BUDGETS, **(budgets or {})})
+
+    return wrap
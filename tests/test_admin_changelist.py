@@ -0,0 +1,83 @@
+import pytest
+from django.db import connection
+
+from blog.models import Comment, Post
+from blog.paginators import EstimatedCountPaginator
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _changelist_queries(client, url):
+    queries = []
+
+    def count(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        response = client.get(url)
+    assert response.status_code == 200
+    return response, [sql for sql in queries if "blog_post" in sql]
+
+
+def test_post_changelist_query_count_is_constant(
+    admin_client, mixer, user, published_category, published_location
+):
+    def blend(quantity):
+        mixer.cycle(quantity).blend(
+            Post,
+            author=user,
+            category=published_category,
+            location=published_location,
+        )
+
+    blend(3)
+    _, few = _changelist_queries(admin_client, "/admin/blog/post/")
+    blend(20)
+    response, many = _changelist_queries(admin_client, "/admin/blog/post/")
+    assert len(many) == len(few), (
+        "Убедитесь, что список постов в админке не делает запросов "
+        "на каждую строку."
+    )
+    counts = [sql for sql in many if "COUNT(" in sql]
+    assert len(counts) == 1 and "LIMIT" in counts[0], (
+        "Убедитесь, что число постов считается с ограничением, "
+        "без полного COUNT(*) по таблице."
+    )
+    listing = next(sql for sql in many if '"blog_post"."title"' in sql)
+    assert '"blog_post"."text"' not in listing
+
+
+def test_post_changelist_sorts_by_comment_count(
+    admin_client, mixer, user, published_category
+):
+    posts = mixer.cycle(3).blend(
+        Post, author=user, category=published_category
+    )
+    for quantity, post in zip((2, 5, 1), posts):
+        mixer.cycle(quantity).blend(Comment, post=post, author=user)
+    # Колонка comment_count — восьмая в list_display.
+    response = admin_client.get("/admin/blog/post/", {"o": "-8"})
+    result = [post.pk for post in response.context["cl"].result_list]
+    assert result == [posts[1].pk, posts[0].pk, posts[2].pk]
+
+
+def test_estimated_paginator_uses_table_statistics(
+    mixer, user, published_category
+):
+    mixer.cycle(12).blend(Post, author=user, category=published_category)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+    paginator = EstimatedCountPaginator(Post.objects.order_by("pk"), 5)
+    paginator.count_limit = 3
+    assert paginator.count >= 12, (
+        "Убедитесь, что для всей таблицы используется оценка из статистики."
+    )
+    filtered = EstimatedCountPaginator(
+        Post.objects.filter(author=user).order_by("pk"), 5
+    )
+    filtered.count_limit = 3
+    assert filtered.count == 4, (
+        "Убедитесь, что отфильтрованная выборка считается до count_limit."
+    )
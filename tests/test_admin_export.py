@@ -0,0 +1,107 @@
+import csv
+import json
+from io import StringIO
+
+import pytest
+from django.db import connection
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _content(response):
+    assert response.streaming, "Убедитесь, что выгрузка отдаётся потоком."
+    return b"".join(response.streaming_content).decode("utf-8-sig")
+
+
+@pytest.fixture
+def export_posts(mixer, user, published_category):
+    other = mixer.blend("blog.Category", is_published=True)
+    posts = mixer.cycle(5).blend(
+        Post, author=user, category=published_category
+    )
+    mixer.cycle(3).blend(Post, author=user, category=other)
+    return posts
+
+
+def test_changelist_export_streams_filtered_posts(
+    admin_client, export_posts, published_category
+):
+    changelist = admin_client.get("/admin/blog/post/")
+    assert "/admin/blog/post/export/csv/" in changelist.content.decode(), (
+        "Убедитесь, что на странице списка постов есть кнопка выгрузки."
+    )
+
+    queries = []
+
+    def count(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        response = admin_client.get(
+            "/admin/blog/post/export/csv/",
+            {"category__id__exact": published_category.id},
+        )
+        rows = list(csv.reader(StringIO(_content(response))))
+    assert rows[0][:3] == ["id", "title", "author"]
+    assert sorted(int(row[0]) for row in rows[1:]) == sorted(
+        post.pk for post in export_posts
+    ), "Убедитесь, что выгрузка учитывает фильтры списка."
+    post_queries = [sql for sql in queries if 'FROM "blog_post"' in sql]
+    assert len(post_queries) <= 2, (
+        "Убедитесь, что строки выгрузки читаются без запроса на каждую."
+    )
+
+
+def test_export_actions_stream_selected_rows(
+    admin_client, export_posts, mixer, user
+):
+    selected = export_posts[:2]
+    response = admin_client.post(
+        "/admin/blog/post/",
+        {
+            "action": "export_ndjson",
+            "_selected_action": [post.pk for post in selected],
+        },
+    )
+    records = [json.loads(line) for line in _content(response).splitlines()]
+    assert [record["id"] for record in records] == list(
+        Post.objects.filter(pk__in=[post.pk for post in selected])
+        .order_by("-pub_date", "-pk")
+        .values_list("pk", flat=True)
+    ), "Убедитесь, что выгрузка сохраняет сортировку списка."
+    assert records[0]["author"] == user.username
+
+    comment = mixer.blend(Comment, post=selected[0], author=user)
+    response = admin_client.post(
+        "/admin/blog/comment/",
+        {"action": "export_csv", "_selected_action": [comment.pk]},
+    )
+    rows = list(csv.reader(StringIO(_content(response))))
+    assert rows[1][:2] == [str(comment.pk), str(selected[0].pk)]
+
+
+def test_export_keeps_changelist_ordering(admin_client, export_posts):
+    response = admin_client.get(
+        "/admin/blog/post/export/ndjson/", {"o": "1"}
+    )
+    titles = [
+        json.loads(line)["title"] for line in _content(response).splitlines()
+    ]
+    assert titles == sorted(titles), (
+        "Убедитесь, что выгрузка идёт в порядке сортировки списка."
+    )
+
+
+def test_export_requires_staff(user_client, user):
+    response = user_client.get("/admin/blog/post/export/csv/")
+    assert response.status_code == 302
+
+    user.is_staff = True
+    user.save()
+    response = user_client.get("/admin/blog/post/export/csv/")
+    assert response.status_code == 403, (
+        "Убедитесь, что выгрузка без права просмотра отвечает 403."
+    )
@@ -0,0 +1,126 @@
+import pytest
+from django.contrib.messages import get_messages
+from django.db import connection
+from django.db.models.signals import post_save
+
+from blog.cache import INDEX_SCOPE, get_versions
+from blog.models import Category, Location, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _run_action(client, url, action, objects):
+    queries = []
+
+    def record(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(record):
+        response = client.post(
+            url,
+            {
+                "action": action,
+                "_selected_action": [obj.pk for obj in objects],
+            },
+            follow=True,
+        )
+    assert response.status_code == 200
+    return response, queries
+
+
+def _updates(queries, table):
+    return [
+        sql for sql in queries
+        if sql.startswith(f'UPDATE "{table}"')
+    ]
+
+
+def test_unpublish_posts_in_one_update(
+    admin_client, mixer, user, published_category
+):
+    posts = mixer.cycle(15).blend(
+        Post, author=user, category=published_category, is_published=True
+    )
+    saves = []
+
+    def on_save(sender, **kwargs):
+        saves.append(kwargs["instance"])
+
+    index_version = get_versions([INDEX_SCOPE])[0]
+    post_save.connect(on_save, sender=Post)
+    try:
+        response, queries = _run_action(
+            admin_client, "/admin/blog/post/", "unpublish_selected", posts
+        )
+    finally:
+        post_save.disconnect(on_save, sender=Post)
+
+    assert len(_updates(queries, "blog_post")) == 1, (
+        "Убедитесь, что снятие постов с публикации выполняется одним "
+        "UPDATE, а не сохранением каждой строки."
+    )
+    assert not saves
+    assert not Post.objects.filter(is_published=True).exists()
+    assert not Post.objects.filter(is_visible=True).exists(), (
+        "Убедитесь, что is_visible пересчитывается вместе с is_published."
+    )
+    assert get_versions([INDEX_SCOPE])[0] != index_version, (
+        "Убедитесь, что массовое действие сбрасывает кэш страниц."
+    )
+    message = str(list(get_messages(response.wsgi_request))[0])
+    assert "15 из 15" in message
+
+
+def test_publish_counts_only_changed_posts(
+    admin_client, mixer, user, published_category
+):
+    hidden = mixer.cycle(3).blend(
+        Post, author=user, category=published_category, is_published=False
+    )
+    shown = mixer.blend(
+        Post, author=user, category=published_category, is_published=True
+    )
+    response, _ = _run_action(
+        admin_client,
+        "/admin/blog/post/",
+        "publish_selected",
+        hidden + [shown],
+    )
+    message = str(list(get_messages(response.wsgi_request))[0])
+    assert "3 из 4" in message, (
+        "Убедитесь, что сообщение сообщает число реально изменённых строк."
+    )
+    assert Post.objects.filter(is_visible=True).count() == 4
+
+
+def test_unpublish_category_hides_its_posts(
+    admin_client, mixer, user, published_category
+):
+    mixer.cycle(5).blend(
+        Post, author=user, category=published_category, is_published=True
+    )
+    _, queries = _run_action(
+        admin_client,
+        "/admin/blog/category/",
+        "unpublish_selected",
+        [published_category],
+    )
+    assert len(_updates(queries, "blog_category")) == 1
+    assert len(_updates(queries, "blog_post")) == 1, (
+        "Убедитесь, что видимость постов категории пересчитывается "
+        "одним UPDATE."
+    )
+    assert not Category.objects.get(pk=published_category.pk).is_published
+    assert not Post.objects.filter(is_visible=True).exists()
+
+
+def test_publish_locations(admin_client, mixer):
+    locations = mixer.cycle(4).blend(Location, is_published=False)
+    _, queries = _run_action(
+        admin_client, "/admin/blog/location/", "publish_selected", locations
+    )
+    assert len(_updates(queries, "blog_location")) == 1
+    assert Location.objects.filter(
+        pk__in=[location.pk for location in locations], is_published=True
+    ).count() == 4
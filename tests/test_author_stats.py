@@ -0,0 +1,141 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from blog.models import AuthorStats, Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _stats(user):
+    return AuthorStats.objects.for_author(user)
+
+
+def _assert_matches_rebuild(user):
+    stats = _stats(user)
+    AuthorStats.objects.rebuild([user.pk])
+    rebuilt = _stats(user)
+    assert (
+        stats.post_count,
+        stats.comment_count,
+        stats.last_post_at,
+    ) == (
+        rebuilt.post_count,
+        rebuilt.comment_count,
+        rebuilt.last_post_at,
+    ), "Убедитесь, что инкрементальные счётчики совпадают с пересчётом."
+
+
+def test_stats_follow_posts_and_comments(
+    mixer, user, another_user, published_category
+):
+    _stats(user)
+    now = timezone.now()
+    older = mixer.blend(
+        Post,
+        author=user,
+        category=published_category,
+        pub_date=now - timedelta(days=2),
+    )
+    newer = mixer.blend(
+        Post,
+        author=user,
+        category=published_category,
+        pub_date=now - timedelta(days=1),
+    )
+    mixer.blend(
+        Post,
+        author=user,
+        category=published_category,
+        pub_date=now + timedelta(days=1),
+    )
+    stats = _stats(user)
+    assert stats.post_count == 2, (
+        "Убедитесь, что в статистике учитываются только видимые посты."
+    )
+    assert stats.last_post_at == newer.pub_date
+
+    comment = mixer.blend(Comment, post=older, author=user)
+    mixer.blend(Comment, post=older, author=another_user)
+    assert _stats(user).comment_count == 1
+
+    newer.is_published = False
+    newer.save()
+    stats = _stats(user)
+    assert stats.post_count == 1
+    assert stats.last_post_at == older.pub_date
+
+    comment.delete()
+    older.delete()
+    stats = _stats(user)
+    assert (stats.post_count, stats.comment_count) == (0, 0)
+    assert stats.last_post_at is None
+    _assert_matches_rebuild(user)
+
+
+def test_category_unpublish_refreshes_stats(mixer, user, published_category):
+    mixer.cycle(3).blend(Post, author=user, category=published_category)
+    assert _stats(user).post_count == 3
+    published_category.is_published = False
+    published_category.save()
+    assert _stats(user).post_count == 0
+
+
+def test_bulk_unpublish_refreshes_stats(
+    admin_client, mixer, user, published_category
+):
+    posts = mixer.cycle(4).blend(
+        Post, author=user, category=published_category
+    )
+    admin_client.post(
+        "/admin/blog/post/",
+        {
+            "action": "unpublish_selected",
+            "_selected_action": [post.pk for post in posts[:3]],
+        },
+    )
+    assert _stats(user).post_count == 1
+
+
+def test_profile_resolves_author_once(
+    client, mixer, user, published_category
+):
+    mixer.cycle(3).blend(Post, author=user, category=published_category)
+    mixer.blend(Comment, post=Post.objects.first(), author=user)
+    _stats(user)
+    queries = []
+
+    def record(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(record):
+        response = client.get(f"/profile/{user.username}/")
+    assert response.status_code == 200
+    lookups = [
+        sql for sql in queries if '"users_user"."username" =' in sql
+    ]
+    assert len(lookups) == 1, (
+        "Убедитесь, что профиль ищет автора по username один раз, "
+        "а посты отбирает по author_id."
+    )
+    assert not [sql for sql in queries if "GROUP BY" in sql]
+    content = response.content.decode()
+    assert "Публикаций: 3" in content
+    assert "Комментариев: 1" in content
+
+
+def test_comment_refreshes_commenter_profile_page(
+    client, mixer, user, another_user, published_category
+):
+    post = mixer.blend(Post, author=user, category=published_category)
+    url = f"/profile/{another_user.username}/"
+    assert "Комментариев: 0" in client.get(url).content.decode()
+    comment = mixer.blend(Comment, post=post, author=another_user)
+    assert "Комментариев: 1" in client.get(url).content.decode(), (
+        "Убедитесь, что комментарий сбрасывает кэш профиля своего автора."
+    )
+    comment.delete()
+    assert "Комментариев: 0" in client.get(url).content.decode()
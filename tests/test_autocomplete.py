@@ -0,0 +1,122 @@
+from http import HTTPStatus
+
+import pytest
+from bs4 import BeautifulSoup
+from django.db import connection
+
+from blog.models import Category, Location
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def locations(mixer):
+    return {
+        "murom": mixer.blend(Location, name="Муром", is_published=True),
+        "murmansk": mixer.blend(Location, name="Мурманск", is_published=True),
+        "hidden": mixer.blend(Location, name="Мурино", is_published=False),
+        "other": mixer.blend(Location, name="Казань", is_published=True),
+    }
+
+
+def test_autocomplete_filters_by_prefix(client, locations):
+    response = client.get("/autocomplete/locations/", {"term": "мурм"})
+    assert response.status_code == HTTPStatus.OK
+    assert [item["id"] for item in response.json()["results"]] == [
+        locations["murmansk"].pk
+    ], "Убедитесь, что автодополнение ищет по началу названия."
+    names = [
+        item["text"]
+        for item in client.get(
+            "/autocomplete/locations/", {"term": "Мур"}
+        ).json()["results"]
+    ]
+    assert names == ["Мурманск", "Муром"], (
+        "Убедитесь, что неопубликованные локации не предлагаются."
+    )
+    assert client.get("/autocomplete/secrets/").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+
+def test_staff_sources_are_not_public(client, user_client, admin_client):
+    for source in ("users", "posts"):
+        url = f"/autocomplete/{source}/"
+        assert client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+            f"Убедитесь, что источник `{source}` закрыт для анонимов."
+        )
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+            f"Убедитесь, что источник `{source}` доступен только персоналу."
+        )
+        assert admin_client.get(url).status_code == HTTPStatus.OK
+    assert client.get("/autocomplete/categories/").status_code == (
+        HTTPStatus.OK
+    ), "Убедитесь, что публичные справочники открыты всем."
+
+
+@pytest.mark.parametrize(
+    "source, index",
+    (
+        ("users", "user_username_prefix_idx"),
+        ("posts", "post_title_prefix_idx"),
+        ("categories", "category_title_prefix_idx"),
+        ("locations", "location_name_prefix_idx"),
+    ),
+)
+def test_autocomplete_uses_prefix_index(admin_client, user, source, index):
+    plans = []
+
+    def explain(execute, sql, params, many, context):
+        if sql.startswith("SELECT") and "LIKE" in sql:
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                plans.append(" ".join(row[-1] for row in cursor.fetchall()))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(explain):
+        admin_client.get(
+            f"/autocomplete/{source}/", {"term": user.username[:2]}
+        )
+    assert plans and index in plans[0], (
+        f"Убедитесь, что источник `{source}` ищет по префиксному индексу, "
+        "объявленному в Meta.indexes модели."
+    )
+
+
+def test_post_form_renders_only_selected_options(
+    user_client, mixer, locations, published_category
+):
+    mixer.cycle(5).blend(Category, is_published=True)
+    soup = BeautifulSoup(
+        user_client.get("/posts/create/").content, "html.parser"
+    )
+    for name in ("location", "category"):
+        select = soup.find("select", attrs={"name": name})
+        assert select["data-autocomplete-url"].startswith("/autocomplete/")
+        assert len(select.find_all("option")) <= 1, (
+            "Убедитесь, что форма поста не выводит все варианты списка."
+        )
+
+
+def test_admin_autocomplete_for_post_author(admin_client, user):
+    response = admin_client.get(
+        "/admin/autocomplete/",
+        {
+            "app_label": "blog",
+            "model_name": "post",
+            "field_name": "author",
+            "term": user.username[:3],
+        },
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert str(user.pk) in [item["id"] for item in response.json()["results"]]
+
+
+def test_admin_forms_do_not_list_all_rows(admin_client, mixer, user):
+    mixer.cycle(5).blend(Location, is_published=True)
+    for url in ("/admin/blog/post/add/", "/admin/blog/comment/add/"):
+        soup = BeautifulSoup(admin_client.get(url).content, "html.parser")
+        for select in soup.find_all("select"):
+            assert len(select.find_all("option")) <= 1, (
+                f"Убедитесь, что форма {url} использует автодополнение."
+            )
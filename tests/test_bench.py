@@ -0,0 +1,89 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from blog.bench import compare, percentile
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_bench_measures_every_route_and_saves_json(
+    tmp_path, mixer, user, published_category
+):
+    post = mixer.blend(Post, author=user, category=published_category)
+    comments = Comment.objects.filter(post=post).count()
+    output = tmp_path / "bench.json"
+
+    call_command(
+        "bench", iterations=3, warmup=1, output=str(output), stdout=StringIO()
+    )
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    routes = report["routes"]
+    assert len(routes) == 20, (
+        "Убедитесь, что bench замеряет каждый маршрут для всех ролей."
+    )
+    for role in ("anonymous", "authenticated"):
+        detail = routes[f"{role} blog:post_detail"]
+        assert detail["status"] == 200
+        assert detail["p50_ms"] <= detail["p95_ms"] <= detail["p99_ms"]
+        assert detail["queries"] > 0 and detail["bytes"] > 0, (
+            "Убедитесь, что анонимный замер идёт мимо кэша страниц."
+        )
+    cached = routes["anonymous-cached blog:post_detail"]
+    assert cached["queries"] == 0, (
+        "Убедитесь, что роль anonymous-cached замеряет отдачу из кэша."
+    )
+    assert "anonymous-cached blog:create_post" not in routes
+    assert routes["authenticated blog:edit_post"]["status"] == 200, (
+        "Убедитесь, что авторизованный замер идёт от имени автора поста."
+    )
+    assert routes["authenticated blog:add_comment"]["status"] == 302
+    assert Comment.objects.filter(post=post).count() == comments, (
+        "Убедитесь, что запись при замере откатывается."
+    )
+
+
+def test_bench_reports_regressions_against_baseline(
+    tmp_path, mixer, user, published_category
+):
+    mixer.blend(Post, author=user, category=published_category)
+    baseline = tmp_path / "baseline.json"
+    call_command(
+        "bench",
+        route=["blog:index"],
+        role=["anonymous"],
+        iterations=2,
+        warmup=0,
+        output=str(baseline),
+        stdout=StringIO(),
+    )
+    report = json.loads(baseline.read_text(encoding="utf-8"))
+    report["routes"]["anonymous blog:index"]["queries"] = -1
+    baseline.write_text(json.dumps(report), encoding="utf-8")
+
+    with pytest.raises(CommandError):
+        call_command(
+            "bench",
+            route=["blog:index"],
+            role=["anonymous"],
+            iterations=2,
+            warmup=0,
+            baseline=str(baseline),
+            fail_on_regression=True,
+            stdout=StringIO(),
+        )
+
+
+def test_compare_and_percentiles():
+    assert percentile([1, 2, 3, 4, 5], 50) == 3
+    assert percentile([10, 20], 95) == pytest.approx(19.5)
+    baseline = {"route": {"p95_ms": 10.0, "queries": 3, "bytes": 100}}
+    slower = {"route": {"p95_ms": 12.0, "queries": 3, "bytes": 100}}
+    same = {"route": {"p95_ms": 10.5, "queries": 3, "bytes": 90}}
+    assert compare(slower, baseline)["route"]["regression"]
+    assert not compare(same, baseline)["route"]["regression"]
+    assert compare(same, baseline)["route"]["bytes"] == -10
@@ -0,0 +1,101 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _count(post):
+    return Post.objects.values_list("comment_count", flat=True).get(pk=post.pk)
+
+
+def test_comment_count_follows_creates_and_deletes(
+    mixer, post_with_published_location, another_user
+):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend(Comment, post=post)
+    assert _count(post) == 3, (
+        "Убедитесь, что создание комментария увеличивает Post.comment_count."
+    )
+    comments[0].delete()
+    assert _count(post) == 2
+
+    mixer.blend(Comment, post=post, author=another_user)
+    assert _count(post) == 3
+    another_user.delete()
+    assert _count(post) == 2, (
+        "Убедитесь, что каскадное удаление комментариев "
+        "уменьшает Post.comment_count."
+    )
+
+
+def test_post_save_keeps_counter(
+    mixer, user_client, post_with_published_location
+):
+    post = Post.objects.get(pk=post_with_published_location.pk)
+    mixer.blend(Comment, post=post)
+    post.title += "!"
+    post.save()
+    assert _count(post) == 1, (
+        "Убедитесь, что сохранение поста не перезаписывает счётчик "
+        "комментариев устаревшим значением."
+    )
+    assert Post.objects.get(pk=post.pk).title == post.title
+
+    user_client.post(
+        f"/posts/{post.pk}/edit/",
+        {
+            "title": "Новый заголовок",
+            "text": post.text,
+            "pub_date": post.pub_date.strftime("%Y-%m-%dT%H:%M"),
+            "category": post.category_id,
+        },
+    )
+    post.refresh_from_db()
+    assert post.title == "Новый заголовок"
+    assert post.comment_count == 1
+
+
+def test_deferred_post_save_updates_loaded_fields(
+    post_with_published_location,
+):
+    post = Post.objects.only("title").get(pk=post_with_published_location.pk)
+    post.title = "Только заголовок"
+    with CaptureQueriesContext(connection) as context:
+        post.save()
+    updates = [
+        query["sql"] for query in context.captured_queries
+        if query["sql"].startswith('UPDATE "blog_post"')
+    ]
+    assert updates == [
+        f'UPDATE "blog_post" SET "title" = \'{post.title}\' '
+        f'WHERE "blog_post"."id" = {post.pk}'
+    ], (
+        "Убедитесь, что сохранение поста с отложенными полями обновляет "
+        "только загруженные поля и не дочитывает остальные."
+    )
+    assert Post.objects.get(pk=post.pk).title == post.title
+
+
+def test_comment_views_update_counter(
+    user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.post(f"/posts/{post.id}/comment/", {"text": "Первый!"})
+    assert _count(post) == 1
+    comment = Comment.objects.get(post=post)
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    assert _count(post) == 0
+
+
+def test_recount_comments_repairs_counters(
+    mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(4).blend(Comment, post=post)
+    Post.objects.update(comment_count=100)
+    call_command("recount_comments", batch_size=1)
+    assert _count(post) == 4
@@ -0,0 +1,79 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from blog.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def many_comments(mixer, post_with_published_location):
+    comments = mixer.cycle(25).blend(
+        Comment, post=post_with_published_location
+    )
+    # created_at задаётся auto_now_add, разносим по времени вручную.
+    start = timezone.now() - timedelta(days=1)
+    for index, comment in enumerate(comments):
+        Comment.objects.filter(pk=comment.pk).update(
+            created_at=start + timedelta(minutes=index)
+        )
+    return [comment.pk for comment in comments]
+
+
+def test_detail_renders_first_comment_page(
+    user_client, post_with_published_location, many_comments
+):
+    post = post_with_published_location
+    comment_queries = []
+
+    def capture(execute, sql, params, many, context):
+        if 'FROM "blog_comment"' in sql:
+            comment_queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(capture):
+        response = user_client.get(f"/posts/{post.id}/")
+    comments = response.context["comments"]
+    assert [comment.pk for comment in comments] == many_comments[:10], (
+        "Убедитесь, что на странице поста выводятся только первые "
+        "10 комментариев в хронологическом порядке."
+    )
+    assert len(comment_queries) == 1 and "users_user" in comment_queries[0], (
+        "Убедитесь, что комментарии загружаются одним запросом "
+        "вместе с авторами."
+    )
+    assert comments.next_cursor in response.content.decode()
+
+
+def test_comment_fragment_loads_following_pages(
+    client, post_with_published_location, many_comments
+):
+    post = post_with_published_location
+    first = client.get(f"/posts/{post.id}/").context["comments"]
+
+    response = client.get(
+        f"/posts/{post.id}/comments/", {"after": first.next_cursor}
+    )
+    assert response.status_code == HTTPStatus.OK
+    second = response.context["comments"]
+    assert [comment.pk for comment in second] == many_comments[10:20]
+
+    response = client.get(
+        f"/posts/{post.id}/comments/", {"after": second.next_cursor}
+    )
+    last = response.context["comments"]
+    assert [comment.pk for comment in last] == many_comments[20:]
+    assert not last.has_next()
+    assert "Показать ещё" not in response.content.decode()
+
+
+def test_comment_fragment_hides_invisible_posts(
+    client, unpublished_posts_with_published_locations
+):
+    post = unpublished_posts_with_published_locations[0]
+    response = client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
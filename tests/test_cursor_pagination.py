@@ -0,0 +1,89 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+
+@pytest.fixture
+def posts_with_shared_dates(mixer, user, published_category):
+    # По две публикации на каждую дату — проверяем разрешение «ничьих» по id.
+    now = timezone.now()
+    dates = (now - timedelta(hours=i // 2) for i in range(N_PER_PAGE * 2 + 5))
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=dates,
+        is_published=True,
+    )
+
+
+def _walk(client, url, direction="after"):
+    seen = []
+    response = client.get(url)
+    while True:
+        assert response.status_code == HTTPStatus.OK
+        page = response.context["page_obj"]
+        seen.append([post.id for post in page])
+        cursor = (
+            page.next_cursor if direction == "after" else page.previous_cursor
+        )
+        if not cursor:
+            return seen, page
+        response = client.get(url, {direction: cursor})
+
+
+@pytest.mark.django_db
+def test_cursor_pages_cover_feed_without_gaps(
+    user_client, posts_with_shared_dates, published_category, user
+):
+    expected = [
+        post.id
+        for post in sorted(
+            posts_with_shared_dates,
+            key=lambda post: (post.pub_date, post.id),
+            reverse=True,
+        )
+    ]
+    for url in (
+        "/",
+        f"/category/{published_category.slug}/",
+        f"/profile/{user.username}/",
+    ):
+        pages, last_page = _walk(user_client, url)
+        assert [len(ids) for ids in pages] == [10, 10, 5], (
+            f"Убедитесь, что курсорная пагинация на странице {url} "
+            "отдаёт страницы по 10 публикаций."
+        )
+        assert sum(pages, []) == expected, (
+            f"Убедитесь, что курсорная пагинация на странице {url} "
+            "проходит ленту без пропусков и повторов."
+        )
+
+        back_pages, _ = _walk(
+            user_client,
+            url + "?before=" + last_page.previous_cursor,
+            direction="before",
+        )
+        assert back_pages == pages[-2::-1], (
+            "Убедитесь, что переход назад по ?before= возвращает "
+            "предыдущие страницы."
+        )
+
+
+@pytest.mark.django_db
+def test_page_number_links_still_work(user_client, posts_with_shared_dates):
+    response = user_client.get("/", {"page": 2})
+    assert response.status_code == HTTPStatus.OK
+    page = response.context["page_obj"]
+    assert page.number == 2
+    assert len(page) == N_PER_PAGE
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_is_not_found(user_client, posts_with_shared_dates):
+    response = user_client.get("/", {"after": "not-a-cursor"})
+    assert response.status_code == HTTPStatus.NOT_FOUND
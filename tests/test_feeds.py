@@ -0,0 +1,120 @@
+from http import HTTPStatus
+from xml.etree import ElementTree
+
+import pytest
+from django.db import connection
+
+from blog.cache import INDEX_SCOPE
+from blog.feeds import PostFeedView
+
+pytestmark = [pytest.mark.django_db]
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def _get(client, url, **headers):
+    queries = []
+
+    def count(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        response = client.get(url, **headers)
+        content = b"".join(response) if response.streaming else None
+    return response, content, len(queries)
+
+
+@pytest.fixture
+def feed_urls(post_with_published_location):
+    post = post_with_published_location
+    return (
+        "/feed/rss/",
+        f"/category/{post.category.slug}/feed/rss/",
+        f"/profile/{post.author.username}/feed/atom/",
+    )
+
+
+def test_feeds_list_visible_posts(
+    client,
+    post_with_published_location,
+    unpublished_posts_with_published_locations,
+):
+    _, content, _ = _get(client, "/feed/rss/")
+    titles = [
+        item.findtext("title")
+        for item in ElementTree.fromstring(content).iter("item")
+    ]
+    assert titles == [post_with_published_location.title], (
+        "Убедитесь, что лента содержит только опубликованные посты."
+    )
+
+    post = post_with_published_location
+    _, content, _ = _get(
+        client, f"/profile/{post.author.username}/feed/atom/"
+    )
+    entries = list(ElementTree.fromstring(content).iter(f"{ATOM}entry"))
+    assert len(entries) == 1
+    assert entries[0].findtext(f"{ATOM}link") is not None
+
+
+def test_feeds_are_streamed_then_cached(client, feed_urls):
+    for url in feed_urls:
+        response, content, queries = _get(client, url)
+        assert response.status_code == HTTPStatus.OK and queries
+        assert response.streaming, (
+            f"Убедитесь, что лента {url} отдаётся потоком."
+        )
+        cached, _, cached_queries = _get(client, url)
+        assert cached_queries == 0, (
+            f"Убедитесь, что лента {url} повторно отдаётся из кэша "
+            "без запросов к базе данных."
+        )
+        assert cached.content == content
+
+        not_modified, _, _ = _get(
+            client, url, HTTP_IF_NONE_MATCH=cached["ETag"]
+        )
+        assert not_modified.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_feeds_are_invalidated_by_post_changes(
+    client, feed_urls, post_with_published_location
+):
+    for url in feed_urls:
+        _get(client, url)
+    post = post_with_published_location
+    post.title = "Новый заголовок"
+    post.save()
+    for url in feed_urls:
+        _, content, queries = _get(client, url)
+        assert queries and "Новый заголовок" in content.decode(), (
+            f"Убедитесь, что лента {url} обновляется после изменения поста."
+        )
+
+
+def test_unknown_feeds_are_not_found(client, mixer):
+    category = mixer.blend("blog.Category", is_published=False)
+    assert client.get("/feed/json/").status_code == HTTPStatus.NOT_FOUND
+    response = client.get(f"/category/{category.slug}/feed/rss/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert client.get("/profile/nobody/feed/rss/").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+
+def test_feed_scopes_default_to_index():
+    assert PostFeedView().get_cache_scopes() == [INDEX_SCOPE], (
+        "Убедитесь, что базовая лента зависит от области index."
+    )
+
+
+def test_feeds_are_cached_per_host(client, settings, feed_urls):
+    settings.ALLOWED_HOSTS = ["one.example", "two.example"]
+    _get(client, "/feed/rss/", HTTP_HOST="one.example")
+    response, content, _ = _get(client, "/feed/rss/", HTTP_HOST="two.example")
+    content = content if response.streaming else response.content
+    assert b"two.example" in content and b"one.example" not in content, (
+        "Убедитесь, что лента с абсолютными ссылками кэшируется "
+        "отдельно для каждого хоста."
+    )
@@ -0,0 +1,129 @@
+from io import BytesIO
+
+import pytest
+from bs4 import BeautifulSoup
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db.models.signals import post_save
+from django.utils import timezone
+from PIL import Image
+
+from blog.images import VARIANT_FORMATS, VARIANT_WIDTHS, variant_name
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+def _png(width=1600, height=900):
+    buffer = BytesIO()
+    Image.new("RGBA", (width, height), (200, 30, 30, 255)).save(buffer, "PNG")
+    return SimpleUploadedFile("photo.png", buffer.getvalue(), "image/png")
+
+
+def _assert_variants(name):
+    for width in VARIANT_WIDTHS:
+        for extension, _, _ in VARIANT_FORMATS:
+            variant = variant_name(name, width, extension)
+            assert default_storage.exists(variant), (
+                f"Убедитесь, что создаётся вариант изображения {variant}."
+            )
+            with default_storage.open(variant) as file:
+                assert Image.open(file).width == width
+
+
+def test_create_form_generates_variants_and_srcset(
+    user_client, published_category, published_location
+):
+    saves = []
+
+    def on_save(sender, **kwargs):
+        saves.append(kwargs["update_fields"])
+
+    post_save.connect(on_save, sender=Post)
+    try:
+        response = user_client.post(
+            "/posts/create/",
+            {
+                "title": "С картинкой",
+                "text": "Текст",
+                "pub_date": timezone.now().strftime("%Y-%m-%dT%H:%M"),
+                "category": published_category.id,
+                "location": published_location.id,
+                "is_published": True,
+                "image": _png(),
+            },
+        )
+    finally:
+        post_save.disconnect(on_save, sender=Post)
+    assert response.status_code == 302
+    assert len(saves) == 1, (
+        "Убедитесь, что пост с изображением сохраняется один раз: "
+        "повторное сохранение снова запускает все сигналы поста."
+    )
+    post = Post.objects.get(title="С картинкой")
+    _assert_variants(post.image.name)
+
+    soup = BeautifulSoup(user_client.get("/").content, "html.parser")
+    images = soup.find_all("img", srcset=True)
+    assert len(images) == 1, (
+        "Убедитесь, что карточка поста выводит изображение с srcset."
+    )
+    assert "640w" in images[0]["srcset"] and images[0]["sizes"]
+    assert soup.find("source", type="image/webp")
+    assert post.variants_width == VARIANT_WIDTHS[-1]
+
+
+def test_backfill_command_creates_missing_variants(
+    mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category, image=None
+    )
+    post.image.save("old.png", _png(500, 300))
+    name = post.image.name
+    assert not default_storage.exists(variant_name(name, 320, "jpg"))
+
+    call_command("generate_image_variants", workers=1)
+    assert all(
+        default_storage.exists(variant_name(name, width, extension))
+        for width in VARIANT_WIDTHS
+        for extension, _, _ in VARIANT_FORMATS
+    ), "Убедитесь, что команда создаёт варианты для старых изображений."
+    with default_storage.open(variant_name(name, 1280, "jpg")) as file:
+        assert Image.open(file).width == 500, (
+            "Убедитесь, что варианты не увеличивают исходное изображение."
+        )
+    post.refresh_from_db()
+    assert post.variants_width == 500, (
+        "Убедитесь, что команда сохраняет ширину вариантов."
+    )
+
+
+def test_srcset_lists_only_real_widths(
+    monkeypatch, client, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category, image=None
+    )
+    post.image.save("small.png", _png(500, 300))
+    call_command("generate_image_variants", workers=1)
+
+    def exists(name):
+        raise AssertionError(
+            "Убедитесь, что srcset строится без обращений к хранилищу."
+        )
+
+    monkeypatch.setattr(default_storage, "exists", exists)
+    soup = BeautifulSoup(client.get("/").content, "html.parser")
+    srcset = soup.find("img", srcset=True)["srcset"]
+    widths = [entry.rsplit(" ", 1)[1] for entry in srcset.split(", ")]
+    assert widths == ["320w", "500w"], (
+        "Убедитесь, что srcset не предлагает вариантов шире оригинала."
+    )
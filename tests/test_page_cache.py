@@ -0,0 +1,181 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.middleware.csrf import _get_new_csrf_token as get_new_csrf_token
+
+from blog.cache import INDEX_SCOPE
+from blog.mixins import AnonymousPageCacheMixin
+from blog.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _get_counting_queries(client, url):
+    queries = []
+
+    def count(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return response, len(queries)
+
+
+@pytest.fixture
+def page_urls(post_with_published_location):
+    post = post_with_published_location
+    return (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+        f"/posts/{post.id}/",
+    )
+
+
+@pytest.mark.parametrize(
+    "backend",
+    (
+        "django.core.cache.backends.locmem.LocMemCache",
+        "django.core.cache.backends.filebased.FileBasedCache",
+    ),
+)
+def test_anonymous_pages_are_served_from_cache(
+    settings, tmp_path, backend, client, page_urls
+):
+    settings.CACHES = {
+        "default": {"BACKEND": backend, "LOCATION": str(tmp_path)}
+    }
+    for url in page_urls:
+        _, first_queries = _get_counting_queries(client, url)
+        assert first_queries
+        _, cached_queries = _get_counting_queries(client, url)
+        assert cached_queries == 0, (
+            f"Убедитесь, что страница {url} для анонимного пользователя "
+            "отдаётся из кэша без запросов к базе данных."
+        )
+
+
+def test_authenticated_pages_are_not_cached(user_client, page_urls):
+    for url in page_urls:
+        _get_counting_queries(user_client, url)
+        _, queries = _get_counting_queries(user_client, url)
+        assert queries, (
+            "Убедитесь, что страницы авторизованных пользователей "
+            "не берутся из общего кэша."
+        )
+
+
+def test_post_change_invalidates_pages(
+    client, page_urls, post_with_published_location
+):
+    for url in page_urls:
+        client.get(url)
+
+    post_with_published_location.title = "Совершенно новый заголовок"
+    post_with_published_location.save()
+    for url in page_urls:
+        response, queries = _get_counting_queries(client, url)
+        assert queries and "Совершенно новый заголовок" in (
+            response.content.decode()
+        ), f"Убедитесь, что изменение поста сбрасывает кэш страницы {url}."
+
+
+def test_comment_and_location_changes_invalidate_pages(
+    mixer, client, page_urls, post_with_published_location
+):
+    post = post_with_published_location
+    for url in page_urls:
+        client.get(url)
+    mixer.blend(Comment, post=post, text="Свежий комментарий")
+    response = client.get(f"/posts/{post.id}/")
+    assert "Свежий комментарий" in response.content.decode()
+    response = client.get("/")
+    assert "Комментарии (1)" in response.content.decode()
+
+    post.location.name = "Новое место"
+    post.location.save()
+    for url in page_urls:
+        response = client.get(url)
+        assert "Новое место" in response.content.decode(), (
+            f"Убедитесь, что изменение локации сбрасывает кэш страницы {url}."
+        )
+
+
+def test_unrelated_pages_stay_cached(mixer, client, page_urls, user):
+    for url in page_urls:
+        client.get(url)
+    other_category = mixer.blend("blog.Category", is_published=True)
+    other_category.title = "Другая"
+    other_category.save()
+    for url in page_urls[2:]:
+        _, queries = _get_counting_queries(client, url)
+        assert queries == 0, (
+            "Убедитесь, что изменение посторонней категории "
+            f"не сбрасывает кэш страницы {url}."
+        )
+
+
+def test_page_cache_scopes_default_to_index():
+    assert AnonymousPageCacheMixin().get_cache_scopes() == [INDEX_SCOPE], (
+        "Убедитесь, что без своих областей страница зависит от ленты."
+    )
+
+
+def test_unchanged_pages_answer_not_modified(user_client, page_urls):
+    # Страница с формой выдаёт cookie CSRF, от которого зависит ETag.
+    for url in page_urls:
+        user_client.get(url)
+    for url in page_urls:
+        response = user_client.get(url)
+        assert response["ETag"] and response["Last-Modified"], (
+            f"Убедитесь, что страница {url} отдаёт ETag и Last-Modified."
+        )
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            repeated = user_client.get(
+                url, HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        assert repeated.status_code == HTTPStatus.NOT_MODIFIED, (
+            f"Убедитесь, что неизменившаяся страница {url} отвечает 304."
+        )
+        assert not any("blog_" in sql for sql in queries), (
+            "Убедитесь, что ответ 304 не выполняет выборок постов."
+        )
+
+
+def test_validators_change_with_csrf_token(
+    user_client, settings, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.pk}/"
+    response = user_client.get(url)
+    assert settings.CSRF_COOKIE_NAME in response.cookies
+    # Вход выдаёт новый секрет CSRF, как rotate_token() в login().
+    user_client.cookies[settings.CSRF_COOKIE_NAME] = get_new_csrf_token()
+    repeated = user_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert repeated.status_code == HTTPStatus.OK, (
+        "Убедитесь, что после смены токена CSRF страница с формой "
+        "не отвечает 304 со старым токеном."
+    )
+
+
+def test_validators_change_with_content(
+    client, user, page_urls, post_with_published_location
+):
+    etags = {url: client.get(url)["ETag"] for url in page_urls}
+    Comment.objects.create(
+        post=post_with_published_location, author=user, text="Новое"
+    )
+    for url in page_urls:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+        assert response.status_code == HTTPStatus.OK, (
+            f"Убедитесь, что после изменения страница {url} отдаётся заново."
+        )
+        assert response["ETag"] != etags[url]
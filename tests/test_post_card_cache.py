@@ -0,0 +1,47 @@
+import pytest
+
+from blog.cache import post_card_stats
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def reset_stats():
+    post_card_stats.reset()
+
+
+def test_post_card_is_shared_between_pages(
+    user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.get("/")
+    assert (post_card_stats.hits, post_card_stats.misses) == (0, 1)
+
+    user_client.get(f"/category/{post.category.slug}/")
+    user_client.get(f"/profile/{post.author.username}/")
+    assert (post_card_stats.hits, post_card_stats.misses) == (2, 1), (
+        "Убедитесь, что карточка поста кэшируется один раз и "
+        "переиспользуется на главной, в категории и в профиле."
+    )
+    assert post_card_stats.hit_ratio == pytest.approx(2 / 3)
+
+
+def test_post_card_follows_post_and_reference_changes(
+    mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.get("/")
+
+    post.title = "Обновлённый заголовок"
+    post.save()
+    assert "Обновлённый заголовок" in user_client.get("/").content.decode()
+
+    mixer.blend("blog.Comment", post=post)
+    assert "Комментарии (1)" in user_client.get("/").content.decode()
+
+    post.category.title = "Переименованная категория"
+    post.category.save()
+    assert (
+        "Переименованная категория" in user_client.get("/").content.decode()
+    )
+    assert post_card_stats.hits == 0
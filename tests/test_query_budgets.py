@@ -0,0 +1,66 @@
+import pytest
+
+from blog.models import Comment, Post
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+ROUTES = (
+    "/",
+    "/posts/{post.pk}/",
+    "/posts/{post.pk}/comments/",
+    "/category/{post.category.slug}/",
+    "/profile/{post.author.username}/",
+    "/posts/create/",
+    "/posts/{post.pk}/edit/",
+    "/auth/registration/",
+)
+
+
+@pytest.fixture(params=(1, N_PER_PAGE * 2), ids=("few", "many"))
+def blog_post(request, mixer, user, published_category, published_location):
+    """Пост автора user с комментариями среди posts постов категории."""
+    posts = mixer.cycle(request.param).blend(
+        Post,
+        author=user,
+        category=published_category,
+        location=published_location,
+    )
+    mixer.cycle(request.param).blend(Comment, post=posts[0], author=user)
+    return posts[0]
+
+
+@pytest.mark.parametrize("route", ROUTES)
+@pytest.mark.parametrize("client_name", ("unlogged_client", "user_client"))
+def test_pages_fit_query_budget(
+    request, query_budget, blog_post, route, client_name
+):
+    client = query_budget(request.getfixturevalue(client_name))
+    response = client.get(route.format(post=blog_post))
+    assert response.status_code in (200, 302)
+
+
+def test_comment_fits_query_budget(query_budget, user_client, blog_post):
+    text = "Комментарий в бюджете"
+    response = query_budget(user_client).post(
+        f"/posts/{blog_post.pk}/comment/", {"text": text}
+    )
+    assert response.status_code == 302
+
+
+def test_admin_changelist_fits_query_budget(
+    query_budget, admin_client, blog_post
+):
+    response = query_budget(admin_client).get("/admin/blog/post/")
+    assert response.status_code == 200
+
+
+def test_budget_failure_groups_queries(query_budget, user_client, blog_post):
+    client = query_budget(user_client, {"blog:post_detail": 0})
+    with pytest.raises(AssertionError) as error:
+        client.get(f"/posts/{blog_post.pk}/")
+    message = str(error.value)
+    assert "бюджете 0" in message
+    assert '"blog_post"."id" = ?' in message, (
+        "Убедитесь, что отчёт показывает запросы без литералов."
+    )
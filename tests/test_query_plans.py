@@ -0,0 +1,95 @@
+import re
+
+import pytest
+from django.apps import apps
+from django.db import connection
+
+from blog.refdata import reference_data
+
+pytestmark = [pytest.mark.django_db]
+
+FULL_SCAN = re.compile(r"^SCAN (TABLE )?\w+$")
+
+
+@pytest.fixture
+def blog_content(mixer, user, published_category, published_location):
+    posts = mixer.cycle(15).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+    )
+    mixer.cycle(3).blend("blog.Comment", post=posts[0])
+    # Справочники читаются целиком раз на версию, а не на каждый запрос.
+    reference_data()
+    return posts
+
+
+def _captured_selects(client, url):
+    captured = []
+
+    def capture(execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith("SELECT"):
+            captured.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(capture):
+        client.get(url)
+    return captured
+
+
+def _full_scans(sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        details = [row[-1] for row in cursor.fetchall()]
+    return [detail for detail in details if FULL_SCAN.match(detail)]
+
+
+@pytest.mark.parametrize(
+    "url_template",
+    (
+        "/",
+        "/?page=2",
+        "/category/{category}/",
+        "/category/{category}/?page=2",
+        "/profile/{username}/",
+        "/profile/{username}/?page=2",
+        "/posts/{post}/",
+    ),
+)
+@pytest.mark.parametrize("client_name", ("user_client", "another_user_client"))
+def test_list_and_detail_queries_use_indexes(
+    request, client_name, url_template, blog_content, published_category, user
+):
+    url = url_template.format(
+        category=published_category.slug,
+        username=user.username,
+        post=blog_content[0].id,
+    )
+    client = request.getfixturevalue(client_name)
+    selects = _captured_selects(client, url)
+    assert selects, f"Страница {url} не выполнила ни одного запроса."
+    for sql, params in selects:
+        scans = _full_scans(sql, params)
+        assert not scans, (
+            f"Запрос страницы {url} выполняет полный просмотр таблицы "
+            f"{scans}:\n{sql}"
+        )
+
+
+def test_declared_indexes_survive_migrations():
+    # SQLite перестраивает таблицу при изменении схемы и теряет индексы,
+    # о которых Django не знает, поэтому все индексы объявлены в Meta.
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        existing = {name for name, in cursor.fetchall()}
+    declared = {
+        index.name
+        for app_label in ("blog", "users")
+        for model in apps.get_app_config(app_label).get_models()
+        for index in model._meta.indexes
+    }
+    assert declared <= existing, (
+        "Убедитесь, что миграции не теряют индексы: "
+        f"{sorted(declared - existing)}"
+    )
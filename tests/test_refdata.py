@@ -0,0 +1,103 @@
+import pytest
+from django.db import connection
+
+from blog.models import Post
+from blog.refdata import reference_data
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _reference_queries(client, url):
+    queries = []
+
+    def record(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(record):
+        response = client.get(url)
+    return response, [
+        sql for sql in queries
+        if "blog_category" in sql or "blog_location" in sql
+    ]
+
+
+@pytest.fixture
+def posts(mixer, user, published_category, published_location):
+    return mixer.cycle(5).blend(
+        Post,
+        author=user,
+        category=published_category,
+        location=published_location,
+    )
+
+
+@pytest.mark.parametrize(
+    "url_template",
+    ("/", "/category/{slug}/", "/posts/{post}/", "/profile/{username}/"),
+)
+def test_pages_read_reference_data_from_process_cache(
+    user_client, posts, published_category, user, url_template
+):
+    url = url_template.format(
+        slug=published_category.slug, post=posts[0].pk, username=user.username
+    )
+    reference_data()
+    response, queries = _reference_queries(user_client, url)
+    assert response.status_code == 200
+    assert not queries, (
+        f"Убедитесь, что страница {url} берёт категории и локации из "
+        f"кэша справочников, а не из базы:\n{queries}"
+    )
+    assert posts[0].location.name in response.content.decode()
+
+
+def test_edit_form_renders_reference_data_from_cache(user_client, posts):
+    reference_data()
+    response, queries = _reference_queries(
+        user_client, f"/posts/{posts[0].pk}/edit/"
+    )
+    assert response.status_code == 200
+    assert not queries, (
+        "Убедитесь, что форма поста выводит выбранные категорию и "
+        "локацию из кэша справочников."
+    )
+    assert posts[0].category.title in response.content.decode()
+
+
+def test_snapshot_refreshes_after_change(
+    client, posts, published_category, published_location
+):
+    before = reference_data()
+    published_location.name = "Обновлённое место"
+    published_location.save()
+    assert reference_data() is not before, (
+        "Убедитесь, что сохранение локации меняет версию справочников."
+    )
+    response = client.get("/")
+    assert "Обновлённое место" in response.content.decode()
+
+    published_category.is_published = False
+    published_category.save()
+    assert reference_data().published_category(
+        published_category.slug
+    ) is None
+    response = client.get(f"/category/{published_category.slug}/")
+    assert response.status_code == 404
+
+
+def test_snapshot_expires_without_version_change(
+    settings, published_location
+):
+    before = reference_data()
+    # update() минует сигналы, как запись из другого процесса
+    # при локальном кэше: версия refdata остаётся прежней.
+    type(published_location).objects.filter(
+        pk=published_location.pk
+    ).update(name="Переименовано")
+    assert reference_data() is before
+
+    settings.BLOG_REFDATA_TTL = 0
+    assert reference_data().locations[published_location.pk].name == (
+        "Переименовано"
+    ), "Убедитесь, что снимок справочников устаревает по BLOG_REFDATA_TTL."
@@ -0,0 +1,126 @@
+import pytest
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from blog.db import copy_database
+from blog.models import Comment, Post
+
+# Копирование базы требует зафиксированных данных, поэтому тесты
+# работают без обёртывающей транзакции.
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+REPLICA = "replica"
+
+
+@pytest.fixture
+def replica(settings, tmp_path):
+    """Реплика-файл, который обновляется только вызовом sync()."""
+    connections.databases[REPLICA] = {
+        **connections.databases[DEFAULT_DB_ALIAS],
+        "NAME": str(tmp_path / "replica.sqlite3"),
+        "TEST": {"NAME": str(tmp_path / "replica.sqlite3")},
+    }
+    settings.BLOG_READ_REPLICAS = [REPLICA]
+
+    def sync():
+        copy_database(DEFAULT_DB_ALIAS, REPLICA)
+
+    yield sync
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.databases[REPLICA]
+
+
+def test_feeds_read_from_replica(
+    replica, user_client, mixer, user, published_category
+):
+    first = mixer.blend(Post, author=user, category=published_category)
+    replica()
+    second = mixer.blend(Post, author=user, category=published_category)
+
+    content = user_client.get("/").content.decode()
+    assert first.title in content
+    assert second.title not in content, (
+        "Убедитесь, что лента читает посты с реплики."
+    )
+    replica()
+    content = user_client.get("/").content.decode()
+    assert second.title in content
+
+
+def test_writer_reads_own_changes_from_primary(
+    replica, settings, user_client, another_user_client, mixer, user,
+    published_category,
+):
+    post = mixer.blend(Post, author=user, category=published_category)
+    replica()
+    detail = f"/posts/{post.pk}/"
+    # Тексты в переменных: панель SQL отладочной панели выводит
+    # строки исходника теста, в которых выполнялся запрос.
+    fresh, later = "Свежий комментарий", "Ещё комментарий"
+
+    user_client.post(f"/posts/{post.pk}/comment/", {"text": fresh})
+    assert Comment.objects.filter(post=post).exists()
+    own_page = user_client.get(detail).content.decode()
+    other_page = another_user_client.get(detail).content.decode()
+    assert fresh in own_page, (
+        "Убедитесь, что после записи пользователь читает с основной базы."
+    )
+    assert fresh not in other_page, (
+        "Убедитесь, что другие пользователи читают с реплики."
+    )
+
+    settings.BLOG_PRIMARY_PIN_SECONDS = 0
+    user_client.post(f"/posts/{post.pk}/comment/", {"text": later})
+    own_page = user_client.get(detail).content.decode()
+    assert later not in own_page, (
+        "Убедитесь, что после окончания окна чтение идёт с реплики."
+    )
+
+
+def test_without_replicas_everything_reads_primary(
+    user_client, mixer, user, published_category
+):
+    post = mixer.blend(Post, author=user, category=published_category)
+    assert post.title in user_client.get("/").content.decode()
+
+
+def test_lagging_replica_pages_are_not_cached(
+    replica, settings, client, mixer, user, published_category
+):
+    first = mixer.blend(Post, author=user, category=published_category)
+    replica()
+    second = mixer.blend(Post, author=user, category=published_category)
+
+    response = client.get("/")
+    assert second.title not in response.content.decode()
+    assert not response.has_header("ETag"), (
+        "Убедитесь, что отстающая реплика не получает ETag новой версии."
+    )
+    replica()
+    content = client.get("/").content.decode()
+    assert first.title in content and second.title in content, (
+        "Убедитесь, что страница отстающей реплики не попадает в кэш."
+    )
+
+    settings.BLOG_PRIMARY_PIN_SECONDS = 0
+    assert client.get("/").has_header("ETag"), (
+        "Убедитесь, что после догоняния реплики валидаторы возвращаются."
+    )
+
+
+def test_feeds_read_posts_from_replica(
+    replica, settings, client, mixer, user, published_category
+):
+    first = mixer.blend(Post, author=user, category=published_category)
+    replica()
+    second = mixer.blend(Post, author=user, category=published_category)
+
+    content = b"".join(client.get("/feed/rss/")).decode()
+    assert first.title in content and second.title not in content, (
+        "Убедитесь, что ленты RSS читают посты с реплики."
+    )
+    replica()
+    content = b"".join(client.get("/feed/rss/")).decode()
+    assert second.title in content, (
+        "Убедитесь, что лента отстающей реплики не попадает в кэш."
+    )
@@ -0,0 +1,141 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _found(client, query, **params):
+    response = client.get("/search/", {"q": query, **params})
+    assert response.status_code == HTTPStatus.OK
+    return [post.pk for post in response.context["post_list"]]
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    def blend(title, text):
+        return mixer.blend(
+            "blog.Post",
+            author=user,
+            category=published_category,
+            title=title,
+            text=text,
+            is_published=True,
+        )
+
+    return {
+        "title": blend("Кофейные зёрна", "Про обжарку."),
+        "text": blend("Утро", "Заварили кофейный напиток <b>дома</b>."),
+        "other": blend("Вечер", "Ничего общего."),
+    }
+
+
+def test_search_ranks_title_matches_first(client, posts):
+    found = _found(client, "кофе")
+    assert found == [posts["title"].pk, posts["text"].pk], (
+        "Убедитесь, что поиск находит посты по началу слова и ставит "
+        "совпадения в заголовке выше совпадений в тексте."
+    )
+
+
+def test_search_covers_comments_and_updates(client, mixer, user, posts):
+    comment = mixer.blend(
+        Comment, post=posts["other"], author=user, text="Ищем термос"
+    )
+    assert _found(client, "термос") == [posts["other"].pk], (
+        "Убедитесь, что поиск учитывает тексты комментариев."
+    )
+    comment.delete()
+    assert _found(client, "термос") == []
+
+    post = posts["other"]
+    post.title = "Термос"
+    post.save()
+    assert _found(client, "термос") == [post.pk], (
+        "Убедитесь, что индекс обновляется при изменении поста."
+    )
+    post.delete()
+    assert _found(client, "термос") == []
+
+
+def test_search_indexes_comments_separately(client, mixer, user, posts):
+    first = mixer.blend(
+        Comment, post=posts["other"], author=user, text="Ищем термос"
+    )
+    mixer.blend(Comment, post=posts["other"], author=user, text="Чайник")
+    content = client.get("/search/", {"q": "термос"}).content.decode()
+    assert "<mark>термос</mark>" in content, (
+        "Убедитесь, что для поста, найденного по комментарию, выводится "
+        "фрагмент комментария."
+    )
+    first.text = "Ищем кружку"
+    first.save()
+    assert _found(client, "термос") == []
+    assert _found(client, "кружку") == [posts["other"].pk]
+    assert _found(client, "чайник") == [posts["other"].pk], (
+        "Убедитесь, что изменение комментария не затрагивает остальные."
+    )
+
+
+def test_search_respects_visibility(client, posts):
+    Post.objects.filter(pk=posts["title"].pk).update(is_published=False)
+    Post.objects.filter(pk=posts["title"].pk).refresh_visibility()
+    assert _found(client, "кофе") == [posts["text"].pk], (
+        "Убедитесь, что поиск не показывает скрытые посты."
+    )
+
+
+def test_search_highlights_escaped_snippet(client, posts):
+    content = client.get("/search/", {"q": "напиток"}).content.decode()
+    assert "<mark>напиток</mark>" in content
+    assert "&lt;b&gt;дома&lt;/b&gt;" in content, (
+        "Убедитесь, что текст фрагмента экранируется."
+    )
+
+
+def test_search_ignores_fts_syntax(client, posts):
+    assert _found(client, '"кофе OR NEAR(') == []
+    assert _found(client, "   ") == []
+
+
+def test_rebuild_command_indexes_bulk_created_posts(
+    client, user, published_category, posts
+):
+    Post.objects.bulk_create(
+        [
+            Post(
+                title="Загружено пачкой",
+                text="Самовар",
+                author=user,
+                category=published_category,
+                pub_date=posts["other"].pub_date,
+                is_visible=True,
+            )
+        ]
+    )
+    assert _found(client, "самовар") == []
+    call_command("rebuild_search_index")
+    assert len(_found(client, "самовар")) == 1, (
+        "Убедитесь, что команда rebuild_search_index индексирует "
+        "существующие посты."
+    )
+
+
+def test_search_pagination_keeps_query(
+    client, mixer, user, published_category
+):
+    mixer.cycle(12).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        title="Чай",
+        is_published=True,
+    )
+    content = client.get("/search/", {"q": "чай"}).content.decode()
+    assert "?q=%D1%87%D0%B0%D0%B9&amp;page=2" in content, (
+        "Убедитесь, что ссылки пагинации сохраняют поисковый запрос."
+    )
+    assert len(_found(client, "чай", page=2)) == 2
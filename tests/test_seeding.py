@@ -0,0 +1,95 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Count
+from django.utils import timezone
+
+from blog.models import AuthorStats, Category, Comment, Location, Post, User
+from blog.seeding import BlogSeeder
+
+pytestmark = [pytest.mark.django_db]
+
+SIZES = dict(users=30, categories=5, locations=8, posts=400, comments=1500)
+
+
+def snapshot(model, *fields):
+    return list(model.objects.order_by("pk").values_list(*fields))
+
+
+def test_seed_command_creates_requested_rows():
+    before = {
+        model: model.objects.count()
+        for model in (User, Category, Location, Post, Comment)
+    }
+    out = StringIO()
+    call_command(
+        "seed_blog",
+        *[f"--{name}={size}" for name, size in SIZES.items()],
+        batch_size=64,
+        stdout=out,
+    )
+    for model, name in (
+        (User, "users"),
+        (Category, "categories"),
+        (Location, "locations"),
+        (Post, "posts"),
+        (Comment, "comments"),
+    ):
+        assert model.objects.count() == before[model] + SIZES[name], (
+            f"Убедитесь, что seed_blog создаёт {name} в заданном количестве."
+        )
+    assert "строк/с" in out.getvalue(), (
+        "Убедитесь, что seed_blog выводит скорость вставки."
+    )
+    # Последовательности сдвинуты: обычное создание не конфликтует по pk.
+    Category.objects.create(title="Новая", description="-", slug="new-one")
+
+
+def seed_empty_database(seed):
+    for model in (Comment, Post, Category, Location, User):
+        model.objects.all().delete()
+    BlogSeeder(**SIZES, seed=seed).run()
+    return (
+        snapshot(Post, "title", "author_id", "category_id", "is_published"),
+        snapshot(Comment, "post_id", "author_id", "text"),
+    )
+
+
+def test_seed_is_deterministic():
+    first = seed_empty_database(7)
+    second = seed_empty_database(7)
+    assert first == second, (
+        "Убедитесь, что одинаковый seed даёт одинаковые данные."
+    )
+
+
+def test_seed_is_skewed_and_keeps_derived_fields():
+    BlogSeeder(**SIZES).run()
+    per_author = list(
+        Post.objects.values("author").annotate(total=Count("pk"))
+        .order_by("-total").values_list("total", flat=True)
+    )
+    assert per_author[0] > 4 * SIZES["posts"] / SIZES["users"], (
+        "Убедитесь, что немногие авторы пишут большую часть постов."
+    )
+    assert Post.objects.filter(pub_date__gt=timezone.now()).exists()
+    assert Post.objects.filter(is_visible=False).exists()
+
+    post = Post.objects.order_by("-comment_count").first()
+    assert post.comment_count == post.comments.count(), (
+        "Убедитесь, что счётчики комментариев пересчитаны после заполнения."
+    )
+    assert Post.post_list.filter(is_visible=False).count() == 0
+    author_id = Post.objects.filter(is_visible=True).values_list(
+        "author_id", flat=True
+    ).first()
+    stats = AuthorStats.objects.get(author_id=author_id)
+    assert stats.post_count == Post.objects.filter(
+        author_id=author_id, is_visible=True
+    ).count(), "Убедитесь, что статистика авторов пересчитана."
+
+
+def test_comments_without_posts_are_rejected():
+    with pytest.raises(CommandError):
+        call_command("seed_blog", posts=0, comments=10)
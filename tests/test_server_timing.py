@@ -0,0 +1,102 @@
+import logging
+import re
+
+import pytest
+from django.test import Client
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def timings(response):
+    """Метрики Server-Timing: имя -> {параметр: значение}."""
+    metrics = {}
+    for entry in response["Server-Timing"].split(", "):
+        name, *params = entry.split(";")
+        metrics[name] = dict(
+            param.split("=", 1) for param in params
+        )
+    return metrics
+
+
+@pytest.fixture
+def post(mixer, user, published_category):
+    return mixer.blend(Post, author=user, category=published_category)
+
+
+def test_server_timing_reports_sql_and_templates(user_client, post):
+    response = user_client.get("/")
+    assert response.has_header("Server-Timing"), (
+        "Убедитесь, что ответы содержат заголовок Server-Timing."
+    )
+    metrics = timings(response)
+    queries = re.match(r'"(\d+) queries"', metrics["db"]["desc"])
+    assert queries and int(queries.group(1)) > 0
+    assert float(metrics["tpl"]["dur"]) > 0, (
+        "Убедитесь, что Server-Timing учитывает отрисовку шаблонов."
+    )
+    assert float(metrics["total"]["dur"]) >= float(metrics["db"]["dur"])
+
+
+def test_server_timing_counts_page_cache_hits(client, post):
+    first = timings(client.get("/"))
+    second = timings(client.get("/"))
+    assert "hits=0" in first["cache"]["desc"]
+    assert second["cache"]["desc"] == '"hits=1 misses=0"', (
+        "Убедитесь, что попадание в кэш страниц отражается в Server-Timing."
+    )
+    assert second["db"]["desc"] == '"0 queries"'
+
+
+def test_server_timing_is_only_exposed_to_staff(user, admin_user, post):
+    external = {"REMOTE_ADDR": "192.0.2.1"}
+    assert not Client(**external).get("/").has_header("Server-Timing"), (
+        "Убедитесь, что анонимы снаружи не получают Server-Timing."
+    )
+    reader = Client(**external)
+    reader.force_login(user)
+    assert not reader.get("/").has_header("Server-Timing"), (
+        "Убедитесь, что Server-Timing получает только персонал."
+    )
+    staff = Client(**external)
+    staff.force_login(admin_user)
+    assert staff.get("/").has_header("Server-Timing")
+
+
+def test_streamed_responses_are_marked_partial(client, post):
+    response = client.get("/feed/rss/")
+    assert response.streaming
+    metrics = timings(response)
+    assert "db" not in metrics and "tpl" not in metrics, (
+        "Убедитесь, что для потокового ответа SQL тела не выдаётся "
+        "за полный замер."
+    )
+    assert "streamed" in metrics["total"]["desc"]
+
+
+def test_profile_log_is_sampled(settings, caplog, post):
+    settings.BLOG_PROFILING_LOG_SAMPLE_RATE = 1
+    with caplog.at_level(logging.INFO, logger="blog.profiling"):
+        Client().get("/")
+    assert any(
+        "db_queries=" in record.getMessage() for record in caplog.records
+    ), "Убедитесь, что профиль запроса пишется в лог."
+
+    settings.BLOG_PROFILING_LOG_SAMPLE_RATE = 0
+    caplog.clear()
+    Client().get("/")
+    assert not caplog.records
+
+
+def test_server_timing_can_be_disabled(settings, post):
+    settings.BLOG_SERVER_TIMING = False
+    response = Client().get("/")
+    assert not response.has_header("Server-Timing")
+
+
+def test_debug_toolbar_is_off_by_default(user_client, post):
+    content = user_client.get("/").content.decode()
+    assert "djDebug" not in content, (
+        "Убедитесь, что отладочная панель подключается только по флагу."
+    )
@@ -0,0 +1,78 @@
+from xml.etree import ElementTree
+
+import pytest
+from django.core.management import call_command
+
+from blog import sitemaps
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+NS = {"sm": sitemaps.XMLNS}
+BASE_URL = "https://blogicum.test"
+
+
+@pytest.fixture
+def sitemap_root(settings, tmp_path):
+    settings.BLOG_SITEMAP_ROOT = tmp_path
+    return tmp_path
+
+
+def _locations(path):
+    tree = ElementTree.parse(path)
+    return [loc.text for loc in tree.iterfind(".//sm:loc", NS)]
+
+
+def test_sitemaps_cover_visible_pages(
+    sitemap_root,
+    post_with_published_location,
+    unpublished_posts_with_published_locations,
+):
+    post = post_with_published_location
+    call_command("build_sitemaps", base_url=BASE_URL)
+
+    index = _locations(sitemap_root / sitemaps.INDEX_NAME)
+    assert f"{BASE_URL}/sitemaps/sitemap-posts-0.xml" in index
+    post_urls = _locations(sitemap_root / "sitemap-posts-0.xml")
+    assert post_urls == [f"{BASE_URL}/posts/{post.pk}/"], (
+        "Убедитесь, что sitemap содержит только опубликованные посты."
+    )
+    assert f"{BASE_URL}/category/{post.category.slug}/" in _locations(
+        sitemap_root / "sitemap-categories-0.xml"
+    )
+    assert _locations(sitemap_root / "sitemap-profiles-0.xml") == [
+        f"{BASE_URL}/profile/{post.author.username}/"
+    ]
+
+
+def test_sitemaps_are_sharded_and_rebuilt_incrementally(
+    monkeypatch, sitemap_root, many_posts_with_published_locations
+):
+    monkeypatch.setattr(sitemaps, "SHARD_SIZE", 5)
+    report = sitemaps.build_sitemaps(BASE_URL)
+    post_files = [name for name in report["written"] if "posts" in name]
+    assert len(post_files) > 1
+    for name in post_files:
+        assert len(_locations(sitemap_root / name)) <= 5
+
+    report = sitemaps.build_sitemaps(BASE_URL)
+    assert report["written"] == [], (
+        "Убедитесь, что без изменений файлы sitemap не перезаписываются."
+    )
+
+    post = Post.post_list.order_by("pk").first()
+    post.title = "Изменённый"
+    post.save()
+    report = sitemaps.build_sitemaps(BASE_URL)
+    written_posts = [name for name in report["written"] if "posts" in name]
+    assert written_posts == [f"sitemap-posts-{post.pk // 5}.xml"], (
+        "Убедитесь, что перезаписывается только шард изменённого поста."
+    )
+
+    Post.objects.filter(pk=post.pk).update(is_published=False)
+    Post.objects.filter(pk=post.pk).refresh_visibility()
+    report = sitemaps.build_sitemaps(BASE_URL)
+    assert f"sitemap-posts-{post.pk // 5}.xml" in report["written"]
+    assert f"{BASE_URL}/posts/{post.pk}/" not in _locations(
+        sitemap_root / f"sitemap-posts-{post.pk // 5}.xml"
+    )
@@ -0,0 +1,59 @@
+import sqlite3
+from io import StringIO
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+
+from blog.db import benchmark, configured_pragmas, read_pragmas
+
+
+@pytest.mark.django_db
+def test_connection_applies_configured_pragmas(settings):
+    with connection.cursor() as cursor:
+        effective = read_pragmas(cursor)
+    assert effective["busy_timeout"] == (
+        settings.BLOG_SQLITE_PRAGMAS["busy_timeout"]
+    ), "Убедитесь, что PRAGMA применяются при создании соединения."
+    assert effective["cache_size"] == (
+        settings.BLOG_SQLITE_PRAGMAS["cache_size"]
+    )
+
+
+@pytest.mark.parametrize(
+    "pragmas",
+    (
+        {"foreign_keys": "off"},
+        {"journal_mode": "wal; DROP TABLE blog_post"},
+    ),
+)
+def test_unknown_or_unsafe_pragmas_are_rejected(settings, pragmas):
+    settings.BLOG_SQLITE_PRAGMAS = pragmas
+    with pytest.raises(ImproperlyConfigured):
+        configured_pragmas()
+
+
+def test_benchmark_reports_throughput(tmp_path):
+    result = benchmark(
+        str(tmp_path / "bench.sqlite3"),
+        {"journal_mode": "wal", "synchronous": "normal"},
+        rows=50,
+        seconds=0.2,
+        readers=2,
+    )
+    assert result["writes_per_second"] > 0
+    assert result["mixed_reads_per_second"] > 0
+    database = sqlite3.connect(tmp_path / "bench.sqlite3")
+    try:
+        mode = database.execute("PRAGMA journal_mode").fetchone()[0]
+    finally:
+        database.close()
+    assert mode == "wal", "Убедитесь, что замер применяет PRAGMA."
+
+
+@pytest.mark.django_db
+def test_report_command_prints_effective_pragmas():
+    out = StringIO()
+    call_command("sqlite_report", stdout=out)
+    assert "Действует: journal_mode=" in out.getvalue()
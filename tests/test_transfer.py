@@ -0,0 +1,111 @@
+import json
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from blog import transfer
+from blog.models import (
+    AuthorStats,
+    Category,
+    Comment,
+    Location,
+    Post,
+    User,
+)
+
+pytestmark = [pytest.mark.django_db]
+
+DB_JSON = Path(__file__).resolve().parent.parent / "blogicum" / "db.json"
+
+
+def test_import_streams_fixture_in_any_order(monkeypatch):
+    # Маленький буфер проверяет разбор записей на границах чтения.
+    monkeypatch.setattr(transfer, "READ_CHUNK", 7)
+    fixture = json.loads(DB_JSON.read_text(encoding="utf-8"))
+    expected_posts = [r for r in fixture if r["model"] == "blog.post"]
+    posts_before = Post.objects.count()
+
+    call_command("import_blog", str(DB_JSON), batch_size=10)
+
+    assert Post.objects.count() == posts_before + len(expected_posts), (
+        "Убедитесь, что import_blog загружает все посты из db.json, "
+        "даже если авторы идут в файле после постов."
+    )
+    source = expected_posts[0]
+    post = Post.objects.get(
+        title=source["fields"]["title"], text=source["fields"]["text"]
+    )
+    author = next(
+        r for r in fixture
+        if r["model"] == "users.user" and r["pk"] == source["fields"]["author"]
+    )
+    assert post.author.username == author["fields"]["username"]
+    assert post.created_at.isoformat().startswith("2022-12-18T23:06:18"), (
+        "Убедитесь, что импорт сохраняет исходные даты создания."
+    )
+    assert Post.post_list.filter(pk=post.pk).exists() == (
+        post.compute_visibility()
+    )
+
+
+def test_export_import_round_trip_remaps_keys(
+    tmp_path, mixer, user, another_user, published_category
+):
+    posts = mixer.cycle(3).blend(
+        Post, author=user, category=published_category, is_published=True
+    )
+    mixer.cycle(2).blend(Comment, post=posts[0], author=another_user)
+    for output_format in ("json", "ndjson"):
+        path = tmp_path / f"blog.{output_format}"
+        call_command("export_blog", str(path), format=output_format)
+        with open(path, encoding="utf-8") as file:
+            assert len(list(transfer.iter_records(file))) == (
+                User.objects.count()
+                + Category.objects.count()
+                + Location.objects.count()
+                + Post.objects.count()
+                + Comment.objects.count()
+            )
+    array = json.loads((tmp_path / "blog.json").read_text(encoding="utf-8"))
+    assert array[0]["model"] == "users.user"
+
+    users = User.objects.count()
+    call_command("import_blog", str(tmp_path / "blog.ndjson"))
+    assert User.objects.count() == users, (
+        "Убедитесь, что пользователи сопоставляются по username."
+    )
+    copy = Post.objects.exclude(pk=posts[0].pk).get(title=posts[0].title)
+    assert copy.comment_count == 2 and copy.comments.count() == 2, (
+        "Убедитесь, что комментарии привязываются к новым постам "
+        "и счётчик комментариев пересчитывается."
+    )
+    assert copy.category_id == published_category.pk
+
+
+def test_refresh_derived_touches_only_given_posts(
+    mixer, user, another_user, published_category
+):
+    touched = mixer.blend(Post, author=user, category=published_category)
+    mixer.blend(Comment, post=touched, author=another_user)
+    untouched = mixer.blend(
+        Post, author=another_user, category=published_category
+    )
+    third = mixer.blend(User)
+    other = mixer.blend(Post, author=third, category=published_category)
+    # Рассинхрон, который refresh_derived не должен замечать.
+    Post.objects.filter(pk__in=[untouched.pk, other.pk]).update(
+        comment_count=7
+    )
+    AuthorStats.objects.filter(author=third).update(post_count=42)
+
+    transfer.refresh_derived(Post.objects.filter(pk=touched.pk))
+
+    assert Post.objects.get(pk=touched.pk).comment_count == 1
+    assert Post.objects.get(pk=untouched.pk).comment_count == 7, (
+        "Убедитесь, что пересчёт ограничен переданными постами."
+    )
+    assert AuthorStats.objects.get(author=third).post_count == 42, (
+        "Убедитесь, что статистика посторонних авторов не пересчитывается."
+    )
+    assert AuthorStats.objects.get(author=another_user).comment_count == 1
@@ -0,0 +1,57 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _visible_ids():
+    return set(Post.post_list.values_list("id", flat=True))
+
+
+def test_is_visible_combines_all_rules(
+    post_with_published_location, future_posts, posts_with_unpublished_category
+):
+    assert _visible_ids() == {post_with_published_location.id}, (
+        "Убедитесь, что видимы только опубликованные посты опубликованных "
+        "категорий с наступившей датой публикации."
+    )
+
+
+def test_scheduler_publishes_due_posts(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(minutes=5),
+    )
+    assert post.id not in _visible_ids()
+
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1)
+    )
+    call_command("publish_scheduled")
+    assert post.id in _visible_ids(), (
+        "Убедитесь, что команда publish_scheduled открывает посты, "
+        "время публикации которых наступило."
+    )
+
+
+def test_category_toggle_updates_posts(
+    post_with_published_location, published_category
+):
+    published_category.is_published = False
+    published_category.save()
+    assert not _visible_ids()
+
+    published_category.is_published = True
+    published_category.save()
+    assert _visible_ids() == {post_with_published_location.id}
+
+    published_category.delete()
+    assert not _visible_ids()